@@ -4,9 +4,14 @@ import os
 import argparse
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Generator
+from typing import Any, Dict, Iterable, List, Optional, Union, Generator
+from collections import defaultdict
 from decimal import Decimal
 
+from eligibility_signposting_api.repos.bloom_filter import BloomFilter
+from eligibility_signposting_api.repos.compact import COMPACT_ATTRIBUTE_TYPE, COMPACT_ROWS_ATTRIBUTE, encode_rows
+from eligibility_signposting_api.repos.known_people import DEFAULT_PERSON_FILTER_KEY
+
 
 def map_dynamo_type(value: Any) -> Dict[str, Any]:
     if isinstance(value, str):
@@ -74,6 +79,80 @@ def upload_to_dynamo(
     if uploaded_items > 0:
         print(f"Uploaded {uploaded_items} items from {filepath} to DynamoDB table {table_name}")
 
+
+def convert_to_compact(items: Iterable[Dict[str, Any]]) -> Generator[Dict[str, Any], None, None]:
+    """Gather each person's rows into the single compact item PersonRepo reads when the compact layout is enabled.
+
+    Each compact item replaces any earlier one for the person, so the items must include all of each person's rows,
+    from every file they're spread across."""
+    rows_by_person: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for item in items:
+        rows_by_person[item["NHS_NUMBER"]].append(item)
+
+    for nhs_number, rows in rows_by_person.items():
+        yield {
+            "NHS_NUMBER": {"S": nhs_number},
+            "ATTRIBUTE_TYPE": {"S": COMPACT_ATTRIBUTE_TYPE},
+            COMPACT_ROWS_ATTRIBUTE: {"B": encode_rows(rows)},
+        }
+
+
+def upload_compact_to_dynamo(
+    dynamo_client: Any,
+    table_name: str,
+    filepaths: Iterable[Union[str, Path]],
+) -> None:
+    filepaths = list(filepaths)
+    items = (item for filepath in filepaths for item in load_json_lines(filepath))
+    uploaded_items = 0
+    for item in convert_to_compact(items):
+        try:
+            dynamo_client.put_item(TableName=table_name, Item=item)
+            uploaded_items += 1
+        except Exception as e:
+            print(f"Failed to upload compact item (NHS_NUMBER: {item['NHS_NUMBER']['S']}): {e}")
+
+    if uploaded_items > 0:
+        print(f"Uploaded {uploaded_items} compact items from {len(filepaths)} files to DynamoDB table {table_name}")
+
+
+def scan_nhs_numbers(dynamo_client: Any, table_name: str) -> Generator[str, None, None]:
+    paginator = dynamo_client.get_paginator("scan")
+    for page in paginator.paginate(TableName=table_name, ProjectionExpression="NHS_NUMBER"):
+        for item in page["Items"]:
+            yield item["NHS_NUMBER"]["S"]
+
+
+def build_person_filter(dynamo_client: Any, table_name: str, false_positive_rate: float) -> BloomFilter:
+    """Build the Bloom filter of every NHS number in the table, which PersonRepo uses to rule out unknown people.
+
+    The whole table is scanned, not just the files being uploaded, as the filter replaces the published one - anyone
+    missing from it would be reported as not found."""
+    nhs_numbers = set(scan_nhs_numbers(dynamo_client, table_name))
+    return BloomFilter.of(nhs_numbers, false_positive_rate)
+
+
+def upload_person_filter(
+    s3_client: Any,
+    dynamo_client: Any,
+    bucket: str,
+    key: str,
+    table_name: str,
+    false_positive_rate: float,
+    dry_run: bool = False,
+) -> None:
+    """Publish the person filter. Do this after the data is in DynamoDB, or people being loaded will be reported as
+    not found until it is."""
+    person_filter = build_person_filter(dynamo_client, table_name, false_positive_rate)
+
+    if dry_run:
+        print(f"[DRY RUN] Would upload {person_filter!r} to s3://{bucket}/{key}")
+        return
+
+    s3_client.put_object(Bucket=bucket, Key=key, Body=person_filter.to_bytes())
+    print(f"Uploaded {person_filter!r} to s3://{bucket}/{key}")
+
+
 def run_upload(args: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--env")
@@ -83,6 +162,10 @@ def run_upload(args: Optional[List[str]] = None) -> None:
     parser.add_argument("--s3-bucket")
     parser.add_argument("--dynamo-table")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--compact", action="store_true", help="Upload each person as a single compact item")
+    parser.add_argument("--person-filter-bucket", help="Publish a Bloom filter of every NHS number in the DynamoDB table")
+    parser.add_argument("--person-filter-key", default=DEFAULT_PERSON_FILTER_KEY)
+    parser.add_argument("--person-filter-false-positive-rate", type=float, default=0.01)
 
     if args is None:
         parsed_args = parser.parse_args()
@@ -112,13 +195,28 @@ def run_upload(args: Optional[List[str]] = None) -> None:
 
     if parsed_args.upload_dynamo:
         if parsed_args.upload_dynamo.is_dir():
-            paths = parsed_args.upload_dynamo.glob("*.json")
+            paths = list(parsed_args.upload_dynamo.glob("*.json"))
         else:
             paths = [parsed_args.upload_dynamo]
 
-        for filepath in paths:
-            print(f"Uploading to DynamoDB from {filepath}")
-            upload_to_dynamo(dynamo, parsed_args.dynamo_table, str(filepath))
+        if parsed_args.compact:
+            print(f"Uploading compact items to DynamoDB from {', '.join(map(str, paths))}")
+            upload_compact_to_dynamo(dynamo, parsed_args.dynamo_table, paths)
+        else:
+            for filepath in paths:
+                print(f"Uploading to DynamoDB from {filepath}")
+                upload_to_dynamo(dynamo, parsed_args.dynamo_table, str(filepath))
+
+        if parsed_args.person_filter_bucket:
+            upload_person_filter(
+                s3,
+                dynamo,
+                parsed_args.person_filter_bucket,
+                parsed_args.person_filter_key,
+                parsed_args.dynamo_table,
+                parsed_args.person_filter_false_positive_rate,
+                parsed_args.dry_run,
+            )
 
 
 if __name__ == "__main__":
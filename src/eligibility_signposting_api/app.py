@@ -1,21 +1,33 @@
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from contextvars import copy_context
+from functools import cache
 from typing import Any
 
 import wireup.integration.flask
 from asgiref.wsgi import WsgiToAsgi
-from flask import Flask
+from flask import Flask, g
 from mangum import Mangum
 from mangum.types import LambdaContext, LambdaEvent
 
 from eligibility_signposting_api import repos, services
 from eligibility_signposting_api.config.config import config, init_logging
+from eligibility_signposting_api.deadline import deadline, remaining
 from eligibility_signposting_api.error_handler import handle_exception
+from eligibility_signposting_api.json_encoding import FastJSONProvider
+from eligibility_signposting_api.repos import CampaignRepo, PersonRepo
+from eligibility_signposting_api.services.audit_service import AuditService
 from eligibility_signposting_api.views import eligibility_blueprint
 from eligibility_signposting_api.wrapper import validate_matching_nhs_number
 
 init_logging()
 logger = logging.getLogger(__name__)
 
+LAMBDA_DEADLINE_MARGIN_SECONDS = 1.0
+
 
 def main() -> None:  # pragma: no cover
     """Run the Flask app as a local process."""
@@ -26,20 +38,58 @@ def main() -> None:  # pragma: no cover
 @validate_matching_nhs_number()
 def lambda_handler(event: LambdaEvent, context: LambdaContext) -> dict[str, Any]:  # pragma: no cover
     """Run the Flask app as an AWS Lambda."""
+    handler = get_lambda_handler()
+    remaining_seconds = context.get_remaining_time_in_millis() / 1000
+    with deadline(remaining_seconds - LAMBDA_DEADLINE_MARGIN_SECONDS):
+        try:
+            return handler(event, context)
+        finally:
+            end_invocation(get_lambda_app())
+
+
+@cache
+def get_lambda_app() -> Flask:  # pragma: no cover
+    """Create the app once per Lambda execution environment, so in-process caches last between invocations."""
     app = create_app()
     app.debug = config()["log_level"] == logging.DEBUG
-    handler = Mangum(WsgiToAsgi(app), lifespan="off")
-    return handler(event, context)
+    warm_up_connections(app, config()["connection_warm_up_timeout"])
+    return app
+
+
+@cache
+def get_lambda_handler() -> Mangum:  # pragma: no cover
+    return Mangum(WsgiToAsgi(get_lambda_app()), lifespan="off")
+
+
+def end_invocation(app: Flask) -> None:
+    """Send any buffered audit records, since once the invocation returns, the Lambda may be frozen, or never thawed.
+
+    As each invocation serves a single request, this means every request's response waits on a Firehose round trip -
+    the price of not losing audit records. The wait is bounded by the invocation's deadline: if the records haven't
+    been sent by then, the invocation returns anyway, leaving the flush to finish when the Lambda is next thawed, and
+    spool whatever it can't send."""
+    audit_service = wireup.integration.flask.get_app_container(app).get(AuditService)
+    flush = threading.Thread(target=copy_context().run, args=(audit_service.flush,), name="audit-flush", daemon=True)
+    flush.start()
+    flush.join(timeout=remaining())
+    if flush.is_alive():
+        logger.warning("audit records not sent by the invocation's deadline")
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     logger.info("app created")
 
     # Register views & error handler
     app.register_blueprint(eligibility_blueprint, url_prefix="/patient-check")
     app.register_error_handler(Exception, handle_exception)
 
+    # Give each request a deadline - the sooner of the request budget and, in Lambda, the time the Lambda has left
+    request_budget_seconds = config()["request_budget_seconds"]
+    app.before_request(lambda: start_request_deadline(request_budget_seconds))
+    app.teardown_request(end_request_deadline)
+
     # Set up dependency injection using wireup
     container = wireup.create_sync_container(service_modules=[services, repos], parameters={**app.config, **config()})
     wireup.integration.flask.setup(container, app)
@@ -48,5 +98,47 @@ def create_app() -> Flask:
     return app
 
 
+def start_request_deadline(seconds: float) -> None:
+    g.deadline = ExitStack()
+    g.deadline.enter_context(deadline(seconds))
+
+
+def end_request_deadline(_: BaseException | None) -> None:
+    if (request_deadline := g.pop("deadline", None)) is not None:
+        request_deadline.close()
+
+
+def warm_up_connections(app: Flask, timeout: float) -> None:
+    """Open connections to DynamoDB, S3 and Firehose, so that the first request doesn't wait for DNS lookups and TCP
+    and TLS handshakes. The calls made are cheap, and their results - even errors - don't matter, only the connections
+    they leave behind in the clients' pools. Gives up waiting after the timeout, so never holds up start up for long,
+    and a timeout of 0 disables warming up."""
+    if timeout <= 0:
+        return
+    container = wireup.integration.flask.get_app_container(app)
+    warm_ups = {
+        "dynamodb": container.get(PersonRepo).warm_up,
+        "s3": container.get(CampaignRepo).warm_up,
+        "firehose": container.get(AuditService).warm_up,
+    }
+    executor = ThreadPoolExecutor(max_workers=len(warm_ups), thread_name_prefix="warm_up")
+    futures = {executor.submit(warm_up): name for name, warm_up in warm_ups.items()}
+    done, not_done = wait(futures, timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        if (e := future.exception()) is not None:
+            logger.info("warming up %s connections failed: %r", futures[future], e)
+    logger.info(
+        "connections warmed up",
+        extra={"warmed_up": sorted(futures[f] for f in done), "timed_out": sorted(futures[f] for f in not_done)},
+    )
+
+
+if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):  # pragma: no cover
+    # Running in Lambda, so create the app and warm up its connections in the init phase, before the first invocation.
+    get_lambda_handler()
+
+
 if __name__ == "__main__":
     main()
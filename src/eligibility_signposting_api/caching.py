@@ -0,0 +1,118 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry[V]:
+    value: V
+    size: int
+    expires_at: float | None
+
+
+def deep_sizeof(obj: object) -> int:
+    """Approximate memory held by an object and the containers and strings inside it, in bytes."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        size += sum(deep_sizeof(key) + deep_sizeof(value) for key, value in obj.items())
+    elif isinstance(obj, list | tuple | set | frozenset):
+        size += sum(deep_sizeof(item) for item in obj)
+    return size
+
+
+class LruCache[K: Hashable, V]:
+    """A thread-safe, bounded, least-recently-used cache which keeps hit, miss and eviction counts.
+
+    Optionally, entries expire after a time to live, and the cache is also bounded by the memory its entries hold, as
+    measured by the sizeof function given."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        *,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[object], int] = sys.getsizeof,
+    ) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.stats = CacheStats()
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                if entry.expires_at is None or entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return entry.value
+                self._remove(key)
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: K, value: V) -> None:
+        if self.max_entries <= 0:
+            return
+        size = sys.getsizeof(key) + self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _Entry(value, size, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._over_max_bytes():
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def discard(self, key: K) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def discard_where(self, predicate: Callable[[K], bool]) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def footprint(self) -> int:
+        """Approximate memory held by the cache, in bytes, as measured by the cache's sizeof function."""
+        with self._lock:
+            return sys.getsizeof(self._entries) + self._bytes
+
+    def _over_max_bytes(self) -> bool:
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _remove(self, key: K) -> None:
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._bytes -= entry.size
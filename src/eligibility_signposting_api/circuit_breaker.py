@@ -0,0 +1,186 @@
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+logger = logging.getLogger(__name__)
+
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottled",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+        "TransactionInProgressException",
+        "RequestLimitExceeded",
+        "BandwidthLimitExceeded",
+        "LimitExceededException",
+        "SlowDown",
+        "PriorRequestNotComplete",
+        "ServiceUnavailable",
+        "ServiceUnavailableException",
+        "InternalError",
+        "InternalServerError",
+        "InternalFailure",
+    }
+)
+
+
+class CircuitOpenError(Exception):
+    """A dependency's circuit is open, so calls to it are failing fast."""
+
+
+class CircuitState(StrEnum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+@dataclass(frozen=True)
+class CircuitBreakerSettings:
+    """A circuit opens when, of the last window calls, the share failing or the share slower than slow_call_seconds
+    reaches its threshold. It stays open for open_seconds, then lets a probe call through, closing again if the probe
+    succeeds promptly. A window of 0 disables the circuit breaker."""
+
+    window: int = 0
+    failure_rate: float = 0.5
+    slow_call_seconds: float = 1.0
+    slow_call_rate: float = 0.8
+    open_seconds: float = 30.0
+
+    @property
+    def min_calls(self) -> int:
+        """Calls needed in the window before the circuit can open, so that a few early failures don't open it."""
+        return max(self.window // 2, 1)
+
+
+@dataclass
+class CircuitStats:
+    calls: int = 0
+    failures: int = 0
+    slow_calls: int = 0
+    rejections: int = 0
+    openings: int = 0
+
+
+class CircuitBreaker:
+    """Guards calls to a dependency, such as DynamoDB, so that while it is failing or slow, requests fail fast - or
+    fall back - rather than each waiting out timeouts and retries, and piling up.
+
+    Only the dependency's own errors count as failures: connection errors and timeouts, throttling, and 5xx responses.
+    Others, such as a missing key, a malformed request, or running out of time for the request, aren't the dependency's
+    fault, so don't count - otherwise one caller's bad requests could open the circuit for everyone."""
+
+    def __init__(self, name: str, settings: CircuitBreakerSettings) -> None:
+        super().__init__()
+        self.name = name
+        self.settings = settings
+        self.enabled = settings.window > 0
+        self.stats = CircuitStats()
+        self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=max(settings.window, 1))  # (failed, slow)
+        self._state = CircuitState.closed
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def call[T](self, dependency_call: Callable[[], T]) -> T:
+        if not self.enabled:
+            return dependency_call()
+
+        probe = self._admit()
+        start = time.monotonic()
+        try:
+            result = dependency_call()
+        except BaseException as error:
+            if is_dependency_failure(error):
+                self._record(probe=probe, failed=True, slow=False)
+            else:
+                self._release(probe=probe)
+            raise
+        self._record(probe=probe, failed=False, slow=time.monotonic() - start > self.settings.slow_call_seconds)
+        return result
+
+    def _admit(self) -> bool:
+        """Let a call through, or refuse it if the circuit is open. Returns whether the call is a half open probe."""
+        with self._lock:
+            if self._state == CircuitState.open and time.monotonic() - self._opened_at >= self.settings.open_seconds:
+                self._transition(CircuitState.half_open)
+            if self._state == CircuitState.closed:
+                return False
+            if self._state == CircuitState.half_open and not self._probing:
+                self._probing = True
+                return True
+            self.stats.rejections += 1
+        msg = f"{self.name} circuit is {self._state}"
+        raise CircuitOpenError(msg)
+
+    def _release(self, *, probe: bool) -> None:
+        if probe:
+            with self._lock:
+                self._probing = False
+
+    def _record(self, *, probe: bool, failed: bool, slow: bool) -> None:
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.failures += failed
+            self.stats.slow_calls += slow
+            if probe:
+                self._probing = False
+                if failed or slow:
+                    self._open()
+                else:
+                    self._outcomes.clear()
+                    self._transition(CircuitState.closed)
+                return
+
+            self._outcomes.append((failed, slow))
+            if len(self._outcomes) < self.settings.min_calls:
+                return
+            failures = sum(failed for failed, _ in self._outcomes)
+            slow_calls = sum(slow for _, slow in self._outcomes)
+            if (
+                failures >= self.settings.failure_rate * len(self._outcomes)
+                or slow_calls >= self.settings.slow_call_rate * len(self._outcomes)
+            ) and self._state == CircuitState.closed:
+                self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self.stats.openings += 1
+        self._transition(CircuitState.open)
+
+    def _transition(self, state: CircuitState) -> None:
+        if state != self._state:
+            log = logger.warning if state == CircuitState.open else logger.info
+            log(
+                "%s circuit %s",
+                self.name,
+                state,
+                extra={"dependency": self.name, "state": state, "from_state": self._state, **vars(self.stats)},
+            )
+            self._state = state
+
+
+def is_dependency_failure(error: BaseException) -> bool:
+    """Whether an error is the dependency failing, rather than the caller's doing."""
+    if isinstance(error, BotoCoreError):
+        return True
+    if isinstance(error, ClientError):
+        status_code = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES or status_code >= 500  # noqa: PLR2004 - 5xx
+    return False
+
+
+NO_CIRCUIT_BREAKER = CircuitBreaker("none", CircuitBreakerSettings())
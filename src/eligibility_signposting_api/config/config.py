@@ -2,12 +2,14 @@ import logging
 import os
 from collections.abc import Sequence
 from functools import cache
+from pathlib import Path
 from typing import Any, NewType
 
 from pythonjsonlogger.json import JsonFormatter
 from yarl import URL
 
 from eligibility_signposting_api.repos.campaign_repo import BucketName
+from eligibility_signposting_api.repos.known_people import DEFAULT_PERSON_FILTER_KEY
 from eligibility_signposting_api.repos.person_repo import TableName
 
 LOG_LEVEL = logging.getLevelNamesMapping().get(os.getenv("LOG_LEVEL", ""), logging.WARNING)
@@ -28,6 +30,50 @@ def config() -> dict[str, Any]:
         os.getenv("KINESIS_AUDIT_STREAM_TO_S3", "test_kinesis_audit_stream_to_s3")
     )
     log_level = LOG_LEVEL
+    operator_result_cache_size = int(os.getenv("OPERATOR_RESULT_CACHE_SIZE", "0"))
+    person_table_low_level_client = os.getenv("PERSON_TABLE_LOW_LEVEL_CLIENT", "false").lower() == "true"
+    person_table_compact_layout = os.getenv("PERSON_TABLE_COMPACT_LAYOUT", "false").lower() == "true"
+    person_cache_size = int(os.getenv("PERSON_CACHE_SIZE", "0"))
+    person_cache_ttl_seconds = float(os.getenv("PERSON_CACHE_TTL_SECONDS", "5"))
+    person_cache_max_bytes = int(os.getenv("PERSON_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    person_not_found_cache_size = int(os.getenv("PERSON_NOT_FOUND_CACHE_SIZE", "0"))
+    person_not_found_cache_ttl_seconds = float(os.getenv("PERSON_NOT_FOUND_CACHE_TTL_SECONDS", "10"))
+    person_filter_bucket_name = (
+        BucketName(os.environ["PERSON_FILTER_BUCKET_NAME"]) if os.getenv("PERSON_FILTER_BUCKET_NAME") else None
+    )
+    person_filter_key = os.getenv("PERSON_FILTER_KEY", DEFAULT_PERSON_FILTER_KEY)
+    person_filter_refresh_seconds = float(os.getenv("PERSON_FILTER_REFRESH_SECONDS", "300"))
+    fetch_pool_size = int(os.getenv("FETCH_POOL_SIZE", "4"))
+    aws_max_pool_connections = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "10"))
+    aws_tcp_keepalive = os.getenv("AWS_TCP_KEEPALIVE", "true").lower() == "true"
+    aws_retry_mode = os.getenv("AWS_RETRY_MODE", "adaptive")
+    aws_max_attempts = int(os.getenv("AWS_MAX_ATTEMPTS", "3"))
+    dynamodb_connect_timeout = float(os.getenv("DYNAMODB_CONNECT_TIMEOUT", "1"))
+    dynamodb_read_timeout = float(os.getenv("DYNAMODB_READ_TIMEOUT", "2"))
+    s3_connect_timeout = float(os.getenv("S3_CONNECT_TIMEOUT", "1"))
+    s3_read_timeout = float(os.getenv("S3_READ_TIMEOUT", "3"))
+    firehose_connect_timeout = float(os.getenv("FIREHOSE_CONNECT_TIMEOUT", "1"))
+    firehose_read_timeout = float(os.getenv("FIREHOSE_READ_TIMEOUT", "3"))
+    connection_warm_up_timeout = float(os.getenv("CONNECTION_WARM_UP_TIMEOUT", "2"))
+    request_budget_seconds = float(os.getenv("REQUEST_BUDGET_SECONDS", "25"))
+    optional_work_margin_seconds = float(os.getenv("OPTIONAL_WORK_MARGIN_SECONDS", "1"))
+    person_read_hedge_percentile = float(os.getenv("PERSON_READ_HEDGE_PERCENTILE", "0"))
+    person_read_hedge_max_rate = float(os.getenv("PERSON_READ_HEDGE_MAX_RATE", "0.05"))
+    person_read_hedge_min_delay_seconds = float(os.getenv("PERSON_READ_HEDGE_MIN_DELAY_SECONDS", "0.005"))
+    circuit_breaker_window = int(os.getenv("CIRCUIT_BREAKER_WINDOW", "0"))
+    circuit_breaker_failure_rate = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5"))
+    circuit_breaker_slow_call_seconds = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", "1"))
+    circuit_breaker_slow_call_rate = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATE", "0.8"))
+    circuit_breaker_open_seconds = float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "30"))
+    audit_batch_max_records = int(os.getenv("AUDIT_BATCH_MAX_RECORDS", "500"))
+    audit_batch_max_bytes = int(os.getenv("AUDIT_BATCH_MAX_BYTES", str(4 * 1024 * 1024)))
+    audit_batch_max_age_seconds = float(os.getenv("AUDIT_BATCH_MAX_AGE_SECONDS", "1"))
+    audit_max_attempts = int(os.getenv("AUDIT_MAX_ATTEMPTS", "3"))
+    audit_queue_size = int(os.getenv("AUDIT_QUEUE_SIZE", "0"))
+    audit_queue_overflow_policy = os.getenv("AUDIT_QUEUE_OVERFLOW_POLICY", "drop_oldest")
+    audit_spool_dir = Path(os.getenv("AUDIT_SPOOL_DIR", "/tmp/audit-spool"))  # noqa: S108 - Lambda's writable directory
+    audit_spool_max_bytes = int(os.getenv("AUDIT_SPOOL_MAX_BYTES", str(64 * 1024 * 1024)))
+    audit_encoding = os.getenv("AUDIT_ENCODING", "json")
 
     if os.getenv("ENV"):
         return {
@@ -42,6 +88,48 @@ def config() -> dict[str, Any]:
             "firehose_endpoint": None,
             "kinesis_audit_stream_to_s3": kinesis_audit_stream_to_s3,
             "log_level": log_level,
+            "operator_result_cache_size": operator_result_cache_size,
+            "person_table_low_level_client": person_table_low_level_client,
+            "person_table_compact_layout": person_table_compact_layout,
+            "person_cache_size": person_cache_size,
+            "person_cache_ttl_seconds": person_cache_ttl_seconds,
+            "person_cache_max_bytes": person_cache_max_bytes,
+            "person_not_found_cache_size": person_not_found_cache_size,
+            "person_not_found_cache_ttl_seconds": person_not_found_cache_ttl_seconds,
+            "person_filter_bucket_name": person_filter_bucket_name,
+            "person_filter_key": person_filter_key,
+            "person_filter_refresh_seconds": person_filter_refresh_seconds,
+            "fetch_pool_size": fetch_pool_size,
+            "aws_max_pool_connections": aws_max_pool_connections,
+            "aws_tcp_keepalive": aws_tcp_keepalive,
+            "aws_retry_mode": aws_retry_mode,
+            "aws_max_attempts": aws_max_attempts,
+            "dynamodb_connect_timeout": dynamodb_connect_timeout,
+            "dynamodb_read_timeout": dynamodb_read_timeout,
+            "s3_connect_timeout": s3_connect_timeout,
+            "s3_read_timeout": s3_read_timeout,
+            "firehose_connect_timeout": firehose_connect_timeout,
+            "firehose_read_timeout": firehose_read_timeout,
+            "connection_warm_up_timeout": connection_warm_up_timeout,
+            "request_budget_seconds": request_budget_seconds,
+            "optional_work_margin_seconds": optional_work_margin_seconds,
+            "person_read_hedge_percentile": person_read_hedge_percentile,
+            "person_read_hedge_max_rate": person_read_hedge_max_rate,
+            "person_read_hedge_min_delay_seconds": person_read_hedge_min_delay_seconds,
+            "circuit_breaker_window": circuit_breaker_window,
+            "circuit_breaker_failure_rate": circuit_breaker_failure_rate,
+            "circuit_breaker_slow_call_seconds": circuit_breaker_slow_call_seconds,
+            "circuit_breaker_slow_call_rate": circuit_breaker_slow_call_rate,
+            "circuit_breaker_open_seconds": circuit_breaker_open_seconds,
+            "audit_batch_max_records": audit_batch_max_records,
+            "audit_batch_max_bytes": audit_batch_max_bytes,
+            "audit_batch_max_age_seconds": audit_batch_max_age_seconds,
+            "audit_max_attempts": audit_max_attempts,
+            "audit_queue_size": audit_queue_size,
+            "audit_queue_overflow_policy": audit_queue_overflow_policy,
+            "audit_spool_dir": audit_spool_dir,
+            "audit_spool_max_bytes": audit_spool_max_bytes,
+            "audit_encoding": audit_encoding,
         }
 
     return {
@@ -56,6 +144,48 @@ def config() -> dict[str, Any]:
         "firehose_endpoint": URL(os.getenv("FIREHOSE_ENDPOINT", "http://localhost:4566")),
         "kinesis_audit_stream_to_s3": kinesis_audit_stream_to_s3,
         "log_level": log_level,
+        "operator_result_cache_size": operator_result_cache_size,
+        "person_table_low_level_client": person_table_low_level_client,
+        "person_table_compact_layout": person_table_compact_layout,
+        "person_cache_size": person_cache_size,
+        "person_cache_ttl_seconds": person_cache_ttl_seconds,
+        "person_cache_max_bytes": person_cache_max_bytes,
+        "person_not_found_cache_size": person_not_found_cache_size,
+        "person_not_found_cache_ttl_seconds": person_not_found_cache_ttl_seconds,
+        "person_filter_bucket_name": person_filter_bucket_name,
+        "person_filter_key": person_filter_key,
+        "person_filter_refresh_seconds": person_filter_refresh_seconds,
+        "fetch_pool_size": fetch_pool_size,
+        "aws_max_pool_connections": aws_max_pool_connections,
+        "aws_tcp_keepalive": aws_tcp_keepalive,
+        "aws_retry_mode": aws_retry_mode,
+        "aws_max_attempts": aws_max_attempts,
+        "dynamodb_connect_timeout": dynamodb_connect_timeout,
+        "dynamodb_read_timeout": dynamodb_read_timeout,
+        "s3_connect_timeout": s3_connect_timeout,
+        "s3_read_timeout": s3_read_timeout,
+        "firehose_connect_timeout": firehose_connect_timeout,
+        "firehose_read_timeout": firehose_read_timeout,
+        "connection_warm_up_timeout": connection_warm_up_timeout,
+        "request_budget_seconds": request_budget_seconds,
+        "optional_work_margin_seconds": optional_work_margin_seconds,
+        "person_read_hedge_percentile": person_read_hedge_percentile,
+        "person_read_hedge_max_rate": person_read_hedge_max_rate,
+        "person_read_hedge_min_delay_seconds": person_read_hedge_min_delay_seconds,
+        "circuit_breaker_window": circuit_breaker_window,
+        "circuit_breaker_failure_rate": circuit_breaker_failure_rate,
+        "circuit_breaker_slow_call_seconds": circuit_breaker_slow_call_seconds,
+        "circuit_breaker_slow_call_rate": circuit_breaker_slow_call_rate,
+        "circuit_breaker_open_seconds": circuit_breaker_open_seconds,
+        "audit_batch_max_records": audit_batch_max_records,
+        "audit_batch_max_bytes": audit_batch_max_bytes,
+        "audit_batch_max_age_seconds": audit_batch_max_age_seconds,
+        "audit_max_attempts": audit_max_attempts,
+        "audit_queue_size": audit_queue_size,
+        "audit_queue_overflow_policy": audit_queue_overflow_policy,
+        "audit_spool_dir": audit_spool_dir,
+        "audit_spool_max_bytes": audit_spool_max_bytes,
+        "audit_encoding": audit_encoding,
     }
 
 
@@ -0,0 +1,53 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """There's no time left to finish handling the request."""
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Finish the work in this context within this many seconds, or by any deadline already set, whichever is sooner.
+
+    The deadline is held in a context variable, so it follows the request into threads run with a copy of its context,
+    and into the botocore event handler below."""
+    if seconds is None:
+        yield
+        return
+    new_deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(new_deadline if current is None else min(current, new_deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the deadline, or None if there is no deadline."""
+    current = _deadline.get()
+    return current - time.monotonic() if current is not None else None
+
+
+def has_time_for(seconds: float) -> bool:
+    """Is there more than this many seconds left? Use to skip optional work as the deadline approaches."""
+    left = remaining()
+    return left is None or left > seconds
+
+
+def check_deadline(operation: str) -> None:
+    if not has_time_for(0):
+        msg = f"deadline passed before {operation}"
+        raise DeadlineExceededError(msg)
+
+
+def refuse_after_deadline(event_name: str, **_: object) -> None:
+    """A botocore before-send event handler, refusing to send requests - including retries - once the deadline has
+    passed. Botocore's timeouts are per client rather than per call, so this, with short client timeouts, is what
+    keeps AWS calls within the deadline."""
+    check_deadline(event_name.removeprefix("before-send."))
@@ -0,0 +1,24 @@
+NHS_NUMBER_LENGTH = 10
+CHECK_DIGIT_MODULUS = 11
+
+
+def is_valid_nhs_number(nhs_number: str) -> bool:
+    """Is this a well formed NHS number - ten digits, the last a Modulus 11 check digit over the other nine?
+
+    See https://www.datadictionary.nhs.uk/attributes/nhs_number.html. Checking costs nothing next to looking up a
+    person, so numbers which can't exist are rejected before any I/O."""
+    if len(nhs_number) != NHS_NUMBER_LENGTH or not (nhs_number.isascii() and nhs_number.isdigit()):
+        return False
+    return check_digit(nhs_number[:-1]) == int(nhs_number[-1])
+
+
+def check_digit(digits: str) -> int | None:
+    """The Modulus 11 check digit for the first nine digits of an NHS number, or None if there isn't one, in which
+    case no NHS number starts with these digits."""
+    total = sum(int(digit) * weight for digit, weight in zip(digits, range(NHS_NUMBER_LENGTH, 1, -1), strict=True))
+    check = CHECK_DIGIT_MODULUS - total % CHECK_DIGIT_MODULUS
+    if check == CHECK_DIGIT_MODULUS:
+        return 0
+    if check == CHECK_DIGIT_MODULUS - 1:
+        return None
+    return check
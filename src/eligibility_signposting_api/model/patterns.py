@@ -0,0 +1,96 @@
+import re
+from functools import lru_cache
+from typing import Any
+
+try:
+    import re._parser as sre_parse  # No public API for the parsed form of a pattern
+except ImportError as e:  # pragma: no cover - re._parser is private, so could move in a later Python
+    msg = "pattern safety checks need re._parser, which this Python doesn't have"
+    raise ImportError(msg) from e
+
+PATTERN_CACHE_SIZE = 1024
+MAX_PATTERN_LENGTH = 1000
+
+# Patterns the safety checks must tell apart, checked at import, so that a Python whose parsed form of patterns has
+# changed fails at start up, rather than letting unsafe patterns through.
+KNOWN_UNSAFE_PATTERNS = ("(a+)+", "(?>(a+)+c)", "(a|b+)*")
+KNOWN_SAFE_PATTERNS = ("(ab)+", "(?>a+)+", "(?:a++)+")
+
+
+class UnsafePatternError(ValueError):
+    """A rule's pattern is invalid, or could take exponential time to match."""
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Check and compile a rule's pattern. Compiled patterns are shared between all the rules using them."""
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        msg = f"pattern longer than {MAX_PATTERN_LENGTH} characters"
+        raise UnsafePatternError(msg)
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error as e:
+        msg = f"invalid pattern {pattern!r}: {e}"
+        raise UnsafePatternError(msg) from e
+    if _has_nested_unbounded_repeat(parsed, inside_unbounded_repeat=False):
+        msg = f"pattern {pattern!r} nests unbounded repeats, so could backtrack catastrophically"
+        raise UnsafePatternError(msg)
+    return re.compile(pattern)
+
+
+def _has_nested_unbounded_repeat(parsed: sre_parse.SubPattern | list, *, inside_unbounded_repeat: bool) -> bool:
+    """Look for patterns like (a+)+ or (a*b?)*, where an unbounded repeat contains another, so that a failing match
+    tries exponentially many ways of splitting the input between them. Possessive repeats and atomic groups are never
+    backtracked into, so are safe inside another repeat - though what's inside them is checked in turn."""
+    for op, av in parsed:
+        # Opcodes aren't in the typeshed stubs for re._parser, so compare them by name.
+        if str(op) in ("MAX_REPEAT", "MIN_REPEAT"):
+            _low, high, subpattern = av
+            unbounded = high == sre_parse.MAXREPEAT
+            if unbounded and inside_unbounded_repeat:
+                return True
+            children, inside_unbounded_repeat_child = [subpattern], inside_unbounded_repeat or unbounded
+        else:
+            children, inside_unbounded_repeat_child = _children(str(op), av), inside_unbounded_repeat
+            if str(op) in ("ATOMIC_GROUP", "POSSESSIVE_REPEAT"):
+                inside_unbounded_repeat_child = False
+        if any(
+            _has_nested_unbounded_repeat(child, inside_unbounded_repeat=inside_unbounded_repeat_child)
+            for child in children
+        ):
+            return True
+    return False
+
+
+def _children(op: str, av: Any) -> list[sre_parse.SubPattern]:  # noqa: ANN401, PLR0911 - a case for each kind of node
+    """The subpatterns of a node of a parsed pattern, other than a repeat's."""
+    match op:
+        case "SUBPATTERN":
+            return [av[-1]]
+        case "BRANCH":
+            return av[1]
+        case "ASSERT" | "ASSERT_NOT":
+            return [av[1]]
+        case "ATOMIC_GROUP":
+            return [av]
+        case "POSSESSIVE_REPEAT":
+            return [av[2]]
+        case "GROUPREF_EXISTS":
+            return [branch for branch in av[1:] if branch is not None]
+        case _:
+            return []
+
+
+def _check_parser() -> None:
+    if not all(
+        _has_nested_unbounded_repeat(sre_parse.parse(pattern), inside_unbounded_repeat=False)
+        for pattern in KNOWN_UNSAFE_PATTERNS
+    ) or any(
+        _has_nested_unbounded_repeat(sre_parse.parse(pattern), inside_unbounded_repeat=False)
+        for pattern in KNOWN_SAFE_PATTERNS
+    ):  # pragma: no cover
+        msg = "re._parser's parsed form of patterns has changed, so pattern safety checks can't be trusted"
+        raise ImportError(msg)
+
+
+_check_parser()
@@ -0,0 +1,81 @@
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from typing import ClassVar, NewType
+
+ReferenceListName = NewType("ReferenceListName", str)
+
+LARGE_LIST_THRESHOLD = 100_000
+
+
+class UnknownReferenceListError(LookupError):
+    """A rule refers to a reference list which hasn't been loaded."""
+
+
+class ReferenceList:
+    """A named list of values - postcodes, GP practice codes and so on - which rules can refer to rather than listing
+    the values inline in the campaign config.
+
+    Lists are held as a frozenset, or for very large lists as a sorted tuple searched by bisection, which needs much
+    less memory at the cost of O(log n) lookups."""
+
+    def __init__(
+        self,
+        name: ReferenceListName,
+        values: Iterable[str],
+        version: str | None = None,
+        large_list_threshold: int = LARGE_LIST_THRESHOLD,
+    ) -> None:
+        super().__init__()
+        self.name = name
+        self.version = version
+        unique_values = {str(v) for v in values}
+        self._set: frozenset[str] | None = None
+        self._sorted: tuple[str, ...] = ()
+        if len(unique_values) > large_list_threshold:
+            self._sorted = tuple(sorted(unique_values))
+        else:
+            self._set = frozenset(unique_values)
+
+    def __contains__(self, value: object) -> bool:
+        if self._set is not None:
+            return value in self._set
+        if not isinstance(value, str):
+            return False
+        index = bisect_left(self._sorted, value)
+        return index < len(self._sorted) and self._sorted[index] == value
+
+    def __len__(self) -> int:
+        return len(self._set) if self._set is not None else len(self._sorted)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._set if self._set is not None else self._sorted)
+
+    @property
+    def is_large(self) -> bool:
+        return self._set is None
+
+    def __repr__(self) -> str:
+        return f"ReferenceList(name={self.name!r}, version={self.version!r}, size={len(self)})"
+
+
+class ReferenceListRegistry:
+    """Loaded reference lists, shared between all the rules which refer to them."""
+
+    registry: ClassVar[dict[ReferenceListName, ReferenceList]] = {}
+
+    @staticmethod
+    def register(reference_list: ReferenceList) -> None:
+        ReferenceListRegistry.registry[reference_list.name] = reference_list
+
+    @staticmethod
+    def get(name: ReferenceListName) -> ReferenceList:
+        if (reference_list := ReferenceListRegistry.registry.get(name)) is not None:
+            return reference_list
+        msg = f"reference list {name} not loaded"
+        raise UnknownReferenceListError(msg)
+
+    @staticmethod
+    def versions() -> frozenset[tuple[ReferenceListName, str | None]]:
+        return frozenset(
+            (name, reference_list.version) for name, reference_list in ReferenceListRegistry.registry.items()
+        )
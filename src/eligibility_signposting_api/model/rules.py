@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import re
 import typing
 from collections import Counter
 from datetime import UTC, date, datetime
@@ -12,8 +13,11 @@ from typing import Literal, NewType
 from pydantic import BaseModel, Field, RootModel, field_serializer, field_validator, model_validator
 
 from eligibility_signposting_api.config.contants import MAGIC_COHORT_LABEL, RULE_STOP_DEFAULT
+from eligibility_signposting_api.model.patterns import compile_pattern
 
 if typing.TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+
     from pydantic import SerializationInfo
 
 CampaignName = NewType("CampaignName", str)
@@ -37,6 +41,8 @@ Description = NewType("Description", str)
 RuleStop = NewType("RuleStop", bool)
 CommsRouting = NewType("CommsRouting", str)
 
+ITEM_DEFAULT_PATTERN = re.compile(r"(?P<rule_value>[^\[]+)\[\[NVL:(?P<item_default>[^\]]+)\]\]")
+
 
 class RuleType(StrEnum):
     filter = "F"
@@ -55,7 +61,11 @@ class RuleOperator(StrEnum):
     not_contains = "not_contains"
     starts_with = "starts_with"
     not_starts_with = "not_starts_with"
+    starts_with_any = "starts_with_any"
+    not_starts_with_any = "not_starts_with_any"
     ends_with = "ends_with"
+    matches = "matches"
+    not_matches = "not_matches"
     is_in = "in"
     not_in = "not_in"
     member_of = "MemberOf"
@@ -124,6 +134,15 @@ class IterationRule(BaseModel):
             return v.upper() == "Y"
         return v
 
+    @model_validator(mode="after")
+    def check_pattern_safe(self) -> typing.Self:
+        """Reject invalid or catastrophically backtracking patterns when the config is loaded, rather than when a
+        person is being assessed. This also compiles the pattern ahead of time."""
+        if self.operator in (RuleOperator.matches, RuleOperator.not_matches):
+            match = ITEM_DEFAULT_PATTERN.fullmatch(self.comparator)
+            compile_pattern(match.group("rule_value") if match else self.comparator)
+        return self
+
     def __str__(self) -> str:
         return json.dumps(self.model_dump(by_alias=True), indent=2)
 
@@ -262,3 +281,11 @@ class Rules(BaseModel):
     campaign_config: CampaignConfig = Field(..., alias="CampaignConfig")
 
     model_config = {"populate_by_name": True, "extra": "ignore"}
+
+
+RulesetVersion = frozenset[tuple[CampaignID, CampaignVersion, IterationID, IterationVersion]]
+
+
+def ruleset_version(campaign_configs: Iterable[CampaignConfig]) -> RulesetVersion:
+    """Identify a set of campaign configs, so that anything derived from them can be reused until they change."""
+    return frozenset((cc.id, cc.version, i.id, i.version) for cc in campaign_configs for i in cc.iterations)
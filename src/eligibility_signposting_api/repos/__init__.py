@@ -1,5 +1,5 @@
 from .campaign_repo import CampaignRepo
 from .exceptions import NotFoundError
-from .person_repo import PersonRepo
+from .person_repo import FetchPlan, PersonRepo
 
-__all__ = ["CampaignRepo", "NotFoundError", "PersonRepo"]
+__all__ = ["CampaignRepo", "FetchPlan", "NotFoundError", "PersonRepo"]
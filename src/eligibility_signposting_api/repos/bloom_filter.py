@@ -0,0 +1,78 @@
+import math
+import struct
+from collections.abc import Iterable
+from hashlib import blake2b
+from typing import Self
+
+BLOOM_FILTER_FORMAT_VERSION = 1
+_HEADER = struct.Struct(">BIQ")  # format version, hash count, bit count
+
+
+class BloomFilterFormatError(ValueError):
+    """A serialised Bloom filter is in a format we don't understand."""
+
+
+class BloomFilter:
+    """A set of strings which never forgets a member, but may wrongly claim a non-member, at a rate fixed when the
+    filter is sized. Membership tests are quick and the filter is small - under 10 bits a member for a 1% false
+    positive rate - so it can be held in memory to rule out looking up strings which definitely aren't present.
+
+    Each string's bit positions are derived from a single BLAKE2b hash, split in two and combined as Kirsch and
+    Mitzenmacher describe, so filters built by one process can be read by another."""
+
+    def __init__(self, bit_count: int, hash_count: int, bits: bytearray | None = None) -> None:
+        super().__init__()
+        if bit_count <= 0 or hash_count <= 0:
+            msg = f"invalid Bloom filter size, {bit_count} bits and {hash_count} hashes"
+            raise BloomFilterFormatError(msg)
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray((bit_count + 7) // 8)
+        if len(self.bits) != (bit_count + 7) // 8:
+            msg = f"Bloom filter of {bit_count} bits has {len(self.bits)} bytes"
+            raise BloomFilterFormatError(msg)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> Self:
+        """A filter big enough to hold capacity members with the false positive rate given."""
+        if not 0 < false_positive_rate < 1:
+            msg = f"false positive rate {false_positive_rate} not between 0 and 1"
+            raise ValueError(msg)
+        capacity = max(capacity, 1)
+        bit_count = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        hash_count = max(round(bit_count / capacity * math.log(2)), 1)
+        return cls(bit_count, hash_count)
+
+    @classmethod
+    def of(cls, members: Iterable[str], false_positive_rate: float) -> Self:
+        members = list(members)
+        bloom_filter = cls.for_capacity(len(members), false_positive_rate)
+        for member in members:
+            bloom_filter.add(member)
+        return bloom_filter
+
+    def add(self, member: str) -> None:
+        for position in self._positions(member):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, member: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(member))
+
+    def _positions(self, member: str) -> Iterable[int]:
+        digest = blake2b(member.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8]), int.from_bytes(digest[8:])
+        return ((first + i * second) % self.bit_count for i in range(self.hash_count))
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(BLOOM_FILTER_FORMAT_VERSION, self.hash_count, self.bit_count) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        if len(data) < _HEADER.size or data[0] != BLOOM_FILTER_FORMAT_VERSION:
+            msg = f"unknown Bloom filter format version {data[:1]!r}"
+            raise BloomFilterFormatError(msg)
+        _version, hash_count, bit_count = _HEADER.unpack_from(data)
+        return cls(bit_count, hash_count, bytearray(data[_HEADER.size :]))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(bit_count={self.bit_count}, hash_count={self.hash_count})"
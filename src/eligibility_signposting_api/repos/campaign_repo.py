@@ -1,33 +1,87 @@
 import json
+import logging
 from collections.abc import Generator
-from typing import Annotated, NewType
+from typing import Annotated, Any, NewType
 
 from botocore.client import BaseClient
 from wireup import Inject, service
 
+from eligibility_signposting_api.circuit_breaker import NO_CIRCUIT_BREAKER, CircuitBreaker, CircuitOpenError
+from eligibility_signposting_api.model.reference_lists import ReferenceList, ReferenceListName, ReferenceListRegistry
 from eligibility_signposting_api.model.rules import CampaignConfig, Rules
 
+logger = logging.getLogger(__name__)
+
 BucketName = NewType("BucketName", str)
 
+REFERENCE_LIST_PREFIX = "lists/"
+
 
 @service
 class CampaignRepo:
     """Repository class for Campaign Rules, which we can use to calculate a person's eligibility for vaccination.
 
-    These rules are stored as JSON files in AWS S3."""
+    These rules are stored as JSON files in AWS S3. Reference lists which rules can refer to are stored alongside them
+    as JSON arrays, under the lists/ prefix - so lists/gp_practices.json holds the list referred to by
+    [[LIST:gp_practices]].
+
+    While S3's circuit is open, the campaign configs last read are served instead, if there are any."""
 
     def __init__(
         self,
         s3_client: Annotated[BaseClient, Inject(qualifier="s3")],
         bucket_name: Annotated[BucketName, Inject(param="rules_bucket_name")],
+        circuit_breaker: Annotated[CircuitBreaker, Inject(qualifier="s3")] = NO_CIRCUIT_BREAKER,
     ) -> None:
         super().__init__()
         self.s3_client = s3_client
         self.bucket_name = bucket_name
+        self.circuit_breaker = circuit_breaker
+        self._last_campaign_configs: list[CampaignConfig] | None = None
 
     def get_campaign_configs(self) -> Generator[CampaignConfig]:
+        if not self.circuit_breaker.enabled:
+            yield from self._read_campaign_configs()
+            return
+
+        try:
+            campaign_configs = self.circuit_breaker.call(lambda: list(self._read_campaign_configs()))
+        except CircuitOpenError:
+            if self._last_campaign_configs is None:
+                raise
+            logger.warning("s3 circuit open, serving the campaign configs last read")
+            campaign_configs = self._last_campaign_configs
+        else:
+            self._last_campaign_configs = campaign_configs
+        yield from campaign_configs
+
+    def _read_campaign_configs(self) -> Generator[CampaignConfig]:
         campaign_objects = self.s3_client.list_objects(Bucket=self.bucket_name)
+        list_objects = [o for o in campaign_objects["Contents"] if o["Key"].startswith(REFERENCE_LIST_PREFIX)]
+        for list_object in list_objects:
+            self.load_reference_list(list_object)
+
         for campaign_object in campaign_objects["Contents"]:
+            if campaign_object["Key"].startswith(REFERENCE_LIST_PREFIX):
+                continue
             response = self.s3_client.get_object(Bucket=self.bucket_name, Key=f"{campaign_object['Key']}")
             body = response["Body"].read()
             yield Rules.model_validate(json.loads(body)).campaign_config
+
+    def warm_up(self) -> None:
+        """Make a cheap call with the S3 client, so it has a connection open before it's needed."""
+        self.s3_client.head_bucket(Bucket=self.bucket_name)
+
+    def load_reference_list(self, list_object: dict[str, Any]) -> None:
+        """Load a reference list into the registry, unless the version already loaded is current."""
+        key: str = list_object["Key"]
+        name = ReferenceListName(key.removeprefix(REFERENCE_LIST_PREFIX).removesuffix(".json"))
+        version = list_object.get("ETag")
+        loaded = ReferenceListRegistry.registry.get(name)
+        if loaded is not None and version is not None and loaded.version == version:
+            return
+
+        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        reference_list = ReferenceList(name, json.loads(response["Body"].read()), version=version)
+        ReferenceListRegistry.register(reference_list)
+        logger.info("loaded reference list %r", reference_list, extra={"reference_list": name})
@@ -0,0 +1,62 @@
+import json
+import zlib
+from collections.abc import Iterable, Mapping
+from decimal import Decimal
+from typing import Any
+
+COMPACT_ATTRIBUTE_TYPE = "COMPACT"
+COMPACT_ROWS_ATTRIBUTE = "ROWS"
+COMPACT_FORMAT_VERSION = 2
+LEGACY_COMPACT_FORMAT_VERSION = 1  # Numbers and sets written as strings
+SET_TAG = "$set"
+
+
+class CompactFormatError(ValueError):
+    """A compact person item is in a format we don't understand."""
+
+
+def encode_rows(rows: Iterable[Mapping[str, Any]]) -> bytes:
+    """Encode a person's rows - PERSON, COHORTS and one per target - for storing in a single compact item.
+
+    The rows are held as zlib compressed JSON, preceded by a format version byte so the format can change. Numbers,
+    including the Decimals the table resource reads, are written as ints, or floats if they aren't whole, as the
+    low-level client's deserialiser reads them, and sets as {"$set": [...]}. Any other type JSON can't hold is
+    rejected, rather than written as a string and read back as one."""
+    payload = json.dumps(list(rows), separators=(",", ":"), default=_encode_value).encode()
+    return bytes([COMPACT_FORMAT_VERSION]) + zlib.compress(payload)
+
+
+def _encode_value(value: object) -> object:
+    match value:
+        case Decimal() if value == value.to_integral_value():
+            return int(value)
+        case Decimal():
+            return float(value)
+        case set() | frozenset():
+            return {SET_TAG: sorted(value, key=str)}
+        case _:
+            msg = f"can't encode {type(value).__name__} {value!r} in a compact item"
+            raise TypeError(msg)
+
+
+def _decode_object(obj: dict[str, Any]) -> Any:
+    return set(obj[SET_TAG]) if len(obj) == 1 and SET_TAG in obj else obj
+
+
+def decode_rows(encoded: bytes) -> list[dict[str, Any]]:
+    version = encoded[0] if encoded else None
+    if version == COMPACT_FORMAT_VERSION:
+        return json.loads(zlib.decompress(encoded[1:]), object_hook=_decode_object)
+    if version == LEGACY_COMPACT_FORMAT_VERSION:
+        return json.loads(zlib.decompress(encoded[1:]))
+    msg = f"unknown compact format version {encoded[:1]!r}"
+    raise CompactFormatError(msg)
+
+
+def compact_item(nhs_number: str, rows: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+    """The compact item for a person, ready for the table resource's put_item."""
+    return {
+        "NHS_NUMBER": nhs_number,
+        "ATTRIBUTE_TYPE": COMPACT_ATTRIBUTE_TYPE,
+        COMPACT_ROWS_ATTRIBUTE: encode_rows(rows),
+    }
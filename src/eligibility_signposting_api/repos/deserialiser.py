@@ -0,0 +1,41 @@
+from collections.abc import Callable, Mapping
+from typing import Any
+
+AttributeValue = Mapping[str, Any]
+Item = Mapping[str, AttributeValue]
+
+
+def deserialise_item(item: Item) -> dict[str, Any]:
+    """Turn an item in DynamoDB's wire format into plain python, faster than boto3's TypeDeserializer.
+
+    Person items are almost all strings, with the odd map or list, so strings are checked for first. Numbers become
+    ints, or floats if they aren't whole, rather than Decimals."""
+    return {name: deserialise_value(value) for name, value in item.items()}
+
+
+def deserialise_value(value: AttributeValue) -> Any:
+    if (string := value.get("S")) is not None:
+        return string
+    ((tag, raw),) = value.items()
+    return _DESERIALISERS[tag](raw)
+
+
+def _number(raw: str) -> int | float:
+    try:
+        return int(raw)
+    except ValueError:
+        return float(raw)
+
+
+_DESERIALISERS: dict[str, Callable[[Any], Any]] = {
+    "S": str,
+    "N": _number,
+    "BOOL": bool,
+    "NULL": lambda _: None,
+    "M": lambda raw: {name: deserialise_value(value) for name, value in raw.items()},
+    "L": lambda raw: [deserialise_value(value) for value in raw],
+    "SS": set,
+    "NS": lambda raw: {_number(n) for n in raw},
+    "B": bytes,
+    "BS": lambda raw: {bytes(b) for b in raw},
+}
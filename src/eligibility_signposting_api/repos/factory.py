@@ -4,10 +4,13 @@ from typing import Annotated
 from boto3 import Session
 from boto3.resources.base import ServiceResource
 from botocore.client import BaseClient
+from botocore.config import Config
 from wireup import Inject, service
 from yarl import URL
 
+from eligibility_signposting_api.circuit_breaker import CircuitBreaker, CircuitBreakerSettings
 from eligibility_signposting_api.config.config import AwsAccessKey, AwsRegion, AwsSecretAccessKey
+from eligibility_signposting_api.deadline import refuse_after_deadline
 
 logger = logging.getLogger(__name__)
 
@@ -18,28 +21,117 @@ def boto3_session_factory(
     aws_access_key_id: Annotated[AwsAccessKey, Inject(param="aws_access_key_id")],
     aws_secret_access_key: Annotated[AwsSecretAccessKey, Inject(param="aws_secret_access_key")],
 ) -> Session:
-    return Session(
+    session = Session(
         aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key, region_name=aws_default_region
     )
+    session.events.register("before-send", refuse_after_deadline)
+    return session
+
+
+@service
+def botocore_config_factory(
+    max_pool_connections: Annotated[int, Inject(param="aws_max_pool_connections")],
+    tcp_keepalive: Annotated[bool, Inject(param="aws_tcp_keepalive")],
+    retry_mode: Annotated[str, Inject(param="aws_retry_mode")],
+    max_attempts: Annotated[int, Inject(param="aws_max_attempts")],
+) -> Config:
+    """Settings shared by all our AWS clients. Each client keeps a pool of connections which are reused between
+    requests, and kept alive while idle, so that warm requests don't pay for new TCP and TLS handshakes."""
+    return Config(
+        max_pool_connections=max_pool_connections,
+        tcp_keepalive=tcp_keepalive,
+        retries={"mode": retry_mode, "total_max_attempts": max_attempts},
+    )
+
+
+@service(qualifier="dynamodb")
+def dynamodb_config_factory(
+    config: Config,
+    connect_timeout: Annotated[float, Inject(param="dynamodb_connect_timeout")],
+    read_timeout: Annotated[float, Inject(param="dynamodb_read_timeout")],
+) -> Config:
+    return config.merge(Config(connect_timeout=connect_timeout, read_timeout=read_timeout))
+
+
+@service(qualifier="s3")
+def s3_config_factory(
+    config: Config,
+    connect_timeout: Annotated[float, Inject(param="s3_connect_timeout")],
+    read_timeout: Annotated[float, Inject(param="s3_read_timeout")],
+) -> Config:
+    return config.merge(Config(connect_timeout=connect_timeout, read_timeout=read_timeout))
+
+
+@service(qualifier="firehose")
+def firehose_config_factory(
+    config: Config,
+    connect_timeout: Annotated[float, Inject(param="firehose_connect_timeout")],
+    read_timeout: Annotated[float, Inject(param="firehose_read_timeout")],
+) -> Config:
+    return config.merge(Config(connect_timeout=connect_timeout, read_timeout=read_timeout))
 
 
 @service(qualifier="dynamodb")
 def dynamodb_resource_factory(
-    session: Session, dynamodb_endpoint: Annotated[URL, Inject(param="dynamodb_endpoint")]
+    session: Session,
+    dynamodb_endpoint: Annotated[URL, Inject(param="dynamodb_endpoint")],
+    config: Annotated[Config, Inject(qualifier="dynamodb")],
 ) -> ServiceResource:
     endpoint_url = str(dynamodb_endpoint) if dynamodb_endpoint is not None else None
-    return session.resource("dynamodb", endpoint_url=endpoint_url)
+    return session.resource("dynamodb", endpoint_url=endpoint_url, config=config)
+
+
+@service(qualifier="dynamodb_client")
+def dynamodb_client_factory(
+    session: Session,
+    dynamodb_endpoint: Annotated[URL, Inject(param="dynamodb_endpoint")],
+    config: Annotated[Config, Inject(qualifier="dynamodb")],
+) -> BaseClient:
+    endpoint_url = str(dynamodb_endpoint) if dynamodb_endpoint is not None else None
+    return session.client("dynamodb", endpoint_url=endpoint_url, config=config)
 
 
 @service(qualifier="s3")
-def s3_service_factory(session: Session, s3_endpoint: Annotated[URL, Inject(param="s3_endpoint")]) -> BaseClient:
+def s3_service_factory(
+    session: Session,
+    s3_endpoint: Annotated[URL, Inject(param="s3_endpoint")],
+    config: Annotated[Config, Inject(qualifier="s3")],
+) -> BaseClient:
     endpoint_url = str(s3_endpoint) if s3_endpoint is not None else None
-    return session.client("s3", endpoint_url=endpoint_url)
+    return session.client("s3", endpoint_url=endpoint_url, config=config)
 
 
 @service(qualifier="firehose")
 def firehose_client_factory(
-    session: Session, firehose_endpoint: Annotated[URL, Inject(param="firehose_endpoint")]
+    session: Session,
+    firehose_endpoint: Annotated[URL, Inject(param="firehose_endpoint")],
+    config: Annotated[Config, Inject(qualifier="firehose")],
 ) -> BaseClient:
     endpoint_url = str(firehose_endpoint) if firehose_endpoint is not None else None
-    return session.client("firehose", endpoint_url=endpoint_url)
+    return session.client("firehose", endpoint_url=endpoint_url, config=config)
+
+
+@service
+def circuit_breaker_settings_factory(
+    window: Annotated[int, Inject(param="circuit_breaker_window")],
+    failure_rate: Annotated[float, Inject(param="circuit_breaker_failure_rate")],
+    slow_call_seconds: Annotated[float, Inject(param="circuit_breaker_slow_call_seconds")],
+    slow_call_rate: Annotated[float, Inject(param="circuit_breaker_slow_call_rate")],
+    open_seconds: Annotated[float, Inject(param="circuit_breaker_open_seconds")],
+) -> CircuitBreakerSettings:
+    return CircuitBreakerSettings(window, failure_rate, slow_call_seconds, slow_call_rate, open_seconds)
+
+
+@service(qualifier="dynamodb")
+def dynamodb_circuit_breaker_factory(settings: CircuitBreakerSettings) -> CircuitBreaker:
+    return CircuitBreaker("dynamodb", settings)
+
+
+@service(qualifier="s3")
+def s3_circuit_breaker_factory(settings: CircuitBreakerSettings) -> CircuitBreaker:
+    return CircuitBreaker("s3", settings)
+
+
+@service(qualifier="firehose")
+def firehose_circuit_breaker_factory(settings: CircuitBreakerSettings) -> CircuitBreaker:
+    return CircuitBreaker("firehose", settings)
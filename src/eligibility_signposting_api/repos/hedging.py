@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextvars import copy_context
+from dataclasses import dataclass
+from typing import Annotated
+
+from wireup import Inject, service
+
+from eligibility_signposting_api.deadline import DeadlineExceededError, remaining
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SAMPLES = 1000
+MIN_LATENCY_SAMPLES = 20
+DELAY_REFRESH_INTERVAL = 100
+HEDGE_POOL_SIZE = 8
+STATS_LOG_INTERVAL = 1000
+
+
+@dataclass
+class HedgeStats:
+    reads: int = 0
+    hedges: int = 0
+    hedges_won: int = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedges / self.reads if self.reads else 0.0
+
+
+@service
+class Hedger:
+    """Hedges reads against tail latency. If a read hasn't returned within the given percentile of recent read
+    latencies, an identical second read is made, and whichever returns first is used. Only for idempotent reads.
+
+    Opt in by configuring a percentile greater than zero. Hedging starts once enough latencies have been seen to
+    estimate the percentile, and the share of reads hedged is capped, so that a slow table isn't made slower still
+    by doubling its load.
+
+    Each primary read starts at once on a thread of its own, so time spent waiting for a pool thread never counts
+    towards the delay before hedging. Only hedges use the pool."""
+
+    def __init__(
+        self,
+        percentile: Annotated[float, Inject(param="person_read_hedge_percentile")] = 0.0,
+        max_rate: Annotated[float, Inject(param="person_read_hedge_max_rate")] = 0.05,
+        min_delay: Annotated[float, Inject(param="person_read_hedge_min_delay_seconds")] = 0.005,
+    ) -> None:
+        super().__init__()
+        self.enabled = percentile > 0
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_delay = min_delay
+        self.stats = HedgeStats()
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._delay: float | None = None
+        self._samples_since_delay = 0
+        self._lock = threading.Lock()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=HEDGE_POOL_SIZE, thread_name_prefix="hedge") if self.enabled else None
+        )
+
+    def read[T](self, read: Callable[[], T]) -> T:
+        if (executor := self._executor) is None:
+            return read()
+        with self._lock:
+            self.stats.reads += 1
+            if self.stats.reads % STATS_LOG_INTERVAL == 0:
+                self.log_stats()
+        if (delay := self.delay()) is None:
+            return self._timed(read)()
+
+        primary = self._start(self._timed(read))
+        left = remaining()
+        try:
+            return primary.result(timeout=min(delay, left) if left is not None else delay)
+        except FutureTimeoutError:
+            if not self._may_hedge():
+                return self._result(primary)
+        hedge = executor.submit(copy_context().run, self._timed(read))
+
+        try:
+            completed = as_completed([primary, hedge], timeout=remaining())
+            winner = next(completed)
+            if winner.exception() is not None:
+                winner = next(completed)  # Fall back on the other read
+        except FutureTimeoutError as e:
+            msg = "deadline passed waiting for hedged read"
+            raise DeadlineExceededError(msg) from e
+        if winner is hedge and winner.exception() is None:
+            with self._lock:
+                self.stats.hedges_won += 1
+        return winner.result()
+
+    def delay(self) -> float | None:
+        """How long to wait for a read before hedging it, or None if not enough reads have been seen yet to say."""
+        with self._lock:
+            if len(self._latencies) < MIN_LATENCY_SAMPLES:
+                return None
+            if self._delay is None or self._samples_since_delay >= DELAY_REFRESH_INTERVAL:
+                ordered = sorted(self._latencies)
+                index = min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)
+                self._delay = max(ordered[index], self.min_delay)
+                self._samples_since_delay = 0
+            return self._delay
+
+    def _may_hedge(self) -> bool:
+        with self._lock:
+            if self.stats.hedges + 1 > self.max_rate * self.stats.reads:
+                return False
+            self.stats.hedges += 1
+            return True
+
+    @staticmethod
+    def _start[T](read: Callable[[], T]) -> Future[T]:
+        """Start the read on a new thread, rather than the pool, where it might have to queue."""
+        future: Future[T] = Future()
+
+        def run() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(read())
+            except BaseException as e:  # noqa: BLE001 - passed on to whoever waits for the result
+                future.set_exception(e)
+
+        context = copy_context()
+        threading.Thread(target=context.run, args=(run,), name="hedge-primary", daemon=True).start()
+        return future
+
+    @staticmethod
+    def _result[T](future: Future[T]) -> T:
+        try:
+            return future.result(timeout=remaining())
+        except FutureTimeoutError as e:
+            msg = "deadline passed waiting for read"
+            raise DeadlineExceededError(msg) from e
+
+    def _timed[T](self, read: Callable[[], T]) -> Callable[[], T]:
+        """Record how long the read takes, if it succeeds."""
+
+        def timed_read() -> T:
+            start = time.monotonic()
+            result = read()
+            with self._lock:
+                self._latencies.append(time.monotonic() - start)
+                self._samples_since_delay += 1
+            return result
+
+        return timed_read
+
+    def log_stats(self) -> None:
+        logger.info(
+            "hedged read stats",
+            extra={
+                "reads": self.stats.reads,
+                "hedges": self.stats.hedges,
+                "hedges_won": self.stats.hedges_won,
+                "hedge_rate": self.stats.hedge_rate,
+                "hedge_delay": self._delay,
+            },
+        )
+
+
+NO_HEDGING = Hedger()
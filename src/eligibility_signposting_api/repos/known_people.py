@@ -0,0 +1,153 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Annotated
+
+from botocore.client import BaseClient
+from botocore.exceptions import BotoCoreError, ClientError
+from wireup import Inject, service
+
+from eligibility_signposting_api.model.eligibility import NHSNumber
+from eligibility_signposting_api.repos.bloom_filter import BloomFilter, BloomFilterFormatError
+from eligibility_signposting_api.repos.campaign_repo import BucketName
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERSON_FILTER_KEY = "person_filter/known_people.bloom"
+STATS_LOG_INTERVAL = 1000
+
+
+@dataclass
+class KnownPeopleStats:
+    absent: int = 0
+    possibly_present: int = 0
+    false_positives: int = 0
+
+    @property
+    def false_positive_rate(self) -> float:
+        checks = self.absent + self.possibly_present
+        return self.false_positives / checks if checks else 0.0
+
+
+class KnownPeople:
+    """The NHS numbers of the people in the person table, as a Bloom filter published by the loader alongside each
+    snapshot, so that numbers which definitely aren't in the table can be answered without reading it.
+
+    Opt in by configuring the bucket the filter is published to. The filter is read while warming up, or else when first
+    needed, then checked for a newer version at most every refresh_seconds, by its ETag. Those checks, and reading any
+    newer version, happen on a background thread, so no request waits on S3 for them - the loaded filter is served
+    meanwhile. If there's no filter, or it can't be read, every number is assumed to be present, so the filter can only
+    ever save reads, never wrongly report someone as not found - as long as the loader publishes the filter after
+    writing the data it describes."""
+
+    def __init__(
+        self,
+        s3_client: BaseClient | None = None,
+        bucket_name: BucketName | None = None,
+        key: str = DEFAULT_PERSON_FILTER_KEY,
+        refresh_seconds: float = 300.0,
+    ) -> None:
+        super().__init__()
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.key = key
+        self.refresh_seconds = refresh_seconds
+        self.enabled = s3_client is not None and bool(bucket_name)
+        self.stats = KnownPeopleStats()
+        self._bloom_filter: BloomFilter | None = None
+        self._version: str | None = None
+        self._next_refresh = 0.0
+        self._read_attempted = False
+        self._refresher: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def might_exist(self, nhs_number: NHSNumber) -> bool:
+        """Might this NHS number be in the person table? If not, it certainly isn't."""
+        if not self.enabled:
+            return True
+        if time.monotonic() >= self._next_refresh:
+            if not self._read_attempted:
+                self.refresh()
+            elif self._due():
+                self._start_refreshing()
+        if self._bloom_filter is None:
+            return True
+
+        present = nhs_number in self._bloom_filter
+        if present:
+            self.stats.possibly_present += 1
+        else:
+            self.stats.absent += 1
+        if (self.stats.absent + self.stats.possibly_present) % STATS_LOG_INTERVAL == 0:
+            self.log_stats()
+        return present
+
+    def record_false_positive(self) -> None:
+        """The filter said a number might be present, but it wasn't."""
+        if self._bloom_filter is not None:
+            self.stats.false_positives += 1
+
+    def refresh(self) -> None:
+        """Read the filter, unless it was checked within refresh_seconds, or the version already read is current."""
+        if self._due():
+            self._read()
+
+    def _due(self) -> bool:
+        """Is it time to check for a newer filter? If so, it's the caller's to check - nobody else's until the next
+        refresh is due."""
+        with self._lock:
+            if self.s3_client is None or time.monotonic() < self._next_refresh:
+                return False
+            self._next_refresh = time.monotonic() + self.refresh_seconds
+            self._read_attempted = True
+            return True
+
+    def _start_refreshing(self) -> None:
+        self._refresher = threading.Thread(target=self._refresh, name="person-filter-refresh", daemon=True)
+        self._refresher.start()
+
+    def _refresh(self) -> None:
+        try:
+            self._read()
+        except Exception:
+            logger.exception("refreshing person filter failed")
+
+    def _read(self) -> None:
+        if self.s3_client is None:
+            return
+        try:
+            version = self.s3_client.head_object(Bucket=self.bucket_name, Key=self.key)["ETag"]
+            if version == self._version:
+                return
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=self.key)
+            self._bloom_filter = BloomFilter.from_bytes(response["Body"].read())
+            self._version = response.get("ETag", version)
+        except (BotoCoreError, ClientError, BloomFilterFormatError):
+            logger.warning("couldn't read person filter s3://%s/%s", self.bucket_name, self.key, exc_info=True)
+            return
+        logger.info("loaded person filter %r", self._bloom_filter, extra={"version": self._version})
+
+    def log_stats(self) -> None:
+        logger.info(
+            "person filter stats",
+            extra={
+                "absent": self.stats.absent,
+                "possibly_present": self.stats.possibly_present,
+                "false_positives": self.stats.false_positives,
+                "false_positive_rate": self.stats.false_positive_rate,
+            },
+        )
+
+
+@service
+def known_people_factory(
+    s3_client: Annotated[BaseClient, Inject(qualifier="s3")],
+    bucket_name: Annotated[BucketName | None, Inject(param="person_filter_bucket_name")],
+    key: Annotated[str, Inject(param="person_filter_key")],
+    refresh_seconds: Annotated[float, Inject(param="person_filter_refresh_seconds")],
+) -> KnownPeople:
+    return KnownPeople(s3_client, bucket_name, key, refresh_seconds)
+
+
+NO_KNOWN_PEOPLE = KnownPeople()
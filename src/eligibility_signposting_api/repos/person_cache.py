@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Annotated, Any
+
+from wireup import Inject, service
+
+from eligibility_signposting_api.caching import CacheStats, LruCache, deep_sizeof
+
+if TYPE_CHECKING:
+    from eligibility_signposting_api.model.eligibility import NHSNumber
+    from eligibility_signposting_api.repos.person_repo import FetchPlan
+
+logger = logging.getLogger(__name__)
+
+STATS_LOG_INTERVAL = 1000
+
+
+@service
+class PersonCache:
+    """People's data, cached for a short time across requests, since clients such as apps refreshing a screen ask
+    about the same person repeatedly within seconds.
+
+    Opt in by configuring a size greater than zero. The cache is bounded by entries and by memory, and entries expire
+    after a time to live. Cached data must be treated as read only. Nothing identifying a person is logged here, only
+    the cache's stats.
+
+    NHS numbers which weren't found can also be remembered for a short time, separately opted in to, so that clients
+    retrying unknown numbers don't cost a DynamoDB read every time."""
+
+    def __init__(
+        self,
+        max_entries: Annotated[int, Inject(param="person_cache_size")] = 0,
+        ttl_seconds: Annotated[float, Inject(param="person_cache_ttl_seconds")] = 5.0,
+        max_bytes: Annotated[int, Inject(param="person_cache_max_bytes")] = 16 * 1024 * 1024,
+        not_found_max_entries: Annotated[int, Inject(param="person_not_found_cache_size")] = 0,
+        not_found_ttl_seconds: Annotated[float, Inject(param="person_not_found_cache_ttl_seconds")] = 10.0,
+    ) -> None:
+        super().__init__()
+        self.enabled = max_entries > 0
+        self.not_found_enabled = not_found_max_entries > 0
+        self._people: LruCache[tuple[NHSNumber, FetchPlan | None], list[dict[str, Any]]] = LruCache(
+            max_entries, ttl=ttl_seconds, max_bytes=max_bytes, sizeof=deep_sizeof
+        )
+        self._not_found: LruCache[NHSNumber, bool] = LruCache(not_found_max_entries, ttl=not_found_ttl_seconds)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._people.stats
+
+    @property
+    def not_found_stats(self) -> CacheStats:
+        return self._not_found.stats
+
+    @property
+    def footprint(self) -> int:
+        return self._people.footprint + self._not_found.footprint
+
+    def get(self, nhs_number: NHSNumber, fetch_plan: FetchPlan | None) -> list[dict[str, Any]] | None:
+        if not self.enabled:
+            return None
+        items = self._people.get((nhs_number, fetch_plan))
+        if (self.stats.hits + self.stats.misses) % STATS_LOG_INTERVAL == 0:
+            self.log_stats()
+        return items
+
+    def put(self, nhs_number: NHSNumber, fetch_plan: FetchPlan | None, items: list[dict[str, Any]]) -> None:
+        if self.enabled:
+            self._people.put((nhs_number, fetch_plan), items)
+
+    def is_not_found(self, nhs_number: NHSNumber) -> bool:
+        """Was this NHS number recently not found?"""
+        return self.not_found_enabled and self._not_found.get(nhs_number) is not None
+
+    def put_not_found(self, nhs_number: NHSNumber) -> None:
+        if self.not_found_enabled:
+            self._not_found.put(nhs_number, True)  # noqa: FBT003 - only the key matters
+
+    def invalidate(self, nhs_number: NHSNumber) -> None:
+        """Forget a person's data, or that they weren't found, for instance because it has been updated."""
+        self._people.discard_where(lambda key: key[0] == nhs_number)
+        self._not_found.discard(nhs_number)
+
+    def invalidate_all(self) -> None:
+        self._people.clear()
+        self._not_found.clear()
+
+    def log_stats(self) -> None:
+        stats = self.stats
+        logger.info(
+            "person cache stats",
+            extra={
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "evictions": stats.evictions,
+                "expirations": stats.expirations,
+                "hit_rate": stats.hit_rate,
+                "entries": len(self._people),
+                "not_found_hits": self.not_found_stats.hits,
+                "not_found_entries": len(self._not_found),
+                "footprint": self.footprint,
+            },
+        )
+
+
+NO_PERSON_CACHE = PersonCache()
@@ -1,17 +1,108 @@
 import logging
-from typing import Annotated, Any, NewType
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Annotated, Any, NewType, Self
 
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import ConditionExpressionBuilder, Key
+from boto3.dynamodb.types import TypeSerializer
 from boto3.resources.base import ServiceResource
+from botocore.client import BaseClient
 from wireup import Inject, service
 
+from eligibility_signposting_api.circuit_breaker import NO_CIRCUIT_BREAKER, CircuitBreaker
 from eligibility_signposting_api.model.eligibility import NHSNumber
+from eligibility_signposting_api.model.rules import CampaignConfig, RuleAttributeLevel
+from eligibility_signposting_api.repos.compact import COMPACT_ATTRIBUTE_TYPE, COMPACT_ROWS_ATTRIBUTE, decode_rows
+from eligibility_signposting_api.repos.deserialiser import deserialise_item
 from eligibility_signposting_api.repos.exceptions import NotFoundError
+from eligibility_signposting_api.repos.hedging import NO_HEDGING, Hedger
+from eligibility_signposting_api.repos.known_people import NO_KNOWN_PEOPLE, KnownPeople
+from eligibility_signposting_api.repos.person_cache import NO_PERSON_CACHE, PersonCache
 
 logger = logging.getLogger(__name__)
 
 TableName = NewType("TableName", str)
 
+KEY_ATTRIBUTES = ("NHS_NUMBER", "ATTRIBUTE_TYPE")
+PERSON_ATTRIBUTE_TYPE = "PERSON"
+COHORTS_ATTRIBUTE_TYPE = "COHORTS"
+COHORT_MAP_ATTRIBUTE = "COHORT_MAP"
+
+SERIALIZER = TypeSerializer()
+
+
+@dataclass(frozen=True)
+class FetchPlan:
+    """The (ATTRIBUTE_TYPE, attribute name) pairs a ruleset depends on, so only those rows and columns need reading.
+
+    The PERSON row is always read, so that a person with no other rows the rules need is still found, and the COHORTS
+    row's COHORT_MAP is read whenever there are campaigns, since every campaign needs cohort membership."""
+
+    dependencies: frozenset[tuple[str, str]]
+
+    @classmethod
+    def for_campaign_configs(cls, campaign_configs: Iterable[CampaignConfig]) -> Self:
+        dependencies: set[tuple[str, str]] = set()
+        for campaign_config in campaign_configs:
+            dependencies.add((COHORTS_ATTRIBUTE_TYPE, COHORT_MAP_ATTRIBUTE))
+            for iteration in campaign_config.iterations:
+                for rule in iteration.iteration_rules:
+                    match rule.attribute_level:
+                        case RuleAttributeLevel.PERSON:
+                            dependencies.add((PERSON_ATTRIBUTE_TYPE, str(rule.attribute_name)))
+                        case RuleAttributeLevel.COHORT:
+                            attribute_name = (
+                                COHORT_MAP_ATTRIBUTE
+                                if not rule.attribute_name or rule.attribute_name == "COHORT_LABEL"
+                                else rule.attribute_name
+                            )
+                            dependencies.add((COHORTS_ATTRIBUTE_TYPE, attribute_name))
+                        case RuleAttributeLevel.TARGET if rule.attribute_target:
+                            dependencies.add((rule.attribute_target, str(rule.attribute_name)))
+        return cls(frozenset(dependencies))
+
+    def covers(self, other: Self) -> bool:
+        """Does this plan read everything the other does?"""
+        return self.dependencies >= other.dependencies
+
+    @property
+    def attribute_types(self) -> frozenset[str]:
+        return frozenset(attribute_type for attribute_type, _ in self.dependencies) | {PERSON_ATTRIBUTE_TYPE}
+
+    @property
+    def attribute_names(self) -> frozenset[str]:
+        return frozenset(attribute_name for _, attribute_name in self.dependencies) | set(KEY_ATTRIBUTES)
+
+    def select(self, rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Pick the planned rows and columns out of a person's rows."""
+        attribute_types, attribute_names = self.attribute_types, self.attribute_names
+        return [
+            {name: value for name, value in row.items() if name in attribute_names}
+            for row in rows
+            if row.get("ATTRIBUTE_TYPE") in attribute_types
+        ]
+
+    def query_args(self, nhs_number: NHSNumber) -> dict[str, Any]:
+        """Arguments for a query reading just the planned rows and columns.
+
+        A key condition can't pick out several sort keys, so rows are narrowed down to the range of ATTRIBUTE_TYPEs
+        spanning those needed - rows sorting before or after them, such as those for conditions no campaign's rules
+        refer to, aren't read - and only the needed columns are returned. BatchGetItem could read just the needed
+        rows, but charges read capacity per item rather than per query, which costs more for this table's small
+        rows."""
+        attribute_types = sorted(self.attribute_types)
+        key_condition = Key("NHS_NUMBER").eq(nhs_number)
+        if len(attribute_types) == 1:
+            key_condition &= Key("ATTRIBUTE_TYPE").eq(attribute_types[0])
+        else:
+            key_condition &= Key("ATTRIBUTE_TYPE").between(attribute_types[0], attribute_types[-1])
+        names = {f"#a{i}": attribute_name for i, attribute_name in enumerate(sorted(self.attribute_names))}
+        return {
+            "KeyConditionExpression": key_condition,
+            "ProjectionExpression": ", ".join(names),
+            "ExpressionAttributeNames": names,
+        }
+
 
 @service(qualifier="person_table")
 def person_table_factory(
@@ -31,17 +122,121 @@ class PersonRepo:
     This data is held in a handful of records in a single Dynamodb table.
     """
 
-    def __init__(self, table: Annotated[Any, Inject(qualifier="person_table")]) -> None:
+    def __init__(  # noqa: PLR0913 - injected dependencies and settings
+        self,
+        table: Annotated[Any, Inject(qualifier="person_table")],
+        dynamodb_client: Annotated[BaseClient, Inject(qualifier="dynamodb_client")],
+        *,
+        low_level_client: Annotated[bool, Inject(param="person_table_low_level_client")] = False,
+        compact_layout: Annotated[bool, Inject(param="person_table_compact_layout")] = False,
+        cache: PersonCache = NO_PERSON_CACHE,
+        known_people: KnownPeople = NO_KNOWN_PEOPLE,
+        hedger: Hedger = NO_HEDGING,
+        circuit_breaker: Annotated[CircuitBreaker, Inject(qualifier="dynamodb")] = NO_CIRCUIT_BREAKER,
+    ) -> None:
         super().__init__()
         self.table = table
+        self.dynamodb_client = dynamodb_client
+        self.low_level_client = low_level_client
+        self.compact_layout = compact_layout
+        self.cache = cache
+        self.known_people = known_people
+        self.hedger = hedger
+        self.circuit_breaker = circuit_breaker
+
+    def get_eligibility_data(self, nhs_number: NHSNumber, fetch_plan: FetchPlan | None = None) -> list[dict[str, Any]]:
+        """Read a person's data - all of it, or only the rows and columns in the fetch plan if one is given.
+
+        With the compact layout enabled, the person's single compact item is read if they have one, falling back to
+        their separate rows if not, so both layouts work while people are migrated.
 
-    def get_eligibility_data(self, nhs_number: NHSNumber) -> list[dict[str, Any]]:
-        response = self.table.query(KeyConditionExpression=Key("NHS_NUMBER").eq(nhs_number))
-        logger.debug("response %r for %r", response, nhs_number, extra={"response": response, "nhs_number": nhs_number})
+        If the person cache is enabled, recently read data is served from it, as are recent not found results. If the
+        known people filter is enabled, people it rules out are reported not found without reading the table. If
+        hedging is enabled, slow reads are hedged with a second read. If DynamoDB's circuit is open, CircuitOpenError
+        is raised without reading the table."""
+        if (cached := self.cache.get(nhs_number, fetch_plan)) is not None:
+            return cached
+        if self.cache.is_not_found(nhs_number):
+            message = f"Person not found with nhs_number {nhs_number} (cached)"
+            raise NotFoundError(message)
+        if not self.known_people.might_exist(nhs_number):
+            message = f"Person not found with nhs_number {nhs_number} (filtered)"
+            raise NotFoundError(message)
 
-        if not (items := response.get("Items")):
+        items = self.hedger.read(lambda: self.circuit_breaker.call(lambda: self._read(nhs_number, fetch_plan)))
+        if not items:
+            self.known_people.record_false_positive()
+            self.cache.put_not_found(nhs_number)
             message = f"Person not found with nhs_number {nhs_number}"
             raise NotFoundError(message)
 
         logger.debug("returning items %s", items, extra={"items": items})
+        self.cache.put(nhs_number, fetch_plan, items)
         return items
+
+    def _read(self, nhs_number: NHSNumber, fetch_plan: FetchPlan | None) -> list[dict[str, Any]]:
+        items = self._get_compact(nhs_number) if self.compact_layout else None
+        if items is not None:
+            return fetch_plan.select(items) if fetch_plan is not None else items
+
+        query_args = (
+            fetch_plan.query_args(nhs_number)
+            if fetch_plan is not None
+            else {"KeyConditionExpression": Key("NHS_NUMBER").eq(nhs_number)}
+        )
+        return self._query_with_client(query_args) if self.low_level_client else self._query(query_args)
+
+    def warm_up(self) -> None:
+        """Make a cheap call with each DynamoDB client, so they have connections open before they're needed, and read
+        the person filter, so the first request doesn't wait on S3 for it."""
+        self.table.meta.client.describe_endpoints()
+        self.dynamodb_client.describe_endpoints()
+        self.known_people.refresh()
+
+    def _get_compact(self, nhs_number: NHSNumber) -> list[dict[str, Any]] | None:
+        """Read a person's compact item, if they have one, and decode their rows from it."""
+        if self.low_level_client:
+            response = self.dynamodb_client.get_item(
+                TableName=self.table.name,
+                Key={"NHS_NUMBER": {"S": nhs_number}, "ATTRIBUTE_TYPE": {"S": COMPACT_ATTRIBUTE_TYPE}},
+            )
+            encoded = item[COMPACT_ROWS_ATTRIBUTE]["B"] if (item := response.get("Item")) else None
+        else:
+            response = self.table.get_item(Key={"NHS_NUMBER": nhs_number, "ATTRIBUTE_TYPE": COMPACT_ATTRIBUTE_TYPE})
+            encoded = bytes(item[COMPACT_ROWS_ATTRIBUTE]) if (item := response.get("Item")) else None
+        return decode_rows(encoded) if encoded is not None else None
+
+    def _query(self, query_args: dict[str, Any]) -> list[dict[str, Any]]:
+        """Query using the table resource, which deserialises items with boto3's TypeDeserializer."""
+        return list(self._paginate(self.table.query, query_args))
+
+    def _query_with_client(self, query_args: dict[str, Any]) -> list[dict[str, Any]]:
+        """Query using the low-level client, deserialising the items ourselves, which is quicker. (The table resource's
+        own client can't be used, as the resource registers handlers on it to serialise and deserialise values.)"""
+        key_condition = ConditionExpressionBuilder().build_expression(
+            query_args["KeyConditionExpression"], is_key_condition=True
+        )
+        client_args = {
+            **query_args,
+            "TableName": self.table.name,
+            "KeyConditionExpression": key_condition.condition_expression,
+            "ExpressionAttributeNames": {
+                **query_args.get("ExpressionAttributeNames", {}),
+                **key_condition.attribute_name_placeholders,
+            },
+            "ExpressionAttributeValues": {
+                placeholder: SERIALIZER.serialize(value)
+                for placeholder, value in key_condition.attribute_value_placeholders.items()
+            },
+        }
+        return [deserialise_item(item) for item in self._paginate(self.dynamodb_client.query, client_args)]
+
+    @staticmethod
+    def _paginate(query: Callable[..., dict[str, Any]], query_args: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        while True:
+            response = query(**query_args)
+            logger.debug("response %r", response, extra={"response": response})
+            yield from response.get("Items", [])
+            if not (last_evaluated_key := response.get("LastEvaluatedKey")):
+                return
+            query_args = {**query_args, "ExclusiveStartKey": last_evaluated_key}
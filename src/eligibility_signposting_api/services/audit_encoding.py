@@ -0,0 +1,65 @@
+import gzip
+import json
+from collections.abc import Iterator
+from enum import StrEnum
+from typing import Any
+
+from eligibility_signposting_api.json_encoding import dumps
+
+FIREHOSE_RECORD_MAX_BYTES = 1000 * 1024
+GZIP_MAGIC = b"\x1f\x8b"
+COMPRESSION_LEVEL = 6
+EXPECTED_COMPRESSION_RATIO = 8  # Audit records are repetitive JSON, which compresses well
+
+
+class AuditEncoding(StrEnum):
+    json = "json"  # One Firehose record for each audit record, as a line of JSON
+    aggregated = "aggregated"  # Many audit records in each Firehose record, as gzip compressed lines of JSON
+
+
+def encode_record(audit_record: dict[str, Any]) -> bytes:
+    return dumps(audit_record) + b"\n"
+
+
+def aggregate(records: list[bytes], max_bytes: int = FIREHOSE_RECORD_MAX_BYTES) -> list[bytes]:
+    """Pack encoded audit records into as few Firehose records as they fit in, each the gzip compressed concatenation
+    of as many audit records as will fit in max_bytes once compressed.
+
+    Firehose concatenates the records it delivers to S3, and concatenated gzip members are themselves valid gzip, so
+    the objects delivered are gzip compressed, newline delimited JSON, readable with decode_audit_records()."""
+    aggregates: list[bytes] = []
+    group: list[bytes] = []
+    group_bytes = 0
+    for record in records:
+        if group and group_bytes + len(record) > max_bytes * EXPECTED_COMPRESSION_RATIO:
+            aggregates += _compress(group, max_bytes)
+            group, group_bytes = [], 0
+        group.append(record)
+        group_bytes += len(record)
+    if group:
+        aggregates += _compress(group, max_bytes)
+    return aggregates
+
+
+def _compress(records: list[bytes], max_bytes: int) -> list[bytes]:
+    """Compress the records together, halving the group until each half fits, if they compress less than expected."""
+    data = gzip.compress(b"".join(records), compresslevel=COMPRESSION_LEVEL, mtime=0)
+    if len(data) <= max_bytes or len(records) == 1:
+        return [data]
+    middle = len(records) // 2
+    return _compress(records[:middle], max_bytes) + _compress(records[middle:], max_bytes)
+
+
+def split_records(data: bytes) -> list[bytes]:
+    """The encoded audit records in a Firehose record, or an S3 object Firehose has delivered, in either encoding."""
+    if data.startswith(GZIP_MAGIC):
+        data = gzip.decompress(data)
+    return data.splitlines(keepends=True)
+
+
+def decode_audit_records(data: bytes) -> Iterator[dict[str, Any]]:
+    """The audit records in a Firehose record, or an S3 object Firehose has delivered, in either encoding. For
+    consumers of the audit stream."""
+    for line in split_records(data):
+        if line.strip():
+            yield json.loads(line)
@@ -0,0 +1,195 @@
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+
+from eligibility_signposting_api.deadline import remaining
+from eligibility_signposting_api.services.audit_record import EligibilityAuditRecord, encode_audit_record
+from eligibility_signposting_api.services.audit_spool import AuditSpool
+
+logger = logging.getLogger(__name__)
+
+STATS_LOG_INTERVAL = 1000
+
+
+class OverflowPolicy(StrEnum):
+    """What to do with an audit record when the queue is full."""
+
+    block = "block"  # Wait for room, for as long as the request's deadline allows, then drop the record
+    drop_oldest = "drop_oldest"  # Drop the record which has waited longest, to make room
+    spill = "spill"  # Write the record to the spool on disk, to be sent later
+
+
+@dataclass
+class AuditQueueStats:
+    enqueued: int = 0
+    sent: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    max_depth: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.sent if self.sent else 0.0
+
+
+class AuditQueue:
+    """A bounded queue of audit records, encoded and sent in batches by a background thread, so that requests only pay
+    for adding a record to the queue. Batches are sent once batch_max_records are waiting, or the oldest record has
+    waited batch_max_age seconds.
+
+    For long running servers - in Lambda, the thread would be frozen between invocations. Call drain() to wait for
+    the queue to empty, and close() to drain it and stop the thread, as happens at exit."""
+
+    def __init__(  # noqa: PLR0913 - settings
+        self,
+        send: Callable[[list[EligibilityAuditRecord | bytes]], None],
+        *,
+        max_size: int,
+        policy: OverflowPolicy,
+        batch_max_records: int,
+        batch_max_age: float,
+        spool: AuditSpool | None = None,
+    ) -> None:
+        super().__init__()
+        if policy == OverflowPolicy.spill and spool is None:
+            msg = "the spill overflow policy needs a spool"
+            raise ValueError(msg)
+        self.send = send
+        self.max_size = max_size
+        self.policy = policy
+        self.batch_max_records = batch_max_records
+        self.batch_max_age = batch_max_age
+        self.spool = spool
+        self.stats = AuditQueueStats()
+        self._queue: deque[tuple[EligibilityAuditRecord | bytes, float]] = deque()  # (record, time enqueued)
+        self._condition = threading.Condition()
+        self._sending = False
+        self._draining = False
+        self._closed = False
+        self._worker: threading.Thread | None = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def put(self, record: EligibilityAuditRecord | bytes) -> None:
+        spill = False
+        with self._condition:
+            if self._closed:
+                self.stats.dropped += 1
+                logger.warning("audit queue closed, record dropped")
+                return
+            self._start()
+            if len(self._queue) >= self.max_size:
+                if self.policy == OverflowPolicy.spill:
+                    spill = True
+                elif not self._make_room():
+                    return
+            if not spill:
+                self._queue.append((record, time.monotonic()))
+                self.stats.enqueued += 1
+                self.stats.max_depth = max(self.stats.max_depth, len(self._queue))
+                if self.stats.enqueued % STATS_LOG_INTERVAL == 0:
+                    self.log_stats()
+                self._condition.notify_all()
+        if spill and self.spool is not None:
+            spilled = self.spool.write([encode_audit_record(record)])
+            with self._condition:
+                if spilled:
+                    self.stats.spilled += 1
+                else:
+                    self.stats.dropped += 1
+            if not spilled:
+                logger.warning("audit queue and spool full, record dropped")
+
+    def _make_room(self) -> bool:
+        """Make room in the full queue for another record, returning whether there is now room."""
+        if self.policy == OverflowPolicy.drop_oldest:
+            self._queue.popleft()
+            self.stats.dropped += 1
+            logger.warning("audit queue full, oldest record dropped")
+            return True
+        if self._condition.wait_for(lambda: len(self._queue) < self.max_size, timeout=remaining()):
+            return True
+        self.stats.dropped += 1
+        logger.warning("audit queue full, record dropped")
+        return False
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Send the queued records now, waiting up to timeout seconds for them to be sent. Returns whether they were."""
+        with self._condition:
+            self._draining = True
+            self._condition.notify_all()
+            drained = self._condition.wait_for(lambda: not self._queue and not self._sending, timeout=timeout)
+            self._draining = False
+            return drained
+
+    def close(self, timeout: float | None = None) -> None:
+        """Send the queued records, and stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+        self.log_stats()
+
+    def _start(self) -> None:
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="audit", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while (batch := self._next_batch()) is not None:
+            now = time.monotonic()
+            latencies = [now - enqueued for _, enqueued in batch]
+            try:
+                self.send([record for record, _ in batch])
+            except Exception:
+                logger.exception("sending audit records failed")
+            finally:
+                with self._condition:
+                    self._sending = False
+                    self.stats.sent += len(batch)
+                    self.stats.total_latency += sum(latencies)
+                    self.stats.max_latency = max(self.stats.max_latency, *latencies)
+                    self._condition.notify_all()
+
+    def _next_batch(self) -> list[tuple[EligibilityAuditRecord | bytes, float]] | None:
+        """Wait for a batch to be due, and take it from the queue. Returns None once closed and empty."""
+        with self._condition:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._condition.wait()
+            due = self._queue[0][1] + self.batch_max_age
+            while (
+                len(self._queue) < self.batch_max_records
+                and not (self._draining or self._closed)
+                and (left := due - time.monotonic()) > 0
+            ):
+                self._condition.wait(left)
+            batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.batch_max_records))]
+            self._sending = True
+            self._condition.notify_all()
+            return batch
+
+    def log_stats(self) -> None:
+        logger.info(
+            "audit queue stats",
+            extra={
+                "depth": len(self._queue),
+                "enqueued": self.stats.enqueued,
+                "sent": self.stats.sent,
+                "dropped": self.stats.dropped,
+                "spilled": self.stats.spilled,
+                "max_depth": self.stats.max_depth,
+                "mean_latency": self.stats.mean_latency,
+                "max_latency": self.stats.max_latency,
+            },
+        )
@@ -0,0 +1,70 @@
+import json
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from eligibility_signposting_api.json_encoding import dumps
+from eligibility_signposting_api.model.eligibility import EligibilityStatus, NHSNumber
+
+
+@dataclass(frozen=True)
+class EligibilityAuditRecord:
+    """An audit of an eligibility decision: the response sent, as sent, plus what was behind it.
+
+    The response is held as the bytes already serialised for the API response, and spliced into the encoded record
+    as they are, so auditing a decision doesn't serialise it a second time. The audit only fields are worked out from
+    the evaluation results already calculated, and only when the record is encoded. With an audit queue, that's done
+    by the queue's background thread, off the request thread. Without one, it's done as the record is buffered, since
+    its size is needed to decide when a batch is due."""
+
+    nhs_number: NHSNumber
+    eligibility_status: EligibilityStatus
+    response_body: bytes
+    include_actions: bool
+    audited_at: datetime = field(default_factory=lambda: datetime.now(tz=UTC))
+
+    def encode(self) -> bytes:
+        """As a line of JSON, with the response under "response"."""
+        header = dumps(
+            {
+                "nhsNumber": self.nhs_number,
+                "auditedAt": self.audited_at.isoformat(),
+                "includeActions": self.include_actions,
+                "conditions": self.conditions(),
+            }
+        )
+        response_body = self.response_body.strip()
+        if b"\n" in response_body:  # Pretty printed, as in debug mode
+            response_body = dumps(json.loads(response_body))
+        return b"".join((header[:-1], b',"response":', response_body, b"}\n"))
+
+    def conditions(self) -> list[dict[str, Any]]:
+        """Every cohort's status and every rule's outcome, for each condition - including those left out of the
+        response."""
+        return [
+            {
+                "condition": condition.condition_name,
+                "status": condition.status.name,
+                "cohorts": [
+                    {
+                        "cohortCode": cohort_result.cohort_code,
+                        "status": cohort_result.status.name,
+                        "reasons": [
+                            {
+                                "ruleType": reason.rule_type.value,
+                                "ruleName": reason.rule_name,
+                                "matcherMatched": reason.matcher_matched,
+                            }
+                            for reason in cohort_result.reasons
+                        ],
+                    }
+                    for cohort_result in condition.cohort_results
+                ],
+            }
+            for condition in self.eligibility_status.conditions
+        ]
+
+
+def encode_audit_record(record: EligibilityAuditRecord | bytes) -> bytes:
+    """The record as a line of JSON, encoding it if it isn't already."""
+    return record if isinstance(record, bytes) else record.encode()
@@ -1,38 +1,286 @@
-import json
+import atexit
 import logging
+import random
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Annotated
 
 from botocore.client import BaseClient
+from botocore.exceptions import BotoCoreError, ClientError
 from wireup import Inject, service
 
+from eligibility_signposting_api.circuit_breaker import NO_CIRCUIT_BREAKER, CircuitBreaker, CircuitOpenError
 from eligibility_signposting_api.config.config import AwsKinesisFirehoseStreamName
+from eligibility_signposting_api.deadline import DeadlineExceededError, has_time_for, remaining
+from eligibility_signposting_api.services.audit_encoding import AuditEncoding, aggregate, encode_record, split_records
+from eligibility_signposting_api.services.audit_queue import AuditQueue, OverflowPolicy
+from eligibility_signposting_api.services.audit_record import EligibilityAuditRecord, encode_audit_record
+from eligibility_signposting_api.services.audit_spool import AuditSpool
 
 logger = logging.getLogger(__name__)
 
+FIREHOSE_BATCH_MAX_RECORDS = 500
+FIREHOSE_BATCH_MAX_BYTES = 4 * 1024 * 1024
+RETRY_BASE_DELAY_SECONDS = 0.1
+QUEUE_CLOSE_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class AuditStats:
+    records: int = 0
+    batches: int = 0
+    retries: int = 0
+    spooled: int = 0
+    dropped: int = 0
+
 
 @service
-class AuditService:  # pragma: no cover
-    def __init__(
+class AuditService:
+    """Sends audit records to a Firehose delivery stream, in batches.
+
+    Records are buffered, and sent with put_record_batch once enough have been buffered, by count or size, or the
+    oldest has waited long enough - or when flush() is called, as it is at the end of each Lambda invocation, before
+    the execution environment can be frozen, and at exit. In Lambda, where an invocation serves a single request, that
+    flush means each request still waits on a Firehose round trip before its response is returned - buffering saves
+    nothing there, it only moves the wait from audit() to the flush, which end_invocation bounds by the invocation's
+    deadline. A timer sends the buffer once its oldest record is old
+    enough, even if no more records are audited to trigger it. Records Firehose fails to put are retried with
+    exponential backoff, up to max_attempts in all.
+
+    Records which still can't be sent - or aren't tried, because Firehose's circuit is open, or there isn't time - are
+    written to a spool on local disk, if one is configured, and sent in bulk, a segment at a time, after later batches
+    are sent successfully - always by a background thread, the queue's, the buffer's timer, or one started to do so,
+    never by a request. Without a spool, or once it is full, they are dropped with an error logged.
+
+    For long running servers, configure a queue size to have records encoded and sent by a background thread instead,
+    so that requests never wait on Firehose, or on encoding their audit records. When the queue is full, the overflow
+    policy decides whether to wait for room, drop the oldest record, or spill the record to a spool on disk. The queue
+    is drained at exit.
+
+    With the aggregated encoding, each batch's audit records are packed, compressed, into as few Firehose records as
+    they fit in, rather than sent as a Firehose record apiece - see audit_encoding."""
+
+    def __init__(  # noqa: PLR0913 - injected dependencies and settings
         self,
         firehose: Annotated[BaseClient, Inject(qualifier="firehose")],
         audit_delivery_stream: Annotated[AwsKinesisFirehoseStreamName, Inject(param="kinesis_audit_stream_to_s3")],
+        *,
+        batch_max_records: Annotated[int, Inject(param="audit_batch_max_records")] = FIREHOSE_BATCH_MAX_RECORDS,
+        batch_max_bytes: Annotated[int, Inject(param="audit_batch_max_bytes")] = FIREHOSE_BATCH_MAX_BYTES,
+        batch_max_age: Annotated[float, Inject(param="audit_batch_max_age_seconds")] = 1.0,
+        max_attempts: Annotated[int, Inject(param="audit_max_attempts")] = 3,
+        circuit_breaker: Annotated[CircuitBreaker, Inject(qualifier="firehose")] = NO_CIRCUIT_BREAKER,
+        queue_size: Annotated[int, Inject(param="audit_queue_size")] = 0,
+        overflow_policy: Annotated[str, Inject(param="audit_queue_overflow_policy")] = OverflowPolicy.drop_oldest,
+        spool_dir: Annotated[Path, Inject(param="audit_spool_dir")] = Path("/tmp/audit-spool"),  # noqa: S108
+        spool_max_bytes: Annotated[int, Inject(param="audit_spool_max_bytes")] = 0,
+        encoding: Annotated[str, Inject(param="audit_encoding")] = AuditEncoding.json,
     ) -> None:
         super().__init__()
         self.firehose = firehose
         self.audit_delivery_stream = audit_delivery_stream
+        self.batch_max_records = min(batch_max_records, FIREHOSE_BATCH_MAX_RECORDS)
+        self.batch_max_bytes = min(batch_max_bytes, FIREHOSE_BATCH_MAX_BYTES)
+        self.batch_max_age = batch_max_age
+        self.max_attempts = max(max_attempts, 1)
+        self.circuit_breaker = circuit_breaker
+        self.encoding = AuditEncoding(encoding)
+        self.stats = AuditStats()
+        self._buffer: list[bytes] = []
+        self._buffered_bytes = 0
+        self._oldest = 0.0
+        self._timer: threading.Timer | None = None
+        self._resending = False
+        self._lock = threading.Lock()
+        self.spool = AuditSpool(spool_dir, max_bytes=spool_max_bytes) if spool_max_bytes > 0 else None
+        self._queue: AuditQueue | None = None
+        if queue_size > 0:
+            self._queue = AuditQueue(
+                self._send_in_background,
+                max_size=queue_size,
+                policy=OverflowPolicy(overflow_policy),
+                batch_max_records=self.batch_max_records,
+                batch_max_age=batch_max_age,
+                spool=self.spool,
+            )
+            atexit.register(self._queue.close, QUEUE_CLOSE_TIMEOUT_SECONDS)
+        else:
+            atexit.register(self.flush)
+
+    def warm_up(self) -> None:
+        """Make a cheap call with the Firehose client, so it has a connection open before it's needed."""
+        self.firehose.describe_delivery_stream(DeliveryStreamName=self.audit_delivery_stream)
 
-    def audit(self, audit_record: dict) -> None:
+    def audit(self, audit_record: EligibilityAuditRecord | dict) -> None:
         """
-        Sends an audit record to the configured Firehose delivery stream.
+        Buffers an audit record to be sent to the configured Firehose delivery stream, sending the buffered records if
+        a batch is due - or, with a queue, queues it to be encoded and sent by the background thread.
 
         Args:
-            audit_record (dict): The audit data to send.
-
-        Returns:
-            str: The Firehose record ID.
+            audit_record (EligibilityAuditRecord | dict): The audit data to send. Dicts, which could change after
+                this returns, are always encoded at once.
         """
-        response = self.firehose.put_record(
-            DeliveryStreamName=self.audit_delivery_stream,
-            Record={"Data": (json.dumps(audit_record) + "\n").encode("utf-8")},
-        )
-        logger.info("Successfully sent to the Firehose", extra={"firehose_record_id": response["RecordId"]})
+        record = encode_record(audit_record) if isinstance(audit_record, dict) else audit_record
+        if self._queue is not None:
+            self._queue.put(record)
+            return
+        data = encode_audit_record(record)
+        with self._lock:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.append(data)
+            self._buffered_bytes += len(data)
+            self.stats.records += 1
+            due = (
+                len(self._buffer) >= self.batch_max_records
+                or self._buffered_bytes >= self.batch_max_bytes
+                or time.monotonic() - self._oldest >= self.batch_max_age
+            )
+            if due:
+                records = self._take()
+            else:
+                records = []
+                if self._timer is None:
+                    self._start_timer()
+        self._send(records)
+
+    def flush(self) -> None:
+        """Send any buffered or queued records now."""
+        if self._queue is not None:
+            self._queue.drain(timeout=remaining())
+        with self._lock:
+            records = self._take()
+        self._send(records)
+
+    def _start_timer(self) -> None:
+        """Send the buffer once the oldest record in it is old enough, if nothing else has by then."""
+        self._timer = threading.Timer(self._oldest + self.batch_max_age - time.monotonic(), self._send_if_due)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _send_if_due(self) -> None:
+        with self._lock:
+            due = self._buffer and time.monotonic() - self._oldest >= self.batch_max_age
+            records = self._take() if due else []
+        self._send(records, in_background=True)
+
+    def _take(self) -> list[bytes]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        records, self._buffer, self._buffered_bytes = self._buffer, [], 0
+        return records
+
+    def _send(self, records: Sequence[EligibilityAuditRecord | bytes], *, in_background: bool = False) -> None:
+        sent = [self._put_batch(batch) for batch in self._batches(self._encode(self._encode_records(records)))]
+        if sent and all(sent) and self.spool is not None and not self.spool.is_empty():
+            if in_background:
+                self._send_spooled(self.spool)
+            else:
+                self._start_resending(self.spool)
+
+    def _send_in_background(self, records: Sequence[EligibilityAuditRecord | bytes]) -> None:
+        self._send(records, in_background=True)
+
+    def _start_resending(self, spool: AuditSpool) -> None:
+        """Have a background thread send a segment of spooled records, so that the request which finds Firehose
+        taking records again doesn't wait on sending them."""
+        with self._lock:
+            if self._resending:
+                return
+            self._resending = True
+        threading.Thread(target=self._resend, args=(spool,), name="audit-resend", daemon=True).start()
+
+    def _resend(self, spool: AuditSpool) -> None:
+        try:
+            self._send_spooled(spool)
+        except Exception:
+            logger.exception("sending spooled audit records failed")
+        finally:
+            with self._lock:
+                self._resending = False
+
+    def _send_spooled(self, spool: AuditSpool) -> None:
+        """Firehose is taking records again, so send the oldest segment of spooled records. Any which fail go back
+        into the spool."""
+        records = spool.take()
+        logger.info("sending spooled audit records", extra={"records": len(records)})
+        for batch in self._batches(self._encode(records)):
+            self._put_batch(batch)
+        spool.log_stats()
+
+    def _encode_records(self, records: Sequence[EligibilityAuditRecord | bytes]) -> list[bytes]:
+        """Encode any records which aren't already. Any which can't be encoded are dropped, so the rest still go."""
+        encoded = []
+        for record in records:
+            try:
+                encoded.append(encode_audit_record(record))
+            except Exception:
+                logger.exception("encoding audit record failed, record dropped")
+                self.stats.dropped += 1
+        return encoded
+
+    def _encode(self, records: list[bytes]) -> list[bytes]:
+        """The Firehose records to send the audit records in."""
+        return aggregate(records) if self.encoding == AuditEncoding.aggregated else records
+
+    def _batches(self, records: list[bytes]) -> Iterator[list[bytes]]:
+        """Split records into batches within the configured - and Firehose's - limits."""
+        batch: list[bytes] = []
+        batch_bytes = 0
+        for record in records:
+            if batch and (len(batch) >= self.batch_max_records or batch_bytes + len(record) > self.batch_max_bytes):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(record)
+            batch_bytes += len(record)
+        if batch:
+            yield batch
+
+    def _put_batch(self, records: list[bytes]) -> bool:
+        """Put a batch of records, returning whether they were all put."""
+        attempt = 0
+        for attempt in range(self.max_attempts):
+            if attempt:
+                delay = random.uniform(0, RETRY_BASE_DELAY_SECONDS * 2**attempt)  # noqa: S311 - jitter, not security
+                if not has_time_for(delay):
+                    break
+                self.stats.retries += 1
+                time.sleep(delay)
+            try:
+                response = self.circuit_breaker.call(
+                    lambda records=records: self.firehose.put_record_batch(
+                        DeliveryStreamName=self.audit_delivery_stream, Records=[{"Data": data} for data in records]
+                    )
+                )
+            except (BotoCoreError, ClientError):
+                logger.warning("putting audit record batch failed", exc_info=True, extra={"attempt": attempt + 1})
+                continue
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                logger.warning("audit records not sent: %s", e, extra={"records": len(records)})
+                break
+
+            self.stats.batches += 1
+            if not response.get("FailedPutCount"):
+                logger.info("Successfully sent to the Firehose", extra={"records": len(records)})
+                return True
+            records = [
+                data
+                for data, result in zip(records, response["RequestResponses"], strict=True)
+                if result.get("ErrorCode")
+            ]
+            logger.warning("Firehose failed to put some audit records", extra={"failed": len(records)})
+
+        self._unsent(records, attempts=attempt + 1)
+        return False
+
+    def _unsent(self, firehose_records: list[bytes], attempts: int) -> None:
+        records = [record for firehose_record in firehose_records for record in split_records(firehose_record)]
+        if self.spool is not None and self.spool.write(records):
+            self.stats.spooled += len(records)
+        else:
+            logger.error("audit records dropped", extra={"records": len(records), "attempts": attempts})
+            self.stats.dropped += len(records)
@@ -0,0 +1,92 @@
+import gzip
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".ndjson.gz"
+
+
+@dataclass
+class AuditSpoolStats:
+    spooled: int = 0
+    taken: int = 0
+    segments: int = 0
+
+
+class AuditSpool:
+    """Audit records held on local disk until they can be sent - newline delimited, in gzip compressed segment files,
+    named so they sort oldest first.
+
+    Records are appended to the newest segment, each write as another gzip member, until it reaches segment_max_bytes,
+    when a new segment is started. Segments are taken back oldest first. Once the spool reaches max_bytes, it refuses
+    further records, so a long outage can't fill the disk."""
+
+    def __init__(self, directory: Path, *, max_bytes: int, segment_max_bytes: int = 1024 * 1024) -> None:
+        super().__init__()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_max_bytes = segment_max_bytes
+        self.stats = AuditSpoolStats()
+        self._lock = threading.Lock()
+
+    def write(self, records: list[bytes]) -> bool:
+        """Spool the records, returning whether there was room for them."""
+        data = gzip.compress(b"".join(records))
+        with self._lock:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                segments = self._segments()
+                if sum(segment.stat().st_size for segment in segments) + len(data) > self.max_bytes:
+                    return False
+                if segments and segments[-1].stat().st_size < self.segment_max_bytes:
+                    segment = segments[-1]
+                else:
+                    segment = self.directory / f"{time.time_ns():020d}{SEGMENT_SUFFIX}"
+                    self.stats.segments += 1
+                with segment.open("ab") as segment_file:
+                    segment_file.write(data)
+            except OSError:
+                logger.exception("couldn't write to audit spool %s", self.directory)
+                return False
+            self.stats.spooled += len(records)
+        logger.warning("audit records spooled", extra={"records": len(records), "segment": segment.name})
+        return True
+
+    def take(self) -> list[bytes]:
+        """Remove and return the records in the oldest segment."""
+        with self._lock:
+            segments = self._segments()
+            if not segments:
+                return []
+            try:
+                data = gzip.decompress(segments[0].read_bytes())
+            except (OSError, EOFError):
+                logger.exception("unreadable audit spool segment %s discarded", segments[0].name)
+                data = b""
+            segments[0].unlink()
+            records = data.splitlines(keepends=True)
+            self.stats.taken += len(records)
+        return records
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._segments()
+
+    def _segments(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def log_stats(self) -> None:
+        logger.info(
+            "audit spool stats",
+            extra={
+                "spooled": self.stats.spooled,
+                "taken": self.stats.taken,
+                "segments": self.stats.segments,
+            },
+        )
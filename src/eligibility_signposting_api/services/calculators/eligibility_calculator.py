@@ -27,24 +27,35 @@ from eligibility_signposting_api.model.eligibility import (
     UrlLabel,
     UrlLink,
 )
+from eligibility_signposting_api.model.reference_lists import ReferenceListRegistry
 from eligibility_signposting_api.services.calculators.rule_calculator import (
     RuleCalculator,
 )
+from eligibility_signposting_api.services.rules.result_cache import (
+    OperatorResultCache,  # noqa: TC001 - needed by wireup
+)
 
 Row = Collection[Mapping[str, Any]]
 
 
 @service
 class EligibilityCalculatorFactory:
-    @staticmethod
-    def get(person_data: Row, campaign_configs: Collection[rules.CampaignConfig]) -> EligibilityCalculator:
-        return EligibilityCalculator(person_data=person_data, campaign_configs=campaign_configs)
+    def __init__(self, result_cache: OperatorResultCache) -> None:
+        super().__init__()
+        self.result_cache = result_cache
+
+    def get(self, person_data: Row, campaign_configs: Collection[rules.CampaignConfig]) -> EligibilityCalculator:
+        self.result_cache.bind_ruleset((rules.ruleset_version(campaign_configs), ReferenceListRegistry.versions()))
+        return EligibilityCalculator(
+            person_data=person_data, campaign_configs=campaign_configs, result_cache=self.result_cache
+        )
 
 
 @dataclass
 class EligibilityCalculator:
     person_data: Row
     campaign_configs: Collection[rules.CampaignConfig]
+    result_cache: OperatorResultCache | None = None
 
     results: list[eligibility.Condition] = field(default_factory=list)
 
@@ -174,7 +185,9 @@ class EligibilityCalculator:
         for _, rule_group in groupby(sorted_rules_by_priority, key=priority_getter):
             rule_group_list = list(rule_group)
             matcher_matched_list = [
-                RuleCalculator(person_data=self.person_data, rule=rule).evaluate_exclusion()[1].matcher_matched
+                RuleCalculator(person_data=self.person_data, rule=rule, result_cache=self.result_cache)
+                .evaluate_exclusion()[1]
+                .matcher_matched
                 for rule in rule_group_list
             ]
 
@@ -318,7 +331,7 @@ class EligibilityCalculator:
 
         for rule in rules_group:
             is_rule_stop = rule.rule_stop or is_rule_stop
-            rule_calculator = RuleCalculator(person_data=self.person_data, rule=rule)
+            rule_calculator = RuleCalculator(person_data=self.person_data, rule=rule, result_cache=self.result_cache)
             status, reason = rule_calculator.evaluate_exclusion()
             if status.is_exclusion:
                 best_status = eligibility.Status.best(status, best_status)
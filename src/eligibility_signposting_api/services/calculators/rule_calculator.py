@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from collections.abc import Collection, Mapping
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from hamcrest.core.string_description import StringDescription
 
 from eligibility_signposting_api.model import eligibility, rules
-from eligibility_signposting_api.services.rules.operators import OperatorRegistry
+from eligibility_signposting_api.services.rules.operators import Operator, OperatorRegistry
+
+if TYPE_CHECKING:
+    from eligibility_signposting_api.services.rules.result_cache import OperatorResultCache
 
 Row = Collection[Mapping[str, Any]]
 
@@ -16,6 +19,7 @@ Row = Collection[Mapping[str, Any]]
 class RuleCalculator:
     person_data: Row
     rule: rules.IterationRule
+    result_cache: OperatorResultCache | None = None
 
     def evaluate_exclusion(self) -> tuple[eligibility.Status, eligibility.Reason]:
         """Evaluate if a particular rule excludes this person. Return the result, and the reason for the result."""
@@ -72,18 +76,27 @@ class RuleCalculator:
 
     def evaluate_rule(self, attribute_value: str | None) -> tuple[eligibility.Status, str, bool]:
         """Evaluate a rule against a person data attribute. Return the result, and the reason for the result."""
-        matcher_class = OperatorRegistry.get(self.rule.operator)
-        matcher = matcher_class(rule_value=self.rule.comparator)
+        matcher = OperatorRegistry.compile(self.rule.operator, self.rule.comparator)
+        if self.result_cache is not None:
+            matcher_matched, reason = self.result_cache.get_or_evaluate(self.rule, matcher, attribute_value, self.match)
+        else:
+            matcher_matched, reason = self.match(matcher, attribute_value)
 
-        matcher_matched = matcher.matches(attribute_value)
-        reason = StringDescription()
         if matcher_matched:
-            matcher.describe_match(attribute_value, reason)
             status = {
                 rules.RuleType.filter: eligibility.Status.not_eligible,
                 rules.RuleType.suppression: eligibility.Status.not_actionable,
                 rules.RuleType.redirect: eligibility.Status.actionable,
             }[self.rule.type]
-            return status, str(reason), matcher_matched
-        matcher.describe_mismatch(attribute_value, reason)
-        return eligibility.Status.actionable, str(reason), matcher_matched
+            return status, reason, matcher_matched
+        return eligibility.Status.actionable, reason, matcher_matched
+
+    @staticmethod
+    def match(matcher: Operator, attribute_value: str | None) -> tuple[bool, str]:
+        matcher_matched = matcher.matches(attribute_value)
+        reason = StringDescription()
+        if matcher_matched:
+            matcher.describe_match(attribute_value, reason)
+        else:
+            matcher.describe_mismatch(attribute_value, reason)
+        return matcher_matched, str(reason)
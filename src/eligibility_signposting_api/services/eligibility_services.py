@@ -1,9 +1,15 @@
 import logging
+from concurrent.futures import Executor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextvars import copy_context
+from typing import Annotated, Any
 
-from wireup import service
+from wireup import Inject, service
 
-from eligibility_signposting_api.model import eligibility
-from eligibility_signposting_api.repos import CampaignRepo, NotFoundError, PersonRepo
+from eligibility_signposting_api.deadline import DeadlineExceededError, has_time_for, remaining
+from eligibility_signposting_api.model import eligibility, rules
+from eligibility_signposting_api.repos import CampaignRepo, FetchPlan, NotFoundError, PersonRepo
+from eligibility_signposting_api.services.audit_record import EligibilityAuditRecord
 from eligibility_signposting_api.services.audit_service import AuditService
 from eligibility_signposting_api.services.calculators import eligibility_calculator as calculator
 
@@ -20,18 +26,23 @@ class InvalidQueryParamError(Exception):
 
 @service
 class EligibilityService:
-    def __init__(
+    def __init__(  # noqa: PLR0913 - injected dependencies and settings
         self,
         person_repo: PersonRepo,
         campaign_repo: CampaignRepo,
         audit_service: AuditService,
         calculator_factory: calculator.EligibilityCalculatorFactory,
+        executor: Annotated[Executor | None, Inject(qualifier="fetch")] = None,
+        optional_work_margin: Annotated[float, Inject(param="optional_work_margin_seconds")] = 1.0,
     ) -> None:
         super().__init__()
         self.person_repo = person_repo
         self.campaign_repo = campaign_repo
         self.audit_service = audit_service
         self.calculator_factory = calculator_factory
+        self.executor = executor
+        self.optional_work_margin = optional_work_margin
+        self.fetch_plan: tuple[rules.RulesetVersion, FetchPlan] | None = None
 
     def get_eligibility_status(
         self, nhs_number: eligibility.NHSNumber | None = None, *, include_actions_flag: bool = True
@@ -39,8 +50,7 @@ class EligibilityService:
         """Calculate a person's eligibility for vaccination given an NHS number."""
         if nhs_number:
             try:
-                person_data = self.person_repo.get_eligibility_data(nhs_number)
-                campaign_configs = list(self.campaign_repo.get_campaign_configs())
+                campaign_configs, person_data = self.fetch(nhs_number)
                 logger.debug(
                     "got person_data for %r",
                     nhs_number,
@@ -54,7 +64,56 @@ class EligibilityService:
                 raise UnknownPersonError from e
             else:
                 calc: calculator.EligibilityCalculator = self.calculator_factory.get(person_data, campaign_configs)
-                self.audit_service.audit({"test_audit": "check if audit works"})
                 return calc.evaluate_eligibility(include_actions_flag=include_actions_flag)
 
         raise UnknownPersonError  # pragma: no cover
+
+    def audit(self, audit_record: EligibilityAuditRecord) -> None:
+        """Audit an eligibility decision, once its response has been rendered - unless the request's deadline is near,
+        as auditing can wait on Firehose."""
+        if has_time_for(self.optional_work_margin):
+            self.audit_service.audit(audit_record)
+        else:
+            logger.warning("skipping audit, as the request deadline is near", extra={"remaining": remaining()})
+
+    def fetch(self, nhs_number: eligibility.NHSNumber) -> tuple[list[rules.CampaignConfig], list[dict[str, Any]]]:
+        """Read the campaign configs, and the person's data they need.
+
+        With an executor, the two are read concurrently, so a request waits for the slower read rather than both. The
+        configs aren't known until they are read, so the person's data is read with the fetch plan for the configs read
+        last time - or all of it, the first time - and read again in the rare case the configs have since changed to
+        need data that plan doesn't cover. As when reading one after the other, an error reading the configs takes
+        precedence over one reading the person's data. The person's data is waited for no longer than the request's
+        deadline allows."""
+        if self.executor is None:
+            campaign_configs = list(self.campaign_repo.get_campaign_configs())
+            return campaign_configs, self.person_repo.get_eligibility_data(
+                nhs_number, self.get_fetch_plan(campaign_configs)
+            )
+
+        speculative_plan = self.fetch_plan[1] if self.fetch_plan is not None else None
+        person_data_future = self.executor.submit(
+            copy_context().run, self.person_repo.get_eligibility_data, nhs_number, speculative_plan
+        )
+        try:
+            campaign_configs = list(self.campaign_repo.get_campaign_configs())
+        except BaseException:
+            person_data_future.cancel()
+            raise
+        try:
+            person_data = person_data_future.result(timeout=remaining())
+        except FutureTimeoutError as e:
+            msg = "deadline passed waiting for person data"
+            raise DeadlineExceededError(msg) from e
+
+        fetch_plan = self.get_fetch_plan(campaign_configs)
+        if speculative_plan is not None and not speculative_plan.covers(fetch_plan):
+            person_data = self.person_repo.get_eligibility_data(nhs_number, fetch_plan)
+        return campaign_configs, person_data
+
+    def get_fetch_plan(self, campaign_configs: list[rules.CampaignConfig]) -> FetchPlan:
+        """Work out which of a person's data the campaign configs need, once for each version of the configs."""
+        version = rules.ruleset_version(campaign_configs)
+        if self.fetch_plan is None or self.fetch_plan[0] != version:
+            self.fetch_plan = (version, FetchPlan.for_campaign_configs(campaign_configs))
+        return self.fetch_plan[1]
@@ -0,0 +1,11 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Annotated
+
+from wireup import Inject, service
+
+
+@service(qualifier="fetch")
+def fetch_executor_factory(fetch_pool_size: Annotated[int, Inject(param="fetch_pool_size")]) -> Executor | None:
+    """A bounded pool of threads, shared by all requests, for reading from AWS concurrently. A size of 0 disables it,
+    so reads are made one after another in the request's own thread."""
+    return ThreadPoolExecutor(max_workers=fetch_pool_size, thread_name_prefix="fetch") if fetch_pool_size > 0 else None
@@ -5,29 +5,60 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import UTC, date, datetime
-from typing import ClassVar, cast
+from functools import lru_cache
+from typing import ClassVar, NamedTuple, cast
 
 from dateutil.relativedelta import relativedelta
 from hamcrest.core.base_matcher import BaseMatcher
 from hamcrest.core.description import Description
 
-from eligibility_signposting_api.model.rules import RuleOperator
+from eligibility_signposting_api.model.patterns import compile_pattern
+from eligibility_signposting_api.model.reference_lists import ReferenceList, ReferenceListName, ReferenceListRegistry
+from eligibility_signposting_api.model.rules import ITEM_DEFAULT_PATTERN, RuleOperator
+from eligibility_signposting_api.services.rules.prefix_trie import PrefixTrie
 
 logger = logging.getLogger(__name__)
 
+PARSE_CACHE_SIZE = 4096
+COMPILED_OPERATOR_CACHE_SIZE = 1024
+INT_LIKE_PATTERN = re.compile(r"-?\d+")
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(value: str) -> date:
+    """Parse a YYYYMMDD string. Dates of birth, vaccination dates and so on have few distinct values across the
+    population, so results are cached."""
+    return datetime.strptime(value, "%Y%m%d").replace(tzinfo=UTC).date()
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_int(value: str) -> int | None:
+    """Parse an int-like string, or return None if it isn't one."""
+    return int(value) if INT_LIKE_PATTERN.fullmatch(value) else None
+
+
+class ParseCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+def parse_cache_info() -> dict[str, ParseCacheInfo]:
+    """Hit and miss counts for the parsing caches."""
+    return {"date": ParseCacheInfo(*parse_date.cache_info()), "int": ParseCacheInfo(*parse_int.cache_info())}
+
 
 @dataclass
 class Operator(BaseMatcher[str | None], ABC):
     """An operator compares some person's data attribute - date of birth, postcode, flags or so on - against a value
     specified in a rule."""
 
-    ITEM_DEFAULT_PATTERN: ClassVar[str] = r"(?P<rule_value>[^\[]+)\[\[NVL:(?P<item_default>[^\]]+)\]\]"
-
     rule_value: str
     item_default: str | None = None
 
     def __post_init__(self) -> None:
-        if self.rule_value and (match := re.fullmatch(self.ITEM_DEFAULT_PATTERN, self.rule_value)):
+        if self.rule_value and (match := ITEM_DEFAULT_PATTERN.fullmatch(self.rule_value)):
             self.rule_value = match.group("rule_value")
             self.item_default = match.group("item_default")
 
@@ -58,6 +89,12 @@ class OperatorRegistry:
         msg = f"{rule_operator} not implemented"
         raise NotImplementedError(msg)
 
+    @staticmethod
+    @lru_cache(maxsize=COMPILED_OPERATOR_CACHE_SIZE)
+    def compile(rule_operator: RuleOperator, rule_value: str) -> Operator:
+        """Build the operator for a rule's operator and comparator once, and share it between evaluations."""
+        return OperatorRegistry.get(rule_operator)(rule_value=rule_value)
+
 
 class ScalarOperator(Operator, ABC):
     comparator: ClassVar[Callable[[str | None, str | None], bool]]
@@ -77,9 +114,11 @@ class ScalarOperator(Operator, ABC):
         return data_comparator(person_data, rule_value)
 
     def coerce_types(self, left: str, right: str) -> tuple[str | int, str | int]:
-        if all(self.int_like(i) for i in (left, right)):
+        left_int = parse_int(left) if isinstance(left, str) else None
+        right_int = parse_int(right) if isinstance(right, str) else None
+        if left_int is not None and right_int is not None:
             # If both sides can be treated as numeric, do so.
-            return int(left), int(right)
+            return left_int, right_int
         # Treat both sides as strings.
         return left, right
 
@@ -97,7 +136,7 @@ class ScalarOperator(Operator, ABC):
 
     @staticmethod
     def int_like(val: str) -> bool:
-        return isinstance(val, str) and bool(re.fullmatch(r"-?\d+$", val))
+        return isinstance(val, str) and parse_int(val) is not None
 
     def describe_to(self, description: Description) -> None:
         description.append_text(f"need {self.__class__.__name__} (item {self.comparator.__name__} {self.rule_value})")
@@ -160,24 +199,114 @@ class EndsWith(Operator):
         return str(item).endswith(self.rule_value)
 
 
+class MembershipOperator(Operator, ABC):
+    """Compares against a comma separated list of values, or against a reference list loaded alongside the rules,
+    given as [[LIST:list_name]]."""
+
+    LIST_PATTERN: ClassVar[re.Pattern[str]] = re.compile(r"\[\[LIST:(?P<list_name>[^\]]+)\]\]")
+
+    comparators: frozenset[str]
+    list_name: ReferenceListName | None
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+
+        if match := self.LIST_PATTERN.fullmatch(str(self.rule_value)):
+            self.list_name = ReferenceListName(match.group("list_name"))
+            self.comparators = frozenset()
+        else:
+            self.list_name = None
+            self.comparators = frozenset(str(self.rule_value).split(","))
+
+    def is_member(self, item: str | None) -> bool:
+        items = str(item).split(",")
+        if self.list_name is not None:
+            reference_list = ReferenceListRegistry.get(self.list_name)
+            return any(i in reference_list for i in items)
+        return not self.comparators.isdisjoint(items)
+
+
+class PatternOperator(Operator, ABC):
+    """Compares against a regular expression, which needn't match the whole of the attribute value - anchor it with ^
+    and $ if it should. A [[NVL:...]] default can't be given for a pattern containing a [ character class."""
+
+    pattern: re.Pattern[str]
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.pattern = compile_pattern(self.rule_value)
+
+    def has_match(self, item: str | None) -> bool:
+        return item is not None and self.pattern.search(str(item)) is not None
+
+
+@OperatorRegistry.register(RuleOperator.matches)
+class Matches(PatternOperator):
+    def _matches(self, item: str | None) -> bool:
+        item = item if item is not None else self.item_default
+        return self.has_match(item)
+
+
+@OperatorRegistry.register(RuleOperator.not_matches)
+class NotMatches(PatternOperator):
+    def _matches(self, item: str | None) -> bool:
+        item = item if item is not None else self.item_default
+        return not self.has_match(item)
+
+
 @OperatorRegistry.register(RuleOperator.is_in)
 @OperatorRegistry.register(RuleOperator.member_of)
-class IsIn(Operator):
+class IsIn(MembershipOperator):
     def _matches(self, item: str | None) -> bool:
         item = item if item is not None else self.item_default
-        comparators = set(str(self.rule_value).split(","))
-        items = set(str(item).split(","))
-        return bool(items & comparators)
+        return self.is_member(item)
 
 
 @OperatorRegistry.register(RuleOperator.not_in)
 @OperatorRegistry.register(RuleOperator.not_member_of)
-class NotIn(Operator):
+class NotIn(MembershipOperator):
+    def _matches(self, item: str | None) -> bool:
+        item = item if item is not None else self.item_default
+        return not self.is_member(item)
+
+
+class PrefixListOperator(MembershipOperator, ABC):
+    """Compares against a list of prefixes - inline or a reference list - compiled into a trie, so that matching
+    takes the same time however many prefixes there are."""
+
+    trie: PrefixTrie
+    list_trie: tuple[ReferenceList, PrefixTrie] | None
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.trie = PrefixTrie.of(self.comparators)
+        self.list_trie = None
+
+    def has_listed_prefix(self, item: str | None) -> bool:
+        return item is not None and self.get_trie().has_prefix_of(str(item))
+
+    def get_trie(self) -> PrefixTrie:
+        if self.list_name is None:
+            return self.trie
+        reference_list = ReferenceListRegistry.get(self.list_name)
+        if self.list_trie is None or self.list_trie[0] is not reference_list:
+            # Compile once for each version of the list loaded.
+            self.list_trie = (reference_list, PrefixTrie.of(reference_list))
+        return self.list_trie[1]
+
+
+@OperatorRegistry.register(RuleOperator.starts_with_any)
+class StartsWithAny(PrefixListOperator):
+    def _matches(self, item: str | None) -> bool:
+        item = item if item is not None else self.item_default
+        return self.has_listed_prefix(item)
+
+
+@OperatorRegistry.register(RuleOperator.not_starts_with_any)
+class NotStartsWithAny(PrefixListOperator):
     def _matches(self, item: str | None) -> bool:
         item = item if item is not None else self.item_default
-        comparators = set(str(self.rule_value).split(","))
-        items = set(str(item).split(","))
-        return not bool(items & comparators)
+        return not self.has_listed_prefix(item)
 
 
 @OperatorRegistry.register(RuleOperator.is_null)
@@ -247,7 +376,7 @@ class IsFalse(Operator):
 
 
 class DateOperator(Operator, ABC):
-    OFFSET_PATTERN: ClassVar[str] = r"(?P<rule_value>[^\[]+)\[\[OFFSET:(?P<offset>\d{8})\]\]"
+    OFFSET_PATTERN: ClassVar[re.Pattern[str]] = re.compile(r"(?P<rule_value>[^\[]+)\[\[OFFSET:(?P<offset>\d{8})\]\]")
     delta_type: ClassVar[str]
     comparator: ClassVar[Callable[[date, date], bool]]
     offset: date | None = None
@@ -255,9 +384,9 @@ class DateOperator(Operator, ABC):
     def __post_init__(self) -> None:
         super().__post_init__()
 
-        if self.rule_value and (match := re.fullmatch(self.OFFSET_PATTERN, self.rule_value)):
+        if self.rule_value and (match := self.OFFSET_PATTERN.fullmatch(self.rule_value)):
             self.rule_value = match.group("rule_value")
-            self.offset = datetime.strptime(match.group("offset"), "%Y%m%d").replace(tzinfo=UTC).date()
+            self.offset = parse_date(match.group("offset"))
 
     @property
     def today(self) -> date:
@@ -265,7 +394,7 @@ class DateOperator(Operator, ABC):
 
     @staticmethod
     def get_attribute_date(item: str | None) -> date | None:
-        return datetime.strptime(str(item), "%Y%m%d").replace(tzinfo=UTC).date() if item else None
+        return parse_date(str(item)) if item else None
 
     @property
     def cutoff(self) -> date:
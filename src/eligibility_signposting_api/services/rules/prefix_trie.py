@@ -0,0 +1,39 @@
+from collections.abc import Iterable
+from typing import Self
+
+
+class PrefixTrie:
+    """A set of prefixes, compiled into a trie so that checking whether a value starts with any of them takes time
+    proportional to the length of the value, however many prefixes there are."""
+
+    __slots__ = ("children", "terminal")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.children: dict[str, PrefixTrie] = {}
+        self.terminal = False
+
+    @classmethod
+    def of(cls, prefixes: Iterable[str]) -> Self:
+        trie = cls()
+        for prefix in prefixes:
+            trie.add(prefix)
+        return trie
+
+    def add(self, prefix: str) -> None:
+        node = self
+        for char in prefix:
+            node = node.children.setdefault(char, PrefixTrie())
+        node.terminal = True
+
+    def has_prefix_of(self, value: str) -> bool:
+        """Does the value start with any of the prefixes?"""
+        node = self
+        for char in value:
+            if node.terminal:
+                return True
+            next_node = node.children.get(char)
+            if next_node is None:
+                return False
+            node = next_node
+        return node.terminal
@@ -0,0 +1,75 @@
+import logging
+from collections.abc import Callable, Hashable
+from datetime import UTC, date, datetime
+from typing import Annotated, Any
+
+from wireup import Inject, service
+
+from eligibility_signposting_api.caching import CacheStats, LruCache
+from eligibility_signposting_api.model.rules import IterationRule, RuleComparator, RuleOperator
+from eligibility_signposting_api.services.rules.operators import DateOperator, Operator
+
+logger = logging.getLogger(__name__)
+
+ResultKey = tuple[RuleOperator, RuleComparator, type, Any, bool]
+Result = tuple[bool, str]
+
+
+@service
+class OperatorResultCache:
+    """Operator results, cached across requests and keyed by compiled rule and attribute value.
+
+    Many people share the same postcode district, ICB or date of birth, so the same operator keeps being evaluated
+    against the same value. Opt in by configuring a size greater than zero. The cache is emptied when the ruleset
+    changes, and results for date rules are dropped when the date rolls over, since they depend on today's date."""
+
+    def __init__(self, max_entries: Annotated[int, Inject(param="operator_result_cache_size")] = 0) -> None:
+        super().__init__()
+        self.enabled = max_entries > 0
+        self._results: LruCache[ResultKey, Result] = LruCache(max_entries)
+        self._ruleset: Hashable | None = None
+        self._today: date | None = None
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._results.stats
+
+    @property
+    def footprint(self) -> int:
+        return self._results.footprint
+
+    def bind_ruleset(self, ruleset: Hashable) -> None:
+        """Note which ruleset results are being cached for, emptying the cache if it has been swapped."""
+        if ruleset != self._ruleset:
+            if self._ruleset is not None:
+                logger.info("ruleset swapped, clearing operator result cache")
+            self._results.clear()
+            self._ruleset = ruleset
+
+    def get_or_evaluate(
+        self,
+        rule: IterationRule,
+        operator: Operator,
+        item: str | None,
+        evaluate: Callable[[Operator, str | None], Result],
+    ) -> Result:
+        if not self.enabled:
+            return evaluate(operator, item)
+
+        self._check_date_rollover()
+        key = (rule.operator, rule.comparator, type(item), item, isinstance(operator, DateOperator))
+        try:
+            cached = self._results.get(key)
+        except TypeError:  # Unhashable attribute value, so can't be cached.
+            return evaluate(operator, item)
+
+        if cached is None:
+            cached = evaluate(operator, item)
+            self._results.put(key, cached)
+        return cached
+
+    def _check_date_rollover(self) -> None:
+        today = datetime.now(tz=UTC).date()
+        if today != self._today:
+            self._results.discard_where(lambda key: key[-1])
+            self._today = today
@@ -1,16 +1,29 @@
+import json
 import logging
 import uuid
 from datetime import UTC, datetime
 from http import HTTPStatus
-from typing import Never
+from typing import Annotated, Any, Never
 
 from fhir.resources.R4B.operationoutcome import OperationOutcome, OperationOutcomeIssue
-from flask import Blueprint, make_response, request
+from flask import Blueprint, current_app, make_response, request
 from flask.typing import ResponseReturnValue
-from wireup import Injected
+from wireup import Inject, Injected
 
-from eligibility_signposting_api.model.eligibility import Condition, EligibilityStatus, NHSNumber, Status
+from eligibility_signposting_api.circuit_breaker import CircuitOpenError
+from eligibility_signposting_api.deadline import DeadlineExceededError, has_time_for
+from eligibility_signposting_api.json_encoding import dumps
+from eligibility_signposting_api.model.eligibility import (
+    CohortGroupResult,
+    Condition,
+    EligibilityStatus,
+    NHSNumber,
+    Reason,
+    Status,
+)
+from eligibility_signposting_api.model.nhs_number import is_valid_nhs_number
 from eligibility_signposting_api.services import EligibilityService, UnknownPersonError
+from eligibility_signposting_api.services.audit_record import EligibilityAuditRecord
 from eligibility_signposting_api.services.eligibility_services import InvalidQueryParamError
 from eligibility_signposting_api.views.response_model import eligibility
 from eligibility_signposting_api.views.response_model.eligibility import ProcessedSuggestion
@@ -21,6 +34,10 @@ STATUS_MAPPING = {
     Status.not_eligible: eligibility.Status.not_eligible,
 }
 
+NHS_NUMBER_PLACEHOLDER = "__NHS_NUMBER__"
+SUITABILITY_RULES_OMITTED_HEADER = "X-Suitability-Rules-Omitted"
+UNKNOWN_PERSON_BODY_TEMPLATE = "eligibility_signposting_api.unknown_person_body_template"
+
 logger = logging.getLogger(__name__)
 
 eligibility_blueprint = Blueprint("eligibility", __name__)
@@ -28,35 +45,109 @@ eligibility_blueprint = Blueprint("eligibility", __name__)
 
 @eligibility_blueprint.get("/", defaults={"nhs_number": ""})
 @eligibility_blueprint.get("/<nhs_number>")
-def check_eligibility(nhs_number: NHSNumber, eligibility_service: Injected[EligibilityService]) -> ResponseReturnValue:
+def check_eligibility(  # noqa: PLR0911 - a response for each outcome
+    nhs_number: NHSNumber,
+    eligibility_service: Injected[EligibilityService],
+    optional_work_margin: Annotated[float, Inject(param="optional_work_margin_seconds")],
+) -> ResponseReturnValue:
     logger.info("checking nhs_number %r in %r", nhs_number, eligibility_service, extra={"nhs_number": nhs_number})
+    if not nhs_number:
+        return handle_unknown_person_error(nhs_number)
+    if not is_valid_nhs_number(nhs_number):
+        return handle_invalid_nhs_number_error(nhs_number)
     try:
+        include_actions = get_include_actions_flag()
         eligibility_status = eligibility_service.get_eligibility_status(
-            nhs_number, include_actions_flag=get_include_actions_flag()
+            nhs_number, include_actions_flag=include_actions
         )
     except InvalidQueryParamError:
         return handle_invalid_query_param_error()
     except UnknownPersonError:
         return handle_unknown_person_error(nhs_number)
+    except DeadlineExceededError:
+        return handle_deadline_exceeded_error()
+    except CircuitOpenError:
+        return handle_circuit_open_error()
     else:
-        eligibility_response = build_eligibility_response(eligibility_status)
-        return make_response(
-            eligibility_response.model_dump(by_alias=True, mode="json", exclude_none=True), HTTPStatus.OK
+        include_suitability_rules = has_time_for(optional_work_margin)
+        body = render_eligibility_response(eligibility_status, include_suitability_rules=include_suitability_rules)
+        eligibility_service.audit(
+            EligibilityAuditRecord(nhs_number, eligibility_status, body, include_actions=include_actions)
         )
+        headers = {"Content-Type": "application/json"}
+        if not include_suitability_rules:
+            logger.warning("suitability rules left out, near deadline", extra={"nhs_number": nhs_number})
+            headers[SUITABILITY_RULES_OMITTED_HEADER] = "true"
+        return make_response(body, HTTPStatus.OK, headers)
 
 
 def handle_unknown_person_error(nhs_number: NHSNumber) -> ResponseReturnValue:
     logger.debug("nhs_number %r not found", nhs_number, extra={"nhs_number": nhs_number})
+    prefix, suffix = unknown_person_body_template()
+    body = prefix + json.dumps(nhs_number)[1:-1] + suffix
+    return make_response(body, HTTPStatus.NOT_FOUND, {"Content-Type": "application/json"})
+
+
+def unknown_person_body_template() -> tuple[str, str]:
+    """The not found response body is the same for every unknown NHS number, bar the number itself, so it is only
+    serialised once for each app, as the app's JSON provider writes it. Returns the body either side of the NHS
+    number."""
+    if (template := current_app.extensions.get(UNKNOWN_PERSON_BODY_TEMPLATE)) is None:
+        problem = OperationOutcome(
+            issue=[
+                OperationOutcomeIssue(
+                    severity="information",
+                    code="nhs-number-not-found",
+                    diagnostics=f'NHS Number "{NHS_NUMBER_PLACEHOLDER}" not found.',
+                )  # pyright: ignore[reportCallIssue]
+            ]
+        )
+        body = make_response(problem.model_dump(by_alias=True, mode="json")).get_data(as_text=True)
+        prefix, suffix = body.split(NHS_NUMBER_PLACEHOLDER)
+        template = current_app.extensions[UNKNOWN_PERSON_BODY_TEMPLATE] = (prefix, suffix)
+    return template
+
+
+def handle_invalid_nhs_number_error(nhs_number: NHSNumber) -> ResponseReturnValue:
+    logger.debug("nhs_number %r invalid", nhs_number, extra={"nhs_number": nhs_number})
+    problem = OperationOutcome(
+        issue=[
+            OperationOutcomeIssue(
+                severity="error",
+                code="value",
+                diagnostics=f'NHS Number "{nhs_number}" is not a valid NHS number.',
+            )  # pyright: ignore[reportCallIssue]
+        ]
+    )
+    return make_response(problem.model_dump(by_alias=True, mode="json"), HTTPStatus.BAD_REQUEST)
+
+
+def handle_deadline_exceeded_error() -> ResponseReturnValue:
+    logger.warning("request deadline exceeded")
+    problem = OperationOutcome(
+        issue=[
+            OperationOutcomeIssue(
+                severity="error",
+                code="timeout",
+                diagnostics="Timed out checking eligibility.",
+            )  # pyright: ignore[reportCallIssue]
+        ]
+    )
+    return make_response(problem.model_dump(by_alias=True, mode="json"), HTTPStatus.GATEWAY_TIMEOUT)
+
+
+def handle_circuit_open_error() -> ResponseReturnValue:
+    logger.warning("dependency unavailable", exc_info=True)
     problem = OperationOutcome(
         issue=[
             OperationOutcomeIssue(
-                severity="information",
-                code="nhs-number-not-found",
-                diagnostics=f'NHS Number "{nhs_number}" not found.',
+                severity="error",
+                code="transient",
+                diagnostics="Eligibility can't be checked at the moment. Please try again later.",
             )  # pyright: ignore[reportCallIssue]
         ]
     )
-    return make_response(problem.model_dump(by_alias=True, mode="json"), HTTPStatus.NOT_FOUND)
+    return make_response(problem.model_dump(by_alias=True, mode="json"), HTTPStatus.SERVICE_UNAVAILABLE)
 
 
 def handle_invalid_query_param_error() -> ResponseReturnValue:
@@ -90,9 +181,13 @@ def raise_invalid_query_param_error() -> Never:
     raise InvalidQueryParamError
 
 
-def build_eligibility_response(eligibility_status: EligibilityStatus) -> eligibility.EligibilityResponse:
+def build_eligibility_response(
+    eligibility_status: EligibilityStatus, *, include_suitability_rules: bool = True
+) -> eligibility.EligibilityResponse:
     """Return an object representing the API response we are going to send, given an evaluation of the person's
-    eligibility."""
+    eligibility. Suitability rules can be left out, to respond sooner when the request's deadline is near - each
+    suggestion's suitabilityRules is then empty, and check_eligibility marks the response with the
+    X-Suitability-Rules-Omitted header, so the response keeps its shape."""
 
     processed_suggestions = []
 
@@ -102,7 +197,9 @@ def build_eligibility_response(eligibility_status: EligibilityStatus) -> eligibi
             status=STATUS_MAPPING[condition.status],
             statusText=eligibility.StatusText(f"{condition.status}"),  # pyright: ignore[reportCallIssue]
             eligibilityCohorts=build_eligibility_cohorts(condition),  # pyright: ignore[reportCallIssue]
-            suitabilityRules=build_suitability_results(condition),  # pyright: ignore[reportCallIssue]
+            suitabilityRules=(  # pyright: ignore[reportCallIssue]
+                build_suitability_results(condition) if include_suitability_rules else []
+            ),
             actions=(
                 condition.actions.actions
                 if condition.actions is not None and condition.actions.actions is not None
@@ -126,9 +223,16 @@ def build_eligibility_cohorts(condition: Condition) -> list[eligibility.Eligibil
     return [
         eligibility.EligibilityCohort(
             cohortCode=eligibility.CohortCode(cohort_result.cohort_code),
-            cohortText=eligibility.CohortText(cohort_result.description),
+            cohortText=eligibility.CohortText(cohort_result.description),  # pyright: ignore[reportArgumentType]
             cohortStatus=STATUS_MAPPING[cohort_result.status],
         )
+        for cohort_result in reported_cohort_results(condition)
+    ]
+
+
+def reported_cohort_results(condition: Condition) -> list[CohortGroupResult]:
+    return [
+        cohort_result
         for cohort_result in condition.cohort_results
         if cohort_result and condition.status == cohort_result.status and cohort_result.description
     ]
@@ -136,23 +240,73 @@ def build_eligibility_cohorts(condition: Condition) -> list[eligibility.Eligibil
 
 def build_suitability_results(condition: Condition) -> list[eligibility.SuitabilityRule]:
     """Make only one entry if there are duplicate rules"""
+    return [
+        eligibility.SuitabilityRule(
+            ruleType=eligibility.RuleType(reason.rule_type.value),
+            ruleCode=eligibility.RuleCode(reason.rule_name),
+            ruleText=eligibility.RuleText(reason.rule_description),  # pyright: ignore[reportArgumentType]
+        )
+        for reason in suitability_reasons(condition)
+    ]
+
+
+def suitability_reasons(condition: Condition) -> list[Reason]:
     if condition.status != Status.not_actionable:
         return []
 
     unique_rule_codes = set()
-    suitability_results = []
+    reasons = []
 
     for cohort_result in condition.cohort_results:
         if cohort_result.status == Status.not_actionable:
             for reason in cohort_result.reasons:
                 if reason.rule_name not in unique_rule_codes and reason.rule_description:
                     unique_rule_codes.add(reason.rule_name)
-                    suitability_results.append(
-                        eligibility.SuitabilityRule(
-                            ruleType=eligibility.RuleType(reason.rule_type.value),
-                            ruleCode=eligibility.RuleCode(reason.rule_name),
-                            ruleText=eligibility.RuleText(reason.rule_description),
-                        )
-                    )
-
-    return suitability_results
+                    reasons.append(reason)
+
+    return reasons
+
+
+def render_eligibility_response(
+    eligibility_status: EligibilityStatus, *, include_suitability_rules: bool = True
+) -> bytes:
+    """The API response body for an evaluation of the person's eligibility - byte for byte as Flask would write the
+    response build_eligibility_response() returns, which remains the reference.
+
+    Building the response models validates every field, only for the models to be dumped straight back out again, and
+    there's nothing to validate in a response built from our own evaluation - so this writes it directly."""
+    response = {
+        "meta": {"lastUpdated": datetime.now(tz=UTC).isoformat()},
+        "processedSuggestions": [
+            render_processed_suggestion(condition, include_suitability_rules=include_suitability_rules)
+            for condition in eligibility_status.conditions
+        ],
+        "responseId": str(uuid.uuid4()),
+    }
+    return dumps(response, sort_keys=True) + b"\n"
+
+
+def render_processed_suggestion(condition: Condition, *, include_suitability_rules: bool) -> dict[str, Any]:
+    suggestion: dict[str, Any] = {
+        "condition": condition.condition_name,
+        "eligibilityCohorts": [
+            {
+                "cohortCode": cohort_result.cohort_code,
+                "cohortStatus": STATUS_MAPPING[cohort_result.status].value,
+                "cohortText": cohort_result.description,
+            }
+            for cohort_result in reported_cohort_results(condition)
+        ],
+        "status": STATUS_MAPPING[condition.status].value,
+        "statusText": f"{condition.status}",
+        "suitabilityRules": [
+            {"ruleCode": reason.rule_name, "ruleText": reason.rule_description, "ruleType": reason.rule_type.value}
+            for reason in (suitability_reasons(condition) if include_suitability_rules else [])
+        ],
+    }
+    if condition.actions is not None and condition.actions.actions is not None:
+        suggestion["actions"] = [
+            {name: value for name, value in vars(action).items() if value is not None}
+            for action in condition.actions.actions
+        ]
+    return suggestion
@@ -8,6 +8,7 @@ from flask import Flask
 from flask.testing import FlaskClient
 
 from eligibility_signposting_api.app import create_app
+from eligibility_signposting_api.model.nhs_number import check_digit
 
 
 @pytest.fixture(scope="session")
@@ -29,7 +30,10 @@ def faker() -> Faker:
 
 class PersonDetailProvider(BaseProvider):
     def nhs_number(self) -> str:
-        return f"5{randint(1, 999999999):09}"
+        while True:
+            digits = f"5{randint(1, 99999999):08}"
+            if (check := check_digit(digits)) is not None:
+                return f"{digits}{check}"
 
     def icb(self) -> str | None:
         if randint(0, 3):
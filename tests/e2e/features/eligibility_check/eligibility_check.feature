@@ -17,8 +17,8 @@ Feature: Eligibility Check API
 
     Examples:
       | nhs_number    |
-      | 50000000001   |
-      | 50000000004   |
+      | 5000000013    |
+      | 5000000048    |
       | 9876543210    |
 
   Scenario Outline: Eligibility check with invalid or missing NHS number returns error
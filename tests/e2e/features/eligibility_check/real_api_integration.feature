@@ -12,5 +12,5 @@ Feature: Full mTLS integration with real Eligibility API
 
     Examples:
       | nhs_number    |
-      | 50000000001   |
-      | 50000000004   |
\ No newline at end of file
+      | 5000000013    |
+      | 5000000048    |
\ No newline at end of file
@@ -26,7 +26,7 @@ def _load_environment_variables(context):
     # API configuration with defaults for testing
     context.base_url = os.getenv("BASE_URL", "http://localhost:8000")
     context.api_key = os.getenv("API_KEY", "test-api-key")
-    context.valid_nhs_number = os.getenv("VALID_NHS_NUMBER", "50000000004")
+    context.valid_nhs_number = os.getenv("VALID_NHS_NUMBER", "5000000048")
     
     # AWS configuration
     context.aws_region = os.getenv("AWS_REGION", "eu-west-2")
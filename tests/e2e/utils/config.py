@@ -12,7 +12,7 @@ BASE_URL = os.getenv("BASE_URL", "https://sandbox.api.service.nhs.uk/eligibility
 API_KEY = os.getenv("API_KEY", "srgedsrgveg")
 
 # Test Data
-VALID_NHS_NUMBER = os.getenv("VALID_NHS_NUMBER", "50000000004")
+VALID_NHS_NUMBER = os.getenv("VALID_NHS_NUMBER", "5000000048")
 INVALID_NHS_NUMBER = os.getenv("INVALID_NHS_NUMBER", "9876543210")
 
 # API Endpoints
@@ -0,0 +1,71 @@
+"""The eligibility check response, as specified in
+https://github.com/NHSDigital/eligibility-signposting-api-specification/blob/main/specification/eligibility-signposting-api.yaml
+as a JSON schema - the e2e tests' schema, with the fields the response models require made required."""
+
+STATUS = {"type": "string", "enum": ["NotEligible", "NotActionable", "Actionable"]}
+
+ELIGIBILITY_RESPONSE_SCHEMA = {
+    "type": "object",
+    "required": ["responseId", "meta", "processedSuggestions"],
+    "additionalProperties": False,
+    "properties": {
+        "responseId": {"type": "string", "format": "uuid"},
+        "meta": {
+            "type": "object",
+            "required": ["lastUpdated"],
+            "additionalProperties": False,
+            "properties": {"lastUpdated": {"type": "string", "format": "date-time"}},
+        },
+        "processedSuggestions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["condition", "status", "statusText", "eligibilityCohorts", "suitabilityRules"],
+                "additionalProperties": False,
+                "properties": {
+                    "condition": {"type": "string"},
+                    "status": STATUS,
+                    "statusText": {"type": "string"},
+                    "eligibilityCohorts": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["cohortCode", "cohortText", "cohortStatus"],
+                            "additionalProperties": False,
+                            "properties": {
+                                "cohortCode": {"type": "string"},
+                                "cohortText": {"type": "string"},
+                                "cohortStatus": STATUS,
+                            },
+                        },
+                    },
+                    "suitabilityRules": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["ruleType", "ruleCode", "ruleText"],
+                            "additionalProperties": False,
+                            "properties": {
+                                "ruleType": {"type": "string", "enum": ["F", "S", "R"]},
+                                "ruleCode": {"type": "string"},
+                                "ruleText": {"type": "string"},
+                            },
+                        },
+                    },
+                    "actions": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "actionType": {"type": "string"},
+                                "actionCode": {"type": "string"},
+                                "description": {"type": "string"},
+                                "urlLink": {"type": "string"},
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
@@ -0,0 +1,63 @@
+import json
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from yarl import URL
+
+Responder = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+
+class StandInAws(ThreadingHTTPServer):
+    """Stands in for a JSON protocol AWS service, such as DynamoDB, answering each request with whatever the responder
+    returns for its operation and body. The responder can sleep to inject latency. Counts the connections made."""
+
+    def __init__(self, responder: Responder) -> None:
+        super().__init__(("127.0.0.1", 0), _StandInAwsHandler)
+        self.responder = responder
+        self.connections: set[tuple[str, int]] = set()
+        self.operations: list[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> URL:
+        return URL(f"http://127.0.0.1:{self.server_address[1]}")
+
+    def record(self, client_address: tuple[str, int], operation: str) -> None:
+        with self._lock:
+            self.connections.add(client_address)
+            self.operations.append(operation)
+
+
+class _StandInAwsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInAws
+
+    def do_POST(self) -> None:  # noqa: N802 - named by http.server
+        operation = self.headers.get("X-Amz-Target", "").rpartition(".")[2]
+        self.server.record(self.client_address, operation)
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+        body = json.dumps(self.server.responder(operation, request)).encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-amz-json-1.0")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@contextmanager
+def stand_in_aws(responder: Responder) -> Iterator[StandInAws]:
+    server = StandInAws(responder)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
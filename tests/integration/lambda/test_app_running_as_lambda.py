@@ -16,6 +16,7 @@ from yarl import URL
 from eligibility_signposting_api.model.eligibility import NHSNumber
 from eligibility_signposting_api.model.rules import CampaignConfig
 from eligibility_signposting_api.repos.campaign_repo import BucketName
+from eligibility_signposting_api.services.audit_encoding import decode_audit_records
 
 logger = logging.getLogger(__name__)
 
@@ -179,8 +180,11 @@ def test_given_nhs_number_in_path_matches_with_nhs_number_in_headers(  # noqa: P
     objects = s3_client.list_objects_v2(Bucket=audit_bucket).get("Contents", [])
     object_keys = [obj["Key"] for obj in objects]
     latest_key = sorted(object_keys)[-1]
-    audit_data = json.loads(s3_client.get_object(Bucket=audit_bucket, Key=latest_key)["Body"].read())
-    assert_that(audit_data, has_entries(test_audit="check if audit works"))
+    audit_records = decode_audit_records(s3_client.get_object(Bucket=audit_bucket, Key=latest_key)["Body"].read())
+    assert_that(
+        list(audit_records),
+        has_item(has_entries(nhsNumber=str(persisted_person), response=has_key("processedSuggestions"))),
+    )
 
 
 def test_given_nhs_number_in_path_does_not_match_with_nhs_number_in_headers_results_in_error_response(
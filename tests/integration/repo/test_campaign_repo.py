@@ -3,10 +3,11 @@ from collections.abc import Generator
 
 import pytest
 from botocore.client import BaseClient
-from hamcrest import assert_that, has_item
+from hamcrest import assert_that, contains_inanyorder, has_item
 
+from eligibility_signposting_api.model.reference_lists import ReferenceListName, ReferenceListRegistry
 from eligibility_signposting_api.model.rules import CampaignConfig
-from eligibility_signposting_api.repos.campaign_repo import BucketName, CampaignRepo
+from eligibility_signposting_api.repos.campaign_repo import REFERENCE_LIST_PREFIX, BucketName, CampaignRepo
 from tests.fixtures.builders.model.rule import CampaignConfigFactory
 from tests.fixtures.matchers.rules import is_campaign_config, is_iteration, is_iteration_rule
 
@@ -50,3 +51,29 @@ def test_get_campaign_config(s3_client: BaseClient, rules_bucket: BucketName, ca
             )
         ),
     )
+
+
+@pytest.fixture
+def reference_list(s3_client: BaseClient, rules_bucket: BucketName) -> Generator[ReferenceListName]:
+    name = ReferenceListName("gp_practices")
+    key = f"{REFERENCE_LIST_PREFIX}{name}.json"
+    s3_client.put_object(
+        Bucket=rules_bucket, Key=key, Body=json.dumps(["A12345", "B23456"]), ContentType="application/json"
+    )
+    yield name
+    s3_client.delete_object(Bucket=rules_bucket, Key=key)
+    ReferenceListRegistry.registry.pop(name, None)
+
+
+def test_reference_lists_loaded_alongside_campaign_configs(
+    s3_client: BaseClient, rules_bucket: BucketName, campaign_config: CampaignConfig, reference_list: ReferenceListName
+):
+    # Given
+    repo = CampaignRepo(s3_client, rules_bucket)
+
+    # When
+    actual = list(repo.get_campaign_configs())
+
+    # Then
+    assert_that(actual, has_item(is_campaign_config().with_id(campaign_config.id)))
+    assert_that(ReferenceListRegistry.get(reference_list), contains_inanyorder("A12345", "B23456"))
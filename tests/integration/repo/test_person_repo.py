@@ -1,17 +1,18 @@
 from typing import Any
 
 import pytest
+from botocore.client import BaseClient
 from faker import Faker
-from hamcrest import assert_that, contains_inanyorder, has_entries
+from hamcrest import anything, assert_that, contains_inanyorder, has_entries, has_key, not_, only_contains
 
 from eligibility_signposting_api.model.eligibility import NHSNumber
 from eligibility_signposting_api.repos import NotFoundError
-from eligibility_signposting_api.repos.person_repo import PersonRepo
+from eligibility_signposting_api.repos.person_repo import FetchPlan, PersonRepo
 
 
-def test_person_found(person_table: Any, persisted_person: NHSNumber):
+def test_person_found(person_table: Any, dynamodb_client: BaseClient, persisted_person: NHSNumber):
     # Given
-    repo = PersonRepo(person_table)
+    repo = PersonRepo(person_table, dynamodb_client)
 
     # When
     actual = repo.get_eligibility_data(persisted_person)
@@ -28,10 +29,46 @@ def test_person_found(person_table: Any, persisted_person: NHSNumber):
     )
 
 
-def test_person_not_found(person_table: Any, faker: Faker):
+def test_person_found_with_fetch_plan(person_table: Any, dynamodb_client: BaseClient, persisted_person: NHSNumber):
+    # Given
+    repo = PersonRepo(person_table, dynamodb_client)
+    fetch_plan = FetchPlan(frozenset({("PERSON", "DATE_OF_BIRTH"), ("COHORTS", "COHORT_MAP")}))
+
+    # When
+    actual = repo.get_eligibility_data(persisted_person, fetch_plan)
+
+    # Then
+    assert_that(
+        actual,
+        contains_inanyorder(
+            has_entries({"NHS_NUMBER": persisted_person, "ATTRIBUTE_TYPE": "PERSON", "DATE_OF_BIRTH": anything()}),
+            has_entries({"NHS_NUMBER": persisted_person, "ATTRIBUTE_TYPE": "COHORTS", "COHORT_MAP": anything()}),
+            has_entries({"NHS_NUMBER": persisted_person, "ATTRIBUTE_TYPE": "COVID"}),
+            has_entries({"NHS_NUMBER": persisted_person, "ATTRIBUTE_TYPE": "RSV"}),
+        ),
+    )
+    assert_that(actual, only_contains(not_(has_key("POSTCODE"))))
+
+
+def test_person_found_with_low_level_client(
+    person_table: Any, dynamodb_client: BaseClient, persisted_person: NHSNumber
+):
+    # Given
+    repo = PersonRepo(person_table, dynamodb_client, low_level_client=True)
+
+    # When
+    actual = repo.get_eligibility_data(persisted_person)
+
+    # Then
+    assert_that(
+        actual, contains_inanyorder(*PersonRepo(person_table, dynamodb_client).get_eligibility_data(persisted_person))
+    )
+
+
+def test_person_not_found(person_table: Any, dynamodb_client: BaseClient, faker: Faker):
     # Given
     nhs_number = NHSNumber(faker.nhs_number())
-    repo = PersonRepo(person_table)
+    repo = PersonRepo(person_table, dynamodb_client)
 
     # When, Then
     with pytest.raises(NotFoundError):
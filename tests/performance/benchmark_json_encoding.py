@@ -0,0 +1,49 @@
+"""Compare writing realistic responses and audit records as JSON with the standard library's json, as the
+app did, against dumps(), with each backend.
+
+Run with: python -m tests.performance.benchmark_json_encoding
+"""
+
+import json
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from flask import Flask
+
+from eligibility_signposting_api.json_encoding import JsonBackend, dumps
+from eligibility_signposting_api.model.eligibility import NHSNumber
+from eligibility_signposting_api.services.audit_record import EligibilityAuditRecord
+from eligibility_signposting_api.views.eligibility import build_eligibility_response
+from tests.fixtures.builders.model.eligibility import EligibilityStatusFactory
+
+RECORDS = 1000
+REPEATS = 5
+
+
+def main() -> None:
+    statuses = [EligibilityStatusFactory.build() for _ in range(RECORDS)]
+    with Flask(__name__).app_context():
+        responses = [
+            build_eligibility_response(status).model_dump(by_alias=True, mode="json", exclude_none=True)
+            for status in statuses
+        ]
+    bodies = [dumps(response, sort_keys=True) for response in responses]
+    audit_records = [
+        EligibilityAuditRecord(NHSNumber("9434765919"), status, body, include_actions=True)
+        for status, body in zip(statuses, bodies, strict=True)
+    ]
+
+    def time(name: str, fn: Callable[[Any], Any], items: list[Any]) -> None:
+        elapsed = min(timeit.repeat(lambda: [fn(item) for item in items], number=1, repeat=REPEATS))
+        print(f"{name:32}: {elapsed * 1000:8.2f}ms for {RECORDS}")
+
+    time("responses, json", lambda r: json.dumps(r, sort_keys=True, separators=(",", ":")), responses)
+    for backend in JsonBackend:
+        time(f"responses, dumps {backend}", lambda r, b=backend: dumps(r, sort_keys=True, backend=b), responses)
+
+    time("audit records", EligibilityAuditRecord.encode, audit_records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Compare deserialising realistic person items with boto3's TypeDeserializer, as the table resource does, against the
+low-level client path's deserialiser.
+
+Run with: python -m tests.performance.benchmark_person_deserialiser
+"""
+
+import timeit
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from eligibility_signposting_api.repos.deserialiser import deserialise_item
+from tests.fixtures.builders.repos.person import person_rows_builder
+
+PEOPLE = 1000
+REPEATS = 5
+
+
+def main() -> None:
+    serialiser, deserialiser = TypeSerializer(), TypeDeserializer()
+    people = [
+        [
+            {name: serialiser.serialize(value) for name, value in row.items()}
+            for row in person_rows_builder(str(9000000000 + i), cohorts=["rsv_75_rolling", "rsv_75to79_2024"])
+        ]
+        for i in range(PEOPLE)
+    ]
+
+    resource_time = min(
+        timeit.repeat(
+            lambda: [
+                [{name: deserialiser.deserialize(value) for name, value in item.items()} for item in items]
+                for items in people
+            ],
+            number=1,
+            repeat=REPEATS,
+        )
+    )
+    client_time = min(
+        timeit.repeat(
+            lambda: [[deserialise_item(item) for item in items] for items in people], number=1, repeat=REPEATS
+        )
+    )
+    print(f"TypeDeserializer: {resource_time * 1000:8.2f}ms for {PEOPLE} people")
+    print(f"deserialise_item: {client_time * 1000:8.2f}ms for {PEOPLE} people")
+
+
+if __name__ == "__main__":
+    main()
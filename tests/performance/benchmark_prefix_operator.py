@@ -0,0 +1,53 @@
+"""Compare matching a postcode against many prefixes with one starts_with rule per prefix, as campaign configs do
+today, against a single starts_with_any rule.
+
+Run with: python -m tests.performance.benchmark_prefix_operator
+"""
+
+import random
+import string
+import timeit
+
+from eligibility_signposting_api.model.rules import RuleOperator
+from eligibility_signposting_api.services.rules.operators import OperatorRegistry
+
+PREFIX_COUNTS = (10, 100, 1000)
+POSTCODES = 1000
+REPEATS = 5
+
+
+def random_prefix(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_uppercase, k=2)) + str(rng.randint(1, 99))
+
+
+def main() -> None:
+    rng = random.Random(42)
+    postcodes = [random_prefix(rng) + " " + str(rng.randint(1, 9)) + "AB" for _ in range(POSTCODES)]
+
+    for prefix_count in PREFIX_COUNTS:
+        prefixes = sorted({random_prefix(rng) for _ in range(prefix_count)})
+        per_rule = [OperatorRegistry.get(RuleOperator.starts_with)(rule_value=prefix) for prefix in prefixes]
+        combined = OperatorRegistry.get(RuleOperator.starts_with_any)(rule_value=",".join(prefixes))
+
+        per_rule_time = min(
+            timeit.repeat(
+                lambda: [any(op.matches(postcode) for op in per_rule) for postcode in postcodes],  # noqa: B023
+                number=1,
+                repeat=REPEATS,
+            )
+        )
+        combined_time = min(
+            timeit.repeat(
+                lambda: [combined.matches(postcode) for postcode in postcodes],  # noqa: B023
+                number=1,
+                repeat=REPEATS,
+            )
+        )
+        print(
+            f"{prefix_count:>5} prefixes: starts_with rules {per_rule_time * 1000:8.2f}ms, "
+            f"starts_with_any {combined_time * 1000:8.2f}ms for {POSTCODES} postcodes"
+        )
+
+
+if __name__ == "__main__":
+    main()
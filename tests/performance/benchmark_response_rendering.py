@@ -0,0 +1,47 @@
+"""Compare writing responses by building, then dumping, the pydantic response models, as the app did, against
+rendering them directly from the evaluation.
+
+Run with: python -m tests.performance.benchmark_response_rendering
+"""
+
+import timeit
+
+from flask import Flask
+
+from eligibility_signposting_api.json_encoding import FastJSONProvider
+from eligibility_signposting_api.views.eligibility import build_eligibility_response, render_eligibility_response
+from tests.fixtures.builders.model.eligibility import EligibilityStatusFactory
+
+RESPONSES = 1000
+REPEATS = 5
+
+
+def main() -> None:
+    statuses = [EligibilityStatusFactory.build() for _ in range(RESPONSES)]
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+
+    with app.app_context():
+        model_time = min(
+            timeit.repeat(
+                lambda: [
+                    app.json.response(
+                        build_eligibility_response(status).model_dump(by_alias=True, mode="json", exclude_none=True)
+                    ).get_data()
+                    for status in statuses
+                ],
+                number=1,
+                repeat=REPEATS,
+            )
+        )
+        render_time = min(
+            timeit.repeat(
+                lambda: [render_eligibility_response(status) for status in statuses], number=1, repeat=REPEATS
+            )
+        )
+    print(f"response models: {model_time * 1000:8.2f}ms for {RESPONSES} responses")
+    print(f"rendered:        {render_time * 1000:8.2f}ms for {RESPONSES} responses")
+
+
+if __name__ == "__main__":
+    main()
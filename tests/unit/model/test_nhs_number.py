@@ -0,0 +1,41 @@
+import pytest
+from faker import Faker
+from hamcrest import assert_that, equal_to, is_
+
+from eligibility_signposting_api.model.nhs_number import check_digit, is_valid_nhs_number
+
+
+@pytest.mark.parametrize(
+    ("nhs_number", "expected"),
+    [
+        ("9434765919", True),
+        ("9876543210", True),
+        ("4010232137", True),
+        ("9434765918", False),
+        ("943476591", False),
+        ("94347659190", False),
+        ("943476591X", False),
+        ("943 476 5919", False),
+        ("\uff19\uff14\uff13\uff14\uff17\uff16\uff15\uff19\uff11\uff19", False),  # Full width digits
+        ("", False),
+    ],
+)
+def test_is_valid_nhs_number(nhs_number: str, *, expected: bool):
+    assert_that(is_valid_nhs_number(nhs_number), is_(expected))
+
+
+@pytest.mark.parametrize(
+    ("digits", "expected"),
+    [
+        ("943476591", 9),
+        ("987654321", 0),
+        ("123456789", None),
+    ],
+)
+def test_check_digit(digits: str, expected: int | None):
+    assert_that(check_digit(digits), equal_to(expected))
+
+
+def test_fake_nhs_numbers_are_valid(faker: Faker):
+    for _ in range(100):
+        assert_that(is_valid_nhs_number(faker.nhs_number()), is_(True))
@@ -0,0 +1,53 @@
+import pytest
+from hamcrest import assert_that, equal_to, is_
+
+from eligibility_signposting_api.model.patterns import UnsafePatternError, compile_pattern
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["^[A-Z]{1,2}\\d", "(ab)+", "(a{1,3})+", "a*b*c*", "(?:a++)+", "(?>a+)+", "^(\\d{3}-)*\\d{4}$"],
+)
+def test_safe_patterns_compiled(pattern: str):
+    # Given
+
+    # When
+    actual = compile_pattern(pattern)
+
+    # Then
+    assert_that(actual.pattern, is_(equal_to(pattern)))
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "(a+)+",
+        "(a*)*",
+        "((ab)*c)+",
+        "(a|b+)*",
+        "(?=(a+)+)",
+        "(x+x+)+y",
+        "(?>(a+)+c)",
+        "(?>a|(b+)*)",
+        "((a+)+)++",
+        "(a",
+        "a" * 1001,
+    ],
+)
+def test_unsafe_patterns_rejected(pattern: str):
+    # Given
+
+    # When, Then
+    with pytest.raises(UnsafePatternError):
+        compile_pattern(pattern)
+
+
+def test_compiled_patterns_shared():
+    # Given
+    first = compile_pattern("^AB\\d+")
+
+    # When
+    second = compile_pattern("^AB\\d+")
+
+    # Then
+    assert_that(second, is_(first))
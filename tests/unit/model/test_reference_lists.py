@@ -0,0 +1,35 @@
+import pytest
+from hamcrest import assert_that, contains_inanyorder, equal_to, is_
+
+from eligibility_signposting_api.model.reference_lists import (
+    ReferenceList,
+    ReferenceListName,
+    ReferenceListRegistry,
+    UnknownReferenceListError,
+)
+
+
+@pytest.mark.parametrize("large_list_threshold", [100, 1], ids=["set", "sorted"])
+def test_reference_list_membership(large_list_threshold: int):
+    # Given
+    reference_list = ReferenceList(
+        ReferenceListName("postcodes"), ["LS1", "HP1", "LS1", "SW19"], large_list_threshold=large_list_threshold
+    )
+
+    # When, Then
+    assert_that(reference_list.is_large, is_(equal_to(large_list_threshold == 1)))
+    assert_that(len(reference_list), is_(equal_to(3)))
+    assert_that(reference_list, contains_inanyorder("LS1", "HP1", "SW19"))
+    assert_that("HP1" in reference_list, is_(True))
+    assert_that("ZZ9" in reference_list, is_(False))
+    assert_that("A" in reference_list, is_(False))
+    assert_that(None in reference_list, is_(False))
+
+
+def test_unknown_reference_list():
+    # Given
+    name = ReferenceListName("never_loaded")
+
+    # When, Then
+    with pytest.raises(UnknownReferenceListError, match="never_loaded"):
+        ReferenceListRegistry.get(name)
@@ -5,8 +5,8 @@ from dateutil.relativedelta import relativedelta
 from faker import Faker
 from hamcrest import assert_that
 
-from eligibility_signposting_api.model.rules import IterationRule
-from tests.fixtures.builders.model.rule import IterationFactory, RawCampaignConfigFactory
+from eligibility_signposting_api.model.rules import IterationRule, RuleOperator
+from tests.fixtures.builders.model.rule import IterationFactory, IterationRuleFactory, RawCampaignConfigFactory
 from tests.fixtures.matchers.rules import is_iteration_rule
 
 
@@ -92,3 +92,22 @@ def test_iteration_rule_deserialisation(rule_stop: str, expected):
 
     # Then
     assert_that(actual, is_iteration_rule().with_rule_stop(expected))
+
+
+@pytest.mark.parametrize("pattern", ["(a+)+$", "^(\\d*,?)*X", "[[NVL:a]]("])
+def test_iteration_rule_with_unsafe_pattern_not_allowed(pattern: str):
+    # Given
+
+    # When, Then
+    with pytest.raises(ValueError, match=r"1 validation error for IterationRule\n.*pattern"):
+        IterationRuleFactory.build(operator=RuleOperator.matches, comparator=pattern)
+
+
+def test_iteration_rule_with_safe_pattern_allowed():
+    # Given
+
+    # When
+    actual = IterationRuleFactory.build(operator=RuleOperator.not_matches, comparator="^LS\\d+$[[NVL:LS1]]")
+
+    # Then
+    assert_that(actual, is_iteration_rule().with_comparator("^LS\\d+$[[NVL:LS1]]"))
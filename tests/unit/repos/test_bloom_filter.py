@@ -0,0 +1,62 @@
+import pytest
+from hamcrest import assert_that, close_to, equal_to, has_properties, is_, less_than
+
+from eligibility_signposting_api.repos.bloom_filter import BloomFilter, BloomFilterFormatError
+
+MEMBERS = [f"5{n:09}" for n in range(10_000)]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    # Given
+    bloom_filter = BloomFilter.of(MEMBERS, 0.01)
+
+    # When
+    actual = [member for member in MEMBERS if member not in bloom_filter]
+
+    # Then
+    assert_that(actual, is_(equal_to([])))
+
+
+def test_bloom_filter_false_positive_rate():
+    # Given
+    bloom_filter = BloomFilter.of(MEMBERS, 0.01)
+    non_members = [f"6{n:09}" for n in range(10_000)]
+
+    # When
+    false_positives = sum(1 for non_member in non_members if non_member in bloom_filter)
+
+    # Then
+    assert_that(false_positives / len(non_members), is_(close_to(0.01, 0.005)))
+
+
+def test_bloom_filter_sized_for_capacity():
+    # When
+    actual = BloomFilter.for_capacity(1_000_000, 0.01)
+
+    # Then
+    assert_that(actual, has_properties(bit_count=9_585_059, hash_count=7))
+    assert_that(len(actual.bits), is_(less_than(1_200_000)))
+
+
+def test_bloom_filter_round_trips():
+    # Given
+    bloom_filter = BloomFilter.of(MEMBERS, 0.001)
+
+    # When
+    actual = BloomFilter.from_bytes(bloom_filter.to_bytes())
+
+    # Then
+    assert_that(actual, has_properties(bit_count=bloom_filter.bit_count, hash_count=bloom_filter.hash_count))
+    assert_that(actual.bits, is_(equal_to(bloom_filter.bits)))
+    assert_that(all(member in actual for member in MEMBERS), is_(True))
+
+
+@pytest.mark.parametrize("data", [b"", b"\x02rubbish", BloomFilter(64, 3).to_bytes()[:-1]])
+def test_bloom_filter_rejects_unknown_format(data: bytes):
+    with pytest.raises(BloomFilterFormatError):
+        BloomFilter.from_bytes(data)
+
+
+def test_bloom_filter_rejects_invalid_false_positive_rate():
+    with pytest.raises(ValueError, match="false positive rate"):
+        BloomFilter.for_capacity(100, 1.5)
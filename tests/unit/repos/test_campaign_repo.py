@@ -0,0 +1,55 @@
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+from hamcrest import assert_that, contains_exactly, equal_to, has_properties
+
+from eligibility_signposting_api.circuit_breaker import CircuitBreaker, CircuitBreakerSettings, CircuitOpenError
+from eligibility_signposting_api.model.rules import CampaignConfig
+from eligibility_signposting_api.repos.campaign_repo import BucketName, CampaignRepo
+from tests.fixtures.builders.model.rule import CampaignConfigFactory
+
+UNAVAILABLE = ClientError({"Error": {"Code": "ServiceUnavailable", "Message": "unavailable"}}, "ListObjects")
+
+
+def s3_client_with(campaign_config: CampaignConfig) -> MagicMock:
+    s3_client = MagicMock()
+    s3_client.list_objects.return_value = {"Contents": [{"Key": f"{campaign_config.name}.json"}]}
+    body = json.dumps({"CampaignConfig": campaign_config.model_dump(by_alias=True, mode="json")}).encode()
+    s3_client.get_object.side_effect = lambda **_: {"Body": io.BytesIO(body)}
+    return s3_client
+
+
+def test_campaign_configs_last_read_served_while_circuit_open():
+    # Given
+    campaign_config: CampaignConfig = CampaignConfigFactory.build()
+    s3_client = s3_client_with(campaign_config)
+    circuit_breaker = CircuitBreaker("s3", CircuitBreakerSettings(window=2))
+    repo = CampaignRepo(s3_client, BucketName("rules"), circuit_breaker)
+    list(repo.get_campaign_configs())
+
+    s3_client.list_objects.side_effect = UNAVAILABLE
+    with pytest.raises(ClientError):
+        list(repo.get_campaign_configs())
+
+    # When
+    actual = list(repo.get_campaign_configs())
+
+    # Then
+    assert_that(actual, contains_exactly(has_properties(id=campaign_config.id, name=campaign_config.name)))
+    assert_that(s3_client.list_objects.call_count, equal_to(2))
+
+
+def test_open_circuit_with_no_campaign_configs_read_fails_fast():
+    # Given
+    s3_client = MagicMock()
+    s3_client.list_objects.side_effect = UNAVAILABLE
+    repo = CampaignRepo(s3_client, BucketName("rules"), CircuitBreaker("s3", CircuitBreakerSettings(window=1)))
+    with pytest.raises(ClientError):
+        list(repo.get_campaign_configs())
+
+    # When, Then
+    with pytest.raises(CircuitOpenError):
+        list(repo.get_campaign_configs())
@@ -0,0 +1,62 @@
+import json
+import zlib
+from decimal import Decimal
+
+import pytest
+from hamcrest import assert_that, contains_exactly, equal_to, has_entries, instance_of, is_, less_than
+
+from eligibility_signposting_api.repos.compact import CompactFormatError, decode_rows, encode_rows
+from tests.fixtures.builders.repos.person import person_rows_builder
+
+
+def test_rows_round_trip():
+    # Given
+    rows = person_rows_builder("1234567890")
+
+    # When
+    encoded = encode_rows(rows)
+
+    # Then
+    assert_that(decode_rows(encoded), is_(equal_to(rows)))
+    assert_that(len(encoded), is_(less_than(len(str(rows)))))
+
+
+@pytest.mark.parametrize("encoded", [b"", b"\x00rows"])
+def test_unknown_format_rejected(encoded: bytes):
+    # Given
+
+    # When, Then
+    with pytest.raises(CompactFormatError):
+        decode_rows(encoded)
+
+
+def test_numbers_and_sets_round_trip():
+    # Given
+    rows = [{"NHS_NUMBER": "1234567890", "COUNT": Decimal(3), "RATIO": Decimal("0.5"), "CODES": {"B", "A"}}]
+
+    # When
+    actual = decode_rows(encode_rows(rows))
+
+    # Then
+    assert_that(actual, contains_exactly(has_entries(COUNT=3, RATIO=0.5, CODES={"A", "B"})))
+    assert_that(actual[0]["COUNT"], is_(instance_of(int)))
+
+
+def test_unencodable_value_rejected():
+    # Given
+    rows = [{"NHS_NUMBER": "1234567890", "WHEN": object()}]
+
+    # When, Then
+    with pytest.raises(TypeError, match="compact item"):
+        encode_rows(rows)
+
+
+def test_legacy_format_read():
+    # Given
+    encoded = b"\x01" + zlib.compress(json.dumps([{"NHS_NUMBER": "1234567890", "COUNT": "3"}]).encode())
+
+    # When
+    actual = decode_rows(encoded)
+
+    # Then
+    assert_that(actual, contains_exactly({"NHS_NUMBER": "1234567890", "COUNT": "3"}))
@@ -0,0 +1,62 @@
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from hamcrest import assert_that, equal_to, is_
+
+from eligibility_signposting_api.repos.deserialiser import deserialise_item
+from tests.fixtures.builders.repos.person import person_rows_builder
+
+
+def test_person_items_deserialised_as_boto3_would():
+    # Given
+    rows = person_rows_builder("1234567890")
+    serialiser, deserialiser = TypeSerializer(), TypeDeserializer()
+    wire_items = [{k: serialiser.serialize(v) for k, v in row.items()} for row in rows]
+
+    # When
+    actual = [deserialise_item(item) for item in wire_items]
+
+    # Then
+    expected = [{k: deserialiser.deserialize(v) for k, v in item.items()} for item in wire_items]
+    assert_that(actual, is_(equal_to(expected)))
+
+
+def test_all_attribute_types_deserialised_without_decimals():
+    # Given
+    item = {
+        "string": {"S": "a"},
+        "int": {"N": "42"},
+        "float": {"N": "1.5"},
+        "bool": {"BOOL": False},
+        "null": {"NULL": True},
+        "map": {"M": {"nested": {"L": [{"S": "b"}, {"N": "-1"}]}}},
+        "string_set": {"SS": ["c", "d"]},
+        "number_set": {"NS": ["1", "2.5"]},
+        "binary": {"B": b"e"},
+        "binary_set": {"BS": [b"f"]},
+    }
+
+    # When
+    actual = deserialise_item(item)
+
+    # Then
+    assert_that(
+        actual,
+        is_(
+            equal_to(
+                {
+                    "string": "a",
+                    "int": 42,
+                    "float": 1.5,
+                    "bool": False,
+                    "null": None,
+                    "map": {"nested": ["b", -1]},
+                    "string_set": {"c", "d"},
+                    "number_set": {1, 2.5},
+                    "binary": b"e",
+                    "binary_set": {b"f"},
+                }
+            )
+        ),
+    )
+    assert_that(any(isinstance(v, Decimal) for v in actual.values()), is_(False))
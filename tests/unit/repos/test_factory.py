@@ -4,13 +4,20 @@ import pytest
 from boto3 import Session
 from boto3.resources.base import ServiceResource
 from botocore.client import BaseClient
+from botocore.config import Config
 from yarl import URL
 
 from eligibility_signposting_api.repos.factory import (
+    botocore_config_factory,
+    dynamodb_client_factory,
+    dynamodb_config_factory,
     dynamodb_resource_factory,
     firehose_client_factory,
+    firehose_config_factory,
+    s3_config_factory,
     s3_service_factory,
 )
+from tests.fixtures.stand_ins import stand_in_aws
 
 
 @pytest.fixture
@@ -18,64 +25,120 @@ def mock_session() -> Session:
     return MagicMock(spec=Session)
 
 
-def test_dynamodb_resource_factory_with_endpoint(mock_session: Session):
+@pytest.fixture
+def client_config() -> Config:
+    return Config(connect_timeout=1, read_timeout=2)
+
+
+def test_dynamodb_resource_factory_with_endpoint(mock_session: Session, client_config: Config):
     mock_resource = MagicMock(spec=ServiceResource)
     mock_session.resource = MagicMock(return_value=mock_resource)
     endpoint = URL("http://localhost:4566")
 
-    result = dynamodb_resource_factory(mock_session, endpoint)
+    result = dynamodb_resource_factory(mock_session, endpoint, client_config)
 
-    mock_session.resource.assert_called_once_with("dynamodb", endpoint_url="http://localhost:4566")
+    mock_session.resource.assert_called_once_with(
+        "dynamodb", endpoint_url="http://localhost:4566", config=client_config
+    )
     assert result is mock_resource
 
 
-def test_dynamodb_resource_factory_without_endpoint(mock_session):
+def test_dynamodb_resource_factory_without_endpoint(mock_session, client_config: Config):
     mock_resource = MagicMock(spec=ServiceResource)
     mock_session.resource = MagicMock(return_value=mock_resource)
 
-    result = dynamodb_resource_factory(mock_session, None)
+    result = dynamodb_resource_factory(mock_session, None, client_config)
 
-    mock_session.resource.assert_called_once_with("dynamodb", endpoint_url=None)
+    mock_session.resource.assert_called_once_with("dynamodb", endpoint_url=None, config=client_config)
     assert result is mock_resource
 
 
-def test_s3_service_factory_with_endpoint(mock_session):
+def test_dynamodb_client_factory_with_endpoint(mock_session: Session, client_config: Config):
+    mock_client = MagicMock(spec=BaseClient)
+    mock_session.client = MagicMock(return_value=mock_client)
+    endpoint = URL("http://localhost:4566")
+
+    result = dynamodb_client_factory(mock_session, endpoint, client_config)
+
+    mock_session.client.assert_called_once_with("dynamodb", endpoint_url="http://localhost:4566", config=client_config)
+    assert result is mock_client
+
+
+def test_s3_service_factory_with_endpoint(mock_session, client_config: Config):
     mock_client = MagicMock(spec=BaseClient)
     mock_session.client = MagicMock(return_value=mock_client)
     endpoint = URL("http://localhost:4566")
 
-    result = s3_service_factory(mock_session, endpoint)
+    result = s3_service_factory(mock_session, endpoint, client_config)
 
-    mock_session.client.assert_called_once_with("s3", endpoint_url="http://localhost:4566")
+    mock_session.client.assert_called_once_with("s3", endpoint_url="http://localhost:4566", config=client_config)
     assert result is mock_client
 
 
-def test_s3_service_factory_without_endpoint(mock_session):
+def test_s3_service_factory_without_endpoint(mock_session, client_config: Config):
     mock_client = MagicMock(spec=BaseClient)
     mock_session.client = MagicMock(return_value=mock_client)
 
-    result = s3_service_factory(mock_session, None)
+    result = s3_service_factory(mock_session, None, client_config)
 
-    mock_session.client.assert_called_once_with("s3", endpoint_url=None)
+    mock_session.client.assert_called_once_with("s3", endpoint_url=None, config=client_config)
     assert result is mock_client
 
 
-def test_firehose_service_factory_with_endpoint(mock_session):
+def test_firehose_service_factory_with_endpoint(mock_session, client_config: Config):
     mock_client = MagicMock(spec=BaseClient)
     mock_session.client = MagicMock(return_value=mock_client)
     endpoint = URL("http://localhost:4566")
 
-    result = firehose_client_factory(mock_session, endpoint)
+    result = firehose_client_factory(mock_session, endpoint, client_config)
 
-    mock_session.client.assert_called_once_with("firehose", endpoint_url="http://localhost:4566")
+    mock_session.client.assert_called_once_with("firehose", endpoint_url="http://localhost:4566", config=client_config)
     assert result is mock_client
 
 
-def test_firehose_service_factory_without_endpoint(mock_session):
+def test_firehose_service_factory_without_endpoint(mock_session, client_config: Config):
     mock_client = MagicMock(spec=BaseClient)
     mock_session.client = MagicMock(return_value=mock_client)
 
-    result = firehose_client_factory(mock_session, None)
+    result = firehose_client_factory(mock_session, None, client_config)
 
-    mock_session.client.assert_called_once_with("firehose", endpoint_url=None)
+    mock_session.client.assert_called_once_with("firehose", endpoint_url=None, config=client_config)
     assert result is mock_client
+
+
+def test_botocore_config_factory():
+    result = botocore_config_factory(max_pool_connections=20, tcp_keepalive=True, retry_mode="adaptive", max_attempts=4)
+
+    assert result.max_pool_connections == 20  # noqa: PLR2004
+    assert result.tcp_keepalive is True
+    assert result.retries == {"mode": "adaptive", "total_max_attempts": 4}
+
+
+def test_service_configs_add_timeouts_to_shared_config():
+    shared = botocore_config_factory(max_pool_connections=20, tcp_keepalive=True, retry_mode="standard", max_attempts=2)
+
+    for factory in (dynamodb_config_factory, s3_config_factory, firehose_config_factory):
+        result = factory(shared, connect_timeout=0.5, read_timeout=1.5)
+
+        assert result.connect_timeout == pytest.approx(0.5)
+        assert result.read_timeout == pytest.approx(1.5)
+        assert result.max_pool_connections == 20  # noqa: PLR2004
+        assert result.retries == {"mode": "standard", "total_max_attempts": 2}
+
+
+def test_dynamodb_client_reuses_connections():
+    # Given
+    session = Session(aws_access_key_id="dummy_key", aws_secret_access_key="dummy_secret", region_name="eu-west-1")
+    shared = botocore_config_factory(max_pool_connections=10, tcp_keepalive=True, retry_mode="adaptive", max_attempts=3)
+    with stand_in_aws(lambda *_: {"TableNames": []}) as stand_in_dynamodb:
+        client = dynamodb_client_factory(
+            session, stand_in_dynamodb.url, dynamodb_config_factory(shared, connect_timeout=1, read_timeout=2)
+        )
+
+        # When
+        for _ in range(5):
+            client.list_tables()
+
+    # Then
+    assert stand_in_dynamodb.operations == ["ListTables"] * 5
+    assert len(stand_in_dynamodb.connections) == 1
@@ -0,0 +1,170 @@
+import itertools
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from boto3 import Session
+from hamcrest import assert_that, contains_exactly, has_entries, has_length, has_properties, is_, less_than, none
+
+from eligibility_signposting_api.deadline import DeadlineExceededError, deadline
+from eligibility_signposting_api.model.eligibility import NHSNumber
+from eligibility_signposting_api.repos.hedging import HEDGE_POOL_SIZE, MIN_LATENCY_SAMPLES, Hedger
+from eligibility_signposting_api.repos.person_repo import PersonRepo
+from tests.fixtures.stand_ins import stand_in_aws
+
+NHS_NUMBER = NHSNumber("9434765919")
+
+
+def primed(hedger: Hedger) -> Hedger:
+    """Give the hedger enough quick reads to work out its delay."""
+    for _ in range(MIN_LATENCY_SAMPLES):
+        hedger.read(lambda: None)
+    return hedger
+
+
+def test_hedging_disabled_reads_once():
+    # Given
+    read = MagicMock(return_value="result")
+    hedger = Hedger()
+
+    # When
+    actual = hedger.read(read)
+
+    # Then
+    assert_that(actual, is_("result"))
+    read.assert_called_once_with()
+    assert_that(hedger.stats, has_properties(reads=0, hedges=0))
+
+
+def test_no_hedging_until_latencies_known():
+    # Given
+    hedger = Hedger(percentile=90)
+
+    # When
+    for _ in range(MIN_LATENCY_SAMPLES):
+        hedger.read(lambda: None)
+
+    # Then
+    assert_that(hedger.delay(), is_(less_than(0.1)))
+    assert_that(hedger.stats, has_properties(reads=MIN_LATENCY_SAMPLES, hedges=0))
+
+
+def test_slow_read_hedged_and_hedge_wins():
+    # Given
+    hedger = primed(Hedger(percentile=90, max_rate=0.5))
+    unblock = threading.Event()
+    calls = itertools.count()
+
+    def read() -> str:
+        if next(calls) == 0:
+            unblock.wait(timeout=5)
+            return "slow"
+        return "fast"
+
+    # When
+    actual = hedger.read(read)
+    unblock.set()
+
+    # Then
+    assert_that(actual, is_("fast"))
+    assert_that(hedger.stats, has_properties(hedges=1, hedges_won=1))
+
+
+def test_read_not_held_up_by_busy_hedge_pool():
+    # Given
+    hedger = primed(Hedger(percentile=90, max_rate=0.5))
+    unblock = threading.Event()
+    executor = hedger._executor  # noqa: SLF001 - to keep every pool thread busy
+    assert executor is not None
+    busy = [executor.submit(unblock.wait, 5) for _ in range(HEDGE_POOL_SIZE)]
+
+    # When
+    actual = hedger.read(lambda: "result")
+    unblock.set()
+
+    # Then
+    assert_that(actual, is_("result"))
+    assert_that(hedger.stats, has_properties(hedges=0))
+    assert_that(all(future.result() for future in busy), is_(True))
+
+
+def test_hedge_rate_capped():
+    # Given
+    hedger = primed(Hedger(percentile=90, max_rate=0.01, min_delay=0.01))
+
+    # When
+    for _ in range(3):
+        hedger.read(lambda: time.sleep(0.05))
+
+    # Then
+    assert_that(hedger.stats, has_properties(reads=MIN_LATENCY_SAMPLES + 3, hedges=0))
+
+
+def test_failed_read_falls_back_on_hedge():
+    # Given
+    hedger = primed(Hedger(percentile=90, max_rate=0.5, min_delay=0.01))
+    calls = itertools.count()
+
+    def read() -> str:
+        if next(calls) == 0:
+            time.sleep(0.05)
+            msg = "throttled"
+            raise RuntimeError(msg)
+        time.sleep(0.1)
+        return "hedge"
+
+    # When
+    actual = hedger.read(read)
+
+    # Then
+    assert_that(actual, is_("hedge"))
+
+
+def test_hedged_read_bounded_by_deadline():
+    # Given
+    hedger = primed(Hedger(percentile=90, max_rate=0.5))
+    unblock = threading.Event()
+
+    # When
+    with deadline(0.1), pytest.raises(DeadlineExceededError):
+        hedger.read(lambda: unblock.wait(timeout=5))
+    unblock.set()
+
+
+def test_person_repo_hedges_slow_query_against_stand_in_dynamodb():
+    # Given
+    queries = itertools.count()
+    slow_query = MIN_LATENCY_SAMPLES
+
+    def respond(operation: str, _: dict[str, Any]) -> dict[str, Any]:
+        assert operation == "Query"
+        if next(queries) == slow_query:
+            time.sleep(1)
+        return {"Items": [{"NHS_NUMBER": {"S": NHS_NUMBER}, "ATTRIBUTE_TYPE": {"S": "PERSON"}}], "Count": 1}
+
+    session = Session(aws_access_key_id="dummy", aws_secret_access_key="dummy", region_name="eu-west-1")
+    hedger = Hedger(percentile=99, max_rate=0.5)
+    with stand_in_aws(respond) as stand_in_dynamodb:
+        client = session.client("dynamodb", endpoint_url=str(stand_in_dynamodb.url))
+        table = MagicMock()
+        table.name = "people"
+        repo = PersonRepo(table, client, low_level_client=True, hedger=hedger)
+        for _ in range(MIN_LATENCY_SAMPLES):
+            repo.get_eligibility_data(NHS_NUMBER)
+
+        # When
+        start = time.monotonic()
+        actual = repo.get_eligibility_data(NHS_NUMBER)
+        elapsed = time.monotonic() - start
+
+    # Then
+    assert_that(actual, contains_exactly(has_entries(NHS_NUMBER=NHS_NUMBER, ATTRIBUTE_TYPE="PERSON")))
+    assert_that(elapsed, is_(less_than(0.5)))
+    assert_that(hedger.stats, has_properties(hedges=1, hedges_won=1))
+    assert_that(stand_in_dynamodb.operations, has_length(MIN_LATENCY_SAMPLES + 2))
+
+
+def test_unprimed_hedger_has_no_delay():
+    assert_that(Hedger(percentile=95).delay(), is_(none()))
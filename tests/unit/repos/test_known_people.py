@@ -0,0 +1,149 @@
+import io
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+from freezegun import freeze_time
+from hamcrest import assert_that, has_properties, is_
+
+from eligibility_signposting_api.model.eligibility import NHSNumber
+from eligibility_signposting_api.repos import NotFoundError
+from eligibility_signposting_api.repos.bloom_filter import BloomFilter
+from eligibility_signposting_api.repos.campaign_repo import BucketName
+from eligibility_signposting_api.repos.known_people import KnownPeople
+from eligibility_signposting_api.repos.person_repo import PersonRepo
+
+KNOWN = NHSNumber("9434765919")
+UNKNOWN = NHSNumber("9876543210")
+
+
+def s3_client_serving(*bloom_filters: BloomFilter) -> MagicMock:
+    s3_client = MagicMock()
+    s3_client.head_object.side_effect = [{"ETag": f'"{i}"'} for i, _ in enumerate(bloom_filters)]
+    s3_client.get_object.side_effect = [
+        {"ETag": f'"{i}"', "Body": io.BytesIO(bloom_filter.to_bytes())} for i, bloom_filter in enumerate(bloom_filters)
+    ]
+    return s3_client
+
+
+def test_known_people_rules_out_unknown_nhs_numbers():
+    # Given
+    known_people = KnownPeople(s3_client_serving(BloomFilter.of([KNOWN], 0.001)), BucketName("bucket"))
+
+    # When
+    known, unknown = known_people.might_exist(KNOWN), known_people.might_exist(UNKNOWN)
+
+    # Then
+    assert_that(known, is_(True))
+    assert_that(unknown, is_(False))
+    assert_that(known_people.stats, has_properties(absent=1, possibly_present=1))
+
+
+def test_known_people_disabled_without_bucket():
+    # Given
+    s3_client = MagicMock()
+    known_people = KnownPeople(s3_client, None)
+
+    # When
+    actual = known_people.might_exist(UNKNOWN)
+
+    # Then
+    assert_that(actual, is_(True))
+    s3_client.get_object.assert_not_called()
+
+
+def test_known_people_assumes_everyone_exists_if_filter_unreadable():
+    # Given
+    s3_client = MagicMock()
+    s3_client.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+    known_people = KnownPeople(s3_client, BucketName("bucket"))
+
+    # When
+    actual = known_people.might_exist(UNKNOWN)
+
+    # Then
+    assert_that(actual, is_(True))
+
+
+def test_known_people_picks_up_new_filter():
+    # Given
+    s3_client = s3_client_serving(BloomFilter.of([KNOWN], 0.001), BloomFilter.of([KNOWN, UNKNOWN], 0.001))
+    responses = iter(s3_client.get_object.side_effect)
+    downloading = threading.Event()
+
+    def get_object(**_: str) -> dict:
+        response = next(responses)
+        if s3_client.get_object.call_count > 1:
+            downloading.wait(timeout=5)
+        return response
+
+    s3_client.get_object.side_effect = get_object
+    known_people = KnownPeople(s3_client, BucketName("bucket"), refresh_seconds=60)
+
+    with freeze_time("2025-04-25 12:00:00") as frozen_time:
+        before = known_people.might_exist(UNKNOWN)
+        frozen_time.tick(timedelta(seconds=30))
+        still_before = known_people.might_exist(UNKNOWN)
+
+        # When
+        frozen_time.tick(timedelta(seconds=31))
+        while_refreshing = known_people.might_exist(UNKNOWN)
+        downloading.set()
+        refresher = known_people._refresher  # noqa: SLF001 - to wait for the background refresh
+        assert refresher is not None
+        refresher.join(timeout=5)
+        after = known_people.might_exist(UNKNOWN)
+
+    # Then
+    assert_that(before, is_(False))
+    assert_that(still_before, is_(False))
+    assert_that(while_refreshing, is_(False))
+    assert_that(after, is_(True))
+    assert_that(s3_client.get_object.call_count, is_(2))
+    assert_that(refresher.name, is_("person-filter-refresh"))
+
+
+def test_person_repo_warm_up_reads_filter():
+    # Given
+    s3_client = s3_client_serving(BloomFilter.of([KNOWN], 0.001))
+    known_people = KnownPeople(s3_client, BucketName("bucket"))
+    repo = PersonRepo(MagicMock(), MagicMock(), known_people=known_people)
+
+    # When
+    repo.warm_up()
+    actual = known_people.might_exist(UNKNOWN)
+
+    # Then
+    assert_that(actual, is_(False))
+    assert_that(s3_client.get_object.call_count, is_(1))
+
+
+def test_person_repo_skips_reading_unknown_people():
+    # Given
+    table = MagicMock()
+    known_people = KnownPeople(s3_client_serving(BloomFilter.of([KNOWN], 0.001)), BucketName("bucket"))
+    repo = PersonRepo(table, MagicMock(), known_people=known_people)
+
+    # When
+    with pytest.raises(NotFoundError, match="filtered"):
+        repo.get_eligibility_data(UNKNOWN)
+
+    # Then
+    table.query.assert_not_called()
+
+
+def test_person_repo_counts_false_positives():
+    # Given
+    table = MagicMock()
+    table.query.return_value = {"Items": []}
+    known_people = KnownPeople(s3_client_serving(BloomFilter.of([KNOWN], 0.001)), BucketName("bucket"))
+    repo = PersonRepo(table, MagicMock(), known_people=known_people)
+
+    # When
+    with pytest.raises(NotFoundError):
+        repo.get_eligibility_data(KNOWN)
+
+    # Then
+    assert_that(known_people.stats, has_properties(possibly_present=1, false_positives=1))
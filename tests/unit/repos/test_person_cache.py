@@ -0,0 +1,119 @@
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+from hamcrest import assert_that, contains_exactly, contains_string, equal_to, has_entries, has_properties, is_, not_
+
+from eligibility_signposting_api.model.eligibility import NHSNumber
+from eligibility_signposting_api.repos import NotFoundError
+from eligibility_signposting_api.repos.person_cache import PersonCache
+from eligibility_signposting_api.repos.person_repo import FetchPlan, PersonRepo
+
+NHS_NUMBER = NHSNumber("9000000009")
+
+
+@pytest.fixture
+def table() -> MagicMock:
+    table = MagicMock()
+    table.query.return_value = {"Items": [{"NHS_NUMBER": NHS_NUMBER, "ATTRIBUTE_TYPE": "PERSON"}]}
+    return table
+
+
+def test_person_data_read_through_cache(table: MagicMock):
+    # Given
+    cache = PersonCache(max_entries=10)
+    repo = PersonRepo(table, MagicMock(), cache=cache)
+
+    # When
+    first = repo.get_eligibility_data(NHS_NUMBER)
+    second = repo.get_eligibility_data(NHS_NUMBER)
+
+    # Then
+    assert_that(second, is_(equal_to(first)))
+    table.query.assert_called_once()
+    assert_that(cache.stats, has_properties(hits=1, misses=1))
+
+
+def test_person_data_cached_per_fetch_plan(table: MagicMock):
+    # Given
+    repo = PersonRepo(table, MagicMock(), cache=PersonCache(max_entries=10))
+
+    # When
+    repo.get_eligibility_data(NHS_NUMBER, FetchPlan(frozenset({("PERSON", "POSTCODE")})))
+    repo.get_eligibility_data(NHS_NUMBER, FetchPlan(frozenset({("PERSON", "ICB")})))
+
+    # Then
+    assert_that(table.query.call_count, is_(equal_to(2)))
+
+
+def test_person_cache_invalidation(table: MagicMock):
+    # Given
+    cache = PersonCache(max_entries=10)
+    repo = PersonRepo(table, MagicMock(), cache=cache)
+    repo.get_eligibility_data(NHS_NUMBER)
+
+    # When
+    cache.invalidate(NHS_NUMBER)
+    repo.get_eligibility_data(NHS_NUMBER)
+
+    # Then
+    assert_that(table.query.call_count, is_(equal_to(2)))
+
+
+def test_person_cache_disabled_by_default(table: MagicMock):
+    # Given
+    repo = PersonRepo(table, MagicMock(), cache=PersonCache())
+
+    # When
+    repo.get_eligibility_data(NHS_NUMBER)
+    repo.get_eligibility_data(NHS_NUMBER)
+
+    # Then
+    assert_that(table.query.call_count, is_(equal_to(2)))
+
+
+def test_person_cache_stats_logged_without_person_data(caplog: pytest.LogCaptureFixture):
+    # Given
+    cache = PersonCache(max_entries=10)
+    cache.put(NHS_NUMBER, None, [{"NHS_NUMBER": NHS_NUMBER, "POSTCODE": "LS1 1AB"}])
+
+    # When
+    with caplog.at_level(logging.DEBUG, logger="eligibility_signposting_api.repos.person_cache"):
+        cache.get(NHS_NUMBER, None)
+        cache.log_stats()
+
+    # Then
+    assert_that(caplog.records[-1], has_properties(msg="person cache stats", hits=1, entries=1))
+    assert_that(str([r.__dict__ for r in caplog.records]), not_(contains_string(NHS_NUMBER)))
+
+
+def test_not_found_results_cached(table: MagicMock):
+    # Given
+    table.query.return_value = {"Items": []}
+    cache = PersonCache(not_found_max_entries=10)
+    repo = PersonRepo(table, MagicMock(), cache=cache)
+
+    # When
+    for _ in range(3):
+        with pytest.raises(NotFoundError):
+            repo.get_eligibility_data(NHS_NUMBER)
+
+    # Then
+    table.query.assert_called_once()
+    assert_that(cache.not_found_stats, has_properties(hits=2, misses=1))
+
+
+def test_not_found_result_forgotten_on_invalidation(table: MagicMock):
+    # Given
+    table.query.side_effect = [{"Items": []}, {"Items": [{"NHS_NUMBER": NHS_NUMBER, "ATTRIBUTE_TYPE": "PERSON"}]}]
+    cache = PersonCache(not_found_max_entries=10)
+    repo = PersonRepo(table, MagicMock(), cache=cache)
+    with pytest.raises(NotFoundError):
+        repo.get_eligibility_data(NHS_NUMBER)
+
+    # When
+    cache.invalidate(NHS_NUMBER)
+    actual = repo.get_eligibility_data(NHS_NUMBER)
+
+    # Then
+    assert_that(actual, contains_exactly(has_entries(ATTRIBUTE_TYPE="PERSON")))
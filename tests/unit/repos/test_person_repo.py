@@ -0,0 +1,257 @@
+from unittest.mock import MagicMock
+
+import pytest
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from hamcrest import assert_that, contains_exactly, contains_inanyorder, equal_to, has_entries, is_
+
+from eligibility_signposting_api.circuit_breaker import CircuitBreaker, CircuitBreakerSettings, CircuitOpenError
+from eligibility_signposting_api.model import rules
+from eligibility_signposting_api.model.eligibility import NHSNumber
+from eligibility_signposting_api.repos.compact import compact_item
+from eligibility_signposting_api.repos.person_repo import FetchPlan, PersonRepo
+from tests.fixtures.builders.model import rule as rule_builder
+
+
+def test_fetch_plan_for_campaign_configs():
+    # Given
+    campaign_config = rule_builder.CampaignConfigFactory.build(
+        iterations=[
+            rule_builder.IterationFactory.build(
+                iteration_rules=[
+                    rule_builder.PersonAgeSuppressionRuleFactory.build(),
+                    rule_builder.IterationRuleFactory.build(
+                        attribute_level=rules.RuleAttributeLevel.TARGET,
+                        attribute_target=rules.RuleAttributeTarget("RSV"),
+                        attribute_name=rules.RuleAttributeName("LAST_SUCCESSFUL_DATE"),
+                    ),
+                    rule_builder.IterationRuleFactory.build(
+                        attribute_level=rules.RuleAttributeLevel.COHORT,
+                        attribute_name=rules.RuleAttributeName("COHORT_LABEL"),
+                    ),
+                ]
+            )
+        ]
+    )
+
+    # When
+    actual = FetchPlan.for_campaign_configs([campaign_config])
+
+    # Then
+    assert_that(
+        actual.dependencies,
+        contains_inanyorder(
+            ("PERSON", "DATE_OF_BIRTH"),
+            ("RSV", "LAST_SUCCESSFUL_DATE"),
+            ("COHORTS", "COHORT_MAP"),
+        ),
+    )
+    assert_that(actual.attribute_types, contains_inanyorder("PERSON", "RSV", "COHORTS"))
+
+
+def test_fetch_plan_projects_needed_attributes():
+    # Given
+    fetch_plan = FetchPlan(frozenset({("PERSON", "DATE_OF_BIRTH"), ("COHORTS", "COHORT_MAP")}))
+
+    # When
+    actual = fetch_plan.query_args(NHSNumber("1234567890"))
+
+    # Then
+    assert_that(
+        actual["ExpressionAttributeNames"].values(),
+        contains_inanyorder("NHS_NUMBER", "ATTRIBUTE_TYPE", "DATE_OF_BIRTH", "COHORT_MAP"),
+    )
+    assert_that(actual["ProjectionExpression"], is_(equal_to(", ".join(actual["ExpressionAttributeNames"]))))
+
+
+def test_fetch_plan_with_one_attribute_type_uses_sort_key():
+    # Given
+    fetch_plan = FetchPlan.for_campaign_configs([])
+
+    # When
+    actual = fetch_plan.query_args(NHSNumber("1234567890"))
+
+    # Then
+    assert_that(
+        actual["KeyConditionExpression"],
+        is_(equal_to(Key("NHS_NUMBER").eq("1234567890") & Key("ATTRIBUTE_TYPE").eq("PERSON"))),
+    )
+
+
+def test_fetch_plan_with_several_attribute_types_reads_range_of_sort_keys():
+    # Given
+    fetch_plan = FetchPlan(frozenset({("PERSON", "DATE_OF_BIRTH"), ("COHORTS", "COHORT_MAP"), ("FLU", "LAST_DATE")}))
+
+    # When
+    actual = fetch_plan.query_args(NHSNumber("1234567890"))
+
+    # Then
+    assert_that(
+        actual["KeyConditionExpression"],
+        is_(equal_to(Key("NHS_NUMBER").eq("1234567890") & Key("ATTRIBUTE_TYPE").between("COHORTS", "PERSON"))),
+    )
+
+
+def test_person_repo_queries_with_fetch_plan():
+    # Given
+    table = MagicMock()
+    table.query.return_value = {"Items": [{"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "PERSON"}]}
+    fetch_plan = FetchPlan(frozenset({("PERSON", "DATE_OF_BIRTH")}))
+    repo = PersonRepo(table, MagicMock())
+
+    # When
+    repo.get_eligibility_data(NHSNumber("1234567890"), fetch_plan)
+
+    # Then
+    table.query.assert_called_once()
+    assert_that(table.query.call_args.kwargs, has_entries(fetch_plan.query_args(NHSNumber("1234567890"))))
+
+
+def test_person_repo_follows_pagination():
+    # Given
+    table = MagicMock()
+    table.query.side_effect = [
+        {"Items": [{"ATTRIBUTE_TYPE": "PERSON"}], "LastEvaluatedKey": {"ATTRIBUTE_TYPE": "PERSON"}},
+        {"Items": [{"ATTRIBUTE_TYPE": "RSV"}]},
+    ]
+    repo = PersonRepo(table, MagicMock())
+
+    # When
+    actual = repo.get_eligibility_data(NHSNumber("1234567890"))
+
+    # Then
+    assert_that(actual, contains_exactly({"ATTRIBUTE_TYPE": "PERSON"}, {"ATTRIBUTE_TYPE": "RSV"}))
+    assert_that(table.query.call_args_list[1].kwargs, has_entries(ExclusiveStartKey={"ATTRIBUTE_TYPE": "PERSON"}))
+
+
+def test_person_repo_with_low_level_client():
+    # Given
+    table = MagicMock()
+    table.name = "person_table"
+    client = MagicMock()
+    client.query.side_effect = [
+        {
+            "Items": [{"NHS_NUMBER": {"S": "1234567890"}, "ATTRIBUTE_TYPE": {"S": "PERSON"}}],
+            "LastEvaluatedKey": {"NHS_NUMBER": {"S": "1234567890"}, "ATTRIBUTE_TYPE": {"S": "PERSON"}},
+        },
+        {"Items": [{"NHS_NUMBER": {"S": "1234567890"}, "ATTRIBUTE_TYPE": {"S": "RSV"}, "DOSES": {"N": "2"}}]},
+    ]
+    repo = PersonRepo(table, client, low_level_client=True)
+
+    # When
+    actual = repo.get_eligibility_data(NHSNumber("1234567890"), FetchPlan.for_campaign_configs([]))
+
+    # Then
+    assert_that(
+        actual,
+        contains_exactly(
+            {"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "PERSON"},
+            {"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "RSV", "DOSES": 2},
+        ),
+    )
+    table.query.assert_not_called()
+    first_call, second_call = client.query.call_args_list
+    assert_that(
+        first_call.kwargs,
+        has_entries(
+            TableName="person_table",
+            KeyConditionExpression="(#n0 = :v0 AND #n1 = :v1)",
+            ExpressionAttributeValues={":v0": {"S": "1234567890"}, ":v1": {"S": "PERSON"}},
+        ),
+    )
+    assert_that(second_call.kwargs, has_entries(ExclusiveStartKey=has_entries(ATTRIBUTE_TYPE={"S": "PERSON"})))
+
+
+def test_person_repo_reads_compact_item():
+    # Given
+    rows = [
+        {"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "PERSON", "DATE_OF_BIRTH": "19500101", "POSTCODE": "LS1 1AB"},
+        {"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "RSV", "LAST_SUCCESSFUL_DATE": "20240101"},
+    ]
+    table = MagicMock()
+    table.get_item.return_value = {"Item": compact_item("1234567890", rows)}
+    repo = PersonRepo(table, MagicMock(), compact_layout=True)
+
+    # When
+    actual = repo.get_eligibility_data(NHSNumber("1234567890"), FetchPlan(frozenset({("PERSON", "DATE_OF_BIRTH")})))
+
+    # Then
+    assert_that(
+        actual, contains_exactly({"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "PERSON", "DATE_OF_BIRTH": "19500101"})
+    )
+    table.query.assert_not_called()
+
+
+def test_person_repo_falls_back_to_separate_items_without_compact_item():
+    # Given
+    table = MagicMock()
+    table.get_item.return_value = {}
+    table.query.return_value = {"Items": [{"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "PERSON"}]}
+    repo = PersonRepo(table, MagicMock(), compact_layout=True)
+
+    # When
+    actual = repo.get_eligibility_data(NHSNumber("1234567890"))
+
+    # Then
+    assert_that(actual, contains_exactly({"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "PERSON"}))
+
+
+def test_person_repo_reads_compact_item_with_low_level_client():
+    # Given
+    rows = [{"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "PERSON"}]
+    table = MagicMock()
+    table.name = "person_table"
+    client = MagicMock()
+    client.get_item.return_value = {
+        "Item": {
+            "NHS_NUMBER": {"S": "1234567890"},
+            "ATTRIBUTE_TYPE": {"S": "COMPACT"},
+            "ROWS": {"B": compact_item("1234567890", rows)["ROWS"]},
+        }
+    }
+    repo = PersonRepo(table, client, low_level_client=True, compact_layout=True)
+
+    # When
+    actual = repo.get_eligibility_data(NHSNumber("1234567890"))
+
+    # Then
+    assert_that(actual, is_(equal_to(rows)))
+    client.query.assert_not_called()
+
+
+def test_fetch_plan_covers_plans_needing_less():
+    # Given
+    bigger = FetchPlan(frozenset({("PERSON", "DATE_OF_BIRTH"), ("COHORTS", "COHORT_MAP")}))
+    smaller = FetchPlan(frozenset({("COHORTS", "COHORT_MAP")}))
+
+    # When, Then
+    assert_that(bigger.covers(smaller), is_(True))
+    assert_that(bigger.covers(bigger), is_(True))
+    assert_that(smaller.covers(bigger), is_(False))
+
+
+def test_warm_up_calls_each_dynamodb_client():
+    # Given
+    table, dynamodb_client = MagicMock(), MagicMock()
+    repo = PersonRepo(table, dynamodb_client)
+
+    # When
+    repo.warm_up()
+
+    # Then
+    table.meta.client.describe_endpoints.assert_called_once_with()
+    dynamodb_client.describe_endpoints.assert_called_once_with()
+
+
+def test_person_repo_fails_fast_while_circuit_open():
+    # Given
+    table = MagicMock()
+    table.query.side_effect = ClientError({"Error": {"Code": "ServiceUnavailable", "Message": "unavailable"}}, "Query")
+    repo = PersonRepo(table, MagicMock(), circuit_breaker=CircuitBreaker("dynamodb", CircuitBreakerSettings(window=1)))
+    with pytest.raises(ClientError):
+        repo.get_eligibility_data(NHSNumber("9434765919"))
+
+    # When, Then
+    with pytest.raises(CircuitOpenError):
+        repo.get_eligibility_data(NHSNumber("9434765919"))
+    assert_that(table.query.call_count, equal_to(1))
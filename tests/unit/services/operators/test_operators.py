@@ -1,9 +1,16 @@
 import pytest
 from freezegun import freeze_time
-from hamcrest import assert_that, equal_to
+from hamcrest import assert_that, equal_to, has_properties, is_
 
+from eligibility_signposting_api.model.reference_lists import ReferenceList, ReferenceListName, ReferenceListRegistry
 from eligibility_signposting_api.model.rules import RuleOperator
-from eligibility_signposting_api.services.rules.operators import Operator, OperatorRegistry
+from eligibility_signposting_api.services.rules.operators import (
+    Operator,
+    OperatorRegistry,
+    parse_cache_info,
+    parse_date,
+    parse_int,
+)
 
 # Test cases: person_data, rule_operator, rule_value, expected, test_comment
 cases: list[tuple[str | None, RuleOperator, str | None, bool, str]] = []
@@ -350,6 +357,33 @@ cases += [
     (None, RuleOperator.not_starts_with, "YY[[NVL:PP77]]", True, "Default value used"),
 ]
 
+# Starts With Any
+cases += [
+    ("LS16", RuleOperator.starts_with_any, "LS1,HP", True, ""),
+    ("HP27", RuleOperator.starts_with_any, "LS1,HP", True, ""),
+    ("LS2", RuleOperator.starts_with_any, "LS1,HP", False, ""),
+    ("L", RuleOperator.starts_with_any, "LS1,HP", False, ""),
+    (None, RuleOperator.starts_with_any, "LS1,HP", False, ""),
+    ("", RuleOperator.starts_with_any, "LS1,HP", False, ""),
+    ("HP27", RuleOperator.starts_with_any, "LS1,HP[[NVL:LS16]]", True, "Default value specified, but unused"),
+    ("YO1", RuleOperator.starts_with_any, "LS1,HP[[NVL:LS16]]", False, "Default value specified, but unused"),
+    (None, RuleOperator.starts_with_any, "LS1,HP[[NVL:LS16]]", True, "Default value used"),
+    (None, RuleOperator.starts_with_any, "LS1,HP[[NVL:YO1]]", False, "Default value used"),
+]
+
+# Not Starts With Any
+cases += [
+    ("LS16", RuleOperator.not_starts_with_any, "LS1,HP", False, ""),
+    ("HP27", RuleOperator.not_starts_with_any, "LS1,HP", False, ""),
+    ("LS2", RuleOperator.not_starts_with_any, "LS1,HP", True, ""),
+    (None, RuleOperator.not_starts_with_any, "LS1,HP", True, ""),
+    ("", RuleOperator.not_starts_with_any, "LS1,HP", True, ""),
+    ("HP27", RuleOperator.not_starts_with_any, "LS1,HP[[NVL:LS16]]", False, "Default value specified, but unused"),
+    ("YO1", RuleOperator.not_starts_with_any, "LS1,HP[[NVL:LS16]]", True, "Default value specified, but unused"),
+    (None, RuleOperator.not_starts_with_any, "LS1,HP[[NVL:LS16]]", False, "Default value used"),
+    (None, RuleOperator.not_starts_with_any, "LS1,HP[[NVL:YO1]]", True, "Default value used"),
+]
+
 # Ends With
 cases += [
     ("2BA", RuleOperator.ends_with, "2BA", True, ""),
@@ -363,6 +397,29 @@ cases += [
     (None, RuleOperator.ends_with, "66[[NVL:PP77]]", False, "Default value used"),
 ]
 
+# Matches
+cases += [
+    ("LS16 1AB", RuleOperator.matches, "^[A-Z]{2}\\d+ \\d[A-Z]{2}$", True, ""),
+    ("LS16", RuleOperator.matches, "^[A-Z]{2}\\d+ \\d[A-Z]{2}$", False, ""),
+    ("XLS16", RuleOperator.matches, "LS\\d", True, "Unanchored"),
+    (None, RuleOperator.matches, "LS\\d", False, ""),
+    ("", RuleOperator.matches, "LS\\d", False, ""),
+    ("", RuleOperator.matches, "^$", True, ""),
+    ("LS16", RuleOperator.matches, "^LS\\d+$[[NVL:HP1]]", True, "Default value specified, but unused"),
+    (None, RuleOperator.matches, "^LS\\d+$[[NVL:LS1]]", True, "Default value used"),
+    (None, RuleOperator.matches, "^LS\\d+$[[NVL:HP1]]", False, "Default value used"),
+]
+
+# Not Matches
+cases += [
+    ("LS16 1AB", RuleOperator.not_matches, "^[A-Z]{2}\\d+ \\d[A-Z]{2}$", False, ""),
+    ("LS16", RuleOperator.not_matches, "^[A-Z]{2}\\d+ \\d[A-Z]{2}$", True, ""),
+    (None, RuleOperator.not_matches, "LS\\d", True, ""),
+    ("", RuleOperator.not_matches, "LS\\d", True, ""),
+    (None, RuleOperator.not_matches, "^LS\\d+$[[NVL:LS1]]", False, "Default value used"),
+    (None, RuleOperator.not_matches, "^LS\\d+$[[NVL:HP1]]", True, "Default value used"),
+]
+
 # is_in
 cases += [
     ("", RuleOperator.is_in, "QH8,QJG", False, ""),
@@ -597,3 +654,78 @@ def test_operator(
         equal_to(expected),
         f"{person_data!r} {rule_operator.name} {rule_value!r}{' - ' if test_comment else ''}{test_comment}",
     )
+
+
+def test_date_parsing_is_cached():
+    # Given
+    parse_date.cache_clear()
+
+    # When
+    OperatorRegistry.get(RuleOperator.year_gt)(rule_value="-5").matches("20200426")
+    OperatorRegistry.get(RuleOperator.year_lt)(rule_value="-75").matches("20200426")
+
+    # Then
+    assert_that(parse_cache_info()["date"], has_properties(hits=1, misses=1))
+
+
+def test_int_parsing_is_cached():
+    # Given
+    parse_int.cache_clear()
+
+    # When
+    OperatorRegistry.get(RuleOperator.gt)(rule_value="100").matches("42")
+    OperatorRegistry.get(RuleOperator.lt)(rule_value="100").matches("42")
+
+    # Then
+    assert_that(parse_cache_info()["int"], has_properties(hits=2, misses=2))
+
+
+@pytest.fixture
+def gp_practices():
+    reference_list = ReferenceList(ReferenceListName("gp_practices"), ["A12345", "B23456"])
+    ReferenceListRegistry.register(reference_list)
+    yield reference_list.name
+    ReferenceListRegistry.registry.pop(reference_list.name)
+
+
+@pytest.mark.usefixtures("gp_practices")
+@pytest.mark.parametrize(
+    ("person_data", "rule_operator", "expected"),
+    [
+        ("A12345", RuleOperator.is_in, True),
+        ("C34567", RuleOperator.is_in, False),
+        ("C34567,B23456", RuleOperator.member_of, True),
+        (None, RuleOperator.is_in, False),
+        ("A12345", RuleOperator.not_in, False),
+        ("C34567", RuleOperator.not_member_of, True),
+        ("A1234599", RuleOperator.starts_with_any, True),
+        ("A123", RuleOperator.starts_with_any, False),
+        ("B2345601", RuleOperator.not_starts_with_any, False),
+    ],
+)
+def test_membership_of_reference_list(person_data: str | None, rule_operator: RuleOperator, *, expected: bool):
+    # Given
+    operator = OperatorRegistry.get(rule_operator)(rule_value="[[LIST:gp_practices]]")
+
+    # When
+    actual = bool(operator.matches(person_data))
+
+    # Then
+    assert_that(actual, equal_to(expected))
+
+
+def test_prefix_operator_recompiles_when_reference_list_reloaded():
+    # Given
+    name = ReferenceListName("postcode_districts")
+    ReferenceListRegistry.register(ReferenceList(name, ["LS1"], version="1"))
+    operator = OperatorRegistry.get(RuleOperator.starts_with_any)(rule_value="[[LIST:postcode_districts]]")
+    before = bool(operator.matches("HP27"))
+
+    # When
+    ReferenceListRegistry.register(ReferenceList(name, ["LS1", "HP"], version="2"))
+    after = bool(operator.matches("HP27"))
+
+    # Then
+    ReferenceListRegistry.registry.pop(name)
+    assert_that(before, is_(False))
+    assert_that(after, is_(True))
@@ -0,0 +1,39 @@
+import pytest
+from hamcrest import assert_that, equal_to
+
+from eligibility_signposting_api.services.rules.prefix_trie import PrefixTrie
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("LS16", True),
+        ("LS1", True),
+        ("LS", False),
+        ("LS2", False),
+        ("HP27", True),
+        ("H", False),
+        ("", False),
+        ("XLS1", False),
+    ],
+)
+def test_has_prefix_of(value: str, *, expected: bool):
+    # Given
+    trie = PrefixTrie.of(["LS1", "LS17", "HP"])
+
+    # When
+    actual = trie.has_prefix_of(value)
+
+    # Then
+    assert_that(actual, equal_to(expected))
+
+
+def test_empty_prefix_matches_everything():
+    # Given
+    trie = PrefixTrie.of([""])
+
+    # When
+    actual = [trie.has_prefix_of(value) for value in ("", "LS1")]
+
+    # Then
+    assert_that(actual, equal_to([True, True]))
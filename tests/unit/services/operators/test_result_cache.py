@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock
+
+from freezegun import freeze_time
+from hamcrest import assert_that, equal_to, has_properties, is_
+
+from eligibility_signposting_api.model import rules
+from eligibility_signposting_api.services.calculators.rule_calculator import RuleCalculator
+from eligibility_signposting_api.services.rules.operators import OperatorRegistry
+from eligibility_signposting_api.services.rules.result_cache import OperatorResultCache
+from tests.fixtures.builders.model import rule as rule_builder
+
+
+def test_results_are_cached_per_rule_and_attribute_value():
+    # Given
+    cache = OperatorResultCache(max_entries=10)
+    rule = rule_builder.IterationRuleFactory.build(operator=rules.RuleOperator.is_in, comparator="AB1,AB2")
+    operator = OperatorRegistry.compile(rule.operator, rule.comparator)
+    evaluate = MagicMock(side_effect=RuleCalculator.match)
+
+    # When
+    first = cache.get_or_evaluate(rule, operator, "AB1", evaluate)
+    second = cache.get_or_evaluate(rule, operator, "AB1", evaluate)
+    third = cache.get_or_evaluate(rule, operator, "CD1", evaluate)
+
+    # Then
+    assert_that(first, is_(equal_to(second)))
+    assert_that(first[0], is_(True))
+    assert_that(third[0], is_(False))
+    assert_that(evaluate.call_count, is_(equal_to(2)))
+    assert_that(cache.stats, has_properties(hits=1, misses=2))
+
+
+def test_cache_disabled_by_default():
+    # Given
+    cache = OperatorResultCache()
+    rule = rule_builder.IterationRuleFactory.build(operator=rules.RuleOperator.equals, comparator="Y")
+    operator = OperatorRegistry.compile(rule.operator, rule.comparator)
+    evaluate = MagicMock(side_effect=RuleCalculator.match)
+
+    # When
+    cache.get_or_evaluate(rule, operator, "Y", evaluate)
+    cache.get_or_evaluate(rule, operator, "Y", evaluate)
+
+    # Then
+    assert_that(evaluate.call_count, is_(equal_to(2)))
+
+
+def test_cache_cleared_on_ruleset_swap():
+    # Given
+    cache = OperatorResultCache(max_entries=10)
+    rule = rule_builder.IterationRuleFactory.build(operator=rules.RuleOperator.equals, comparator="Y")
+    operator = OperatorRegistry.compile(rule.operator, rule.comparator)
+    evaluate = MagicMock(side_effect=RuleCalculator.match)
+    cache.bind_ruleset("v1")
+    cache.get_or_evaluate(rule, operator, "Y", evaluate)
+
+    # When
+    cache.bind_ruleset("v1")
+    cache.get_or_evaluate(rule, operator, "Y", evaluate)
+    cache.bind_ruleset("v2")
+    cache.get_or_evaluate(rule, operator, "Y", evaluate)
+
+    # Then
+    assert_that(evaluate.call_count, is_(equal_to(2)))
+
+
+def test_date_rule_results_dropped_on_date_rollover():
+    # Given
+    cache = OperatorResultCache(max_entries=10)
+    date_rule = rule_builder.IterationRuleFactory.build(operator=rules.RuleOperator.year_gt, comparator="-5")
+    date_operator = OperatorRegistry.compile(date_rule.operator, date_rule.comparator)
+    other_rule = rule_builder.IterationRuleFactory.build(operator=rules.RuleOperator.equals, comparator="Y")
+    other_operator = OperatorRegistry.compile(other_rule.operator, other_rule.comparator)
+    evaluate = MagicMock(side_effect=RuleCalculator.match)
+
+    # When
+    with freeze_time("2025-04-25"):
+        before = cache.get_or_evaluate(date_rule, date_operator, "20200426", evaluate)
+        cache.get_or_evaluate(other_rule, other_operator, "Y", evaluate)
+    with freeze_time("2025-04-26"):
+        after = cache.get_or_evaluate(date_rule, date_operator, "20200426", evaluate)
+        cache.get_or_evaluate(other_rule, other_operator, "Y", evaluate)
+
+    # Then
+    assert_that(before[0], is_(True))
+    assert_that(after[0], is_(False))
+    assert_that(evaluate.call_count, is_(equal_to(3)))
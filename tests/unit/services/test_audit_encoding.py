@@ -0,0 +1,81 @@
+import gzip
+import random
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    greater_than,
+    has_length,
+    is_,
+    less_than_or_equal_to,
+    only_contains,
+)
+
+from eligibility_signposting_api.services.audit_encoding import (
+    aggregate,
+    decode_audit_records,
+    encode_record,
+    split_records,
+)
+
+
+def test_records_aggregated_into_one_compressed_record():
+    # Given
+    records = [encode_record({"n": i, "status": "actionable"}) for i in range(100)]
+
+    # When
+    actual = aggregate(records)
+
+    # Then
+    assert_that(actual, has_length(1))
+    assert_that(len(actual[0]), is_(less_than_or_equal_to(len(b"".join(records)) // 4)))
+    assert_that(split_records(actual[0]), equal_to(records))
+
+
+def test_aggregates_kept_within_max_bytes():
+    # Given
+    rng = random.Random(42)
+    records = [encode_record({"n": i, "noise": rng.randbytes(100).hex()}) for i in range(100)]
+
+    # When
+    actual = aggregate(records, max_bytes=4096)
+
+    # Then
+    assert_that(len(actual), is_(greater_than(1)))
+    assert_that([len(a) for a in actual], only_contains(less_than_or_equal_to(4096)))
+    assert_that([r for a in actual for r in split_records(a)], equal_to(records))
+
+
+def test_decode_delivered_object_of_concatenated_aggregates():
+    # Given
+    first = aggregate([encode_record({"n": 0}), encode_record({"n": 1})])
+    second = aggregate([encode_record({"n": 2})])
+
+    # When
+    actual = list(decode_audit_records(b"".join(first + second)))
+
+    # Then
+    assert_that(actual, contains_exactly({"n": 0}, {"n": 1}, {"n": 2}))
+
+
+def test_decode_plain_json_lines():
+    # Given
+    data = encode_record({"n": 0}) + encode_record({"n": 1}) + b"\n"
+
+    # When
+    actual = list(decode_audit_records(data))
+
+    # Then
+    assert_that(actual, contains_exactly({"n": 0}, {"n": 1}))
+
+
+def test_aggregate_is_gzip():
+    # Given
+    records = [encode_record({"n": 0})]
+
+    # When
+    (actual,) = aggregate(records)
+
+    # Then
+    assert_that(gzip.decompress(actual), equal_to(records[0]))
@@ -0,0 +1,164 @@
+import threading
+from pathlib import Path
+
+import pytest
+from hamcrest import assert_that, contains_exactly, equal_to, has_properties, is_
+
+from eligibility_signposting_api.deadline import deadline
+from eligibility_signposting_api.services.audit_queue import AuditQueue, OverflowPolicy
+from eligibility_signposting_api.services.audit_spool import AuditSpool
+
+
+class BlockedSender:
+    """Collects the batches sent, holding each until released."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[bytes]] = []
+        self.released = threading.Event()
+        self.sending = threading.Event()
+
+    def __call__(self, records: list[bytes]) -> None:
+        self.sending.set()
+        self.released.wait(timeout=5)
+        self.batches.append(records)
+
+    def block_queue(self, queue: AuditQueue) -> None:
+        """Have the worker take a first record, and wait on it, so that further records stay queued."""
+        queue.put(b"first\n")
+        threading.Thread(target=queue.drain, kwargs={"timeout": 5}, daemon=True).start()
+        assert self.sending.wait(timeout=5)
+
+
+def test_records_sent_in_background():
+    # Given
+    batches: list[list[bytes]] = []
+    queue = AuditQueue(
+        batches.append, max_size=10, policy=OverflowPolicy.drop_oldest, batch_max_records=2, batch_max_age=60
+    )
+
+    # When
+    for i in range(3):
+        queue.put(f"{i}\n".encode())
+    drained = queue.drain(timeout=5)
+
+    # Then
+    assert_that(drained, is_(True))
+    assert_that(batches, contains_exactly([b"0\n", b"1\n"], [b"2\n"]))
+    assert_that(queue.stats, has_properties(enqueued=3, sent=3, dropped=0))
+    queue.close(timeout=5)
+
+
+def test_drop_oldest_when_full():
+    # Given
+    sender = BlockedSender()
+    queue = AuditQueue(sender, max_size=2, policy=OverflowPolicy.drop_oldest, batch_max_records=10, batch_max_age=60)
+    sender.block_queue(queue)
+
+    # When
+    for i in range(3):
+        queue.put(f"{i}\n".encode())
+    sender.released.set()
+    queue.close(timeout=5)
+
+    # Then
+    assert_that(sender.batches, contains_exactly([b"first\n"], [b"1\n", b"2\n"]))
+    assert_that(queue.stats, has_properties(dropped=1, max_depth=2))
+
+
+def test_block_when_full_gives_up_at_deadline():
+    # Given
+    sender = BlockedSender()
+    queue = AuditQueue(sender, max_size=1, policy=OverflowPolicy.block, batch_max_records=10, batch_max_age=60)
+    sender.block_queue(queue)
+    queue.put(b"0\n")
+
+    # When
+    with deadline(0.05):
+        queue.put(b"1\n")
+
+    # Then
+    assert_that(queue.depth, equal_to(1))
+    assert_that(queue.stats, has_properties(dropped=1))
+    sender.released.set()
+    queue.close(timeout=5)
+
+
+def test_block_when_full_waits_for_room():
+    # Given
+    sender = BlockedSender()
+    queue = AuditQueue(sender, max_size=1, policy=OverflowPolicy.block, batch_max_records=10, batch_max_age=60)
+    sender.block_queue(queue)
+    queue.put(b"0\n")
+
+    # When
+    threading.Timer(0.05, sender.released.set).start()
+    queue.put(b"1\n")
+    queue.close(timeout=5)
+
+    # Then
+    assert_that(sender.batches, contains_exactly([b"first\n"], [b"0\n"], [b"1\n"]))
+    assert_that(queue.stats, has_properties(dropped=0))
+
+
+def test_spill_when_full(tmp_path: Path):
+    # Given
+    sender = BlockedSender()
+    spool = AuditSpool(tmp_path, max_bytes=1024)
+    queue = AuditQueue(
+        sender, max_size=1, policy=OverflowPolicy.spill, batch_max_records=10, batch_max_age=60, spool=spool
+    )
+    sender.block_queue(queue)
+    queue.put(b"0\n")
+
+    # When
+    queue.put(b"1\n")
+    queue.put(b"2\n")
+    sender.released.set()
+    queue.close(timeout=5)
+
+    # Then
+    assert_that(sender.batches, contains_exactly([b"first\n"], [b"0\n"]))
+    assert_that(spool.take(), contains_exactly(b"1\n", b"2\n"))
+    assert_that(queue.stats, has_properties(spilled=2, dropped=0))
+
+
+def test_spill_when_full_drops_when_spool_full(tmp_path: Path):
+    # Given
+    sender = BlockedSender()
+    spool = AuditSpool(tmp_path, max_bytes=1)
+    queue = AuditQueue(
+        sender, max_size=1, policy=OverflowPolicy.spill, batch_max_records=10, batch_max_age=60, spool=spool
+    )
+    sender.block_queue(queue)
+    queue.put(b"0\n")
+
+    # When
+    queue.put(b"1\n")
+    sender.released.set()
+    queue.close(timeout=5)
+
+    # Then
+    assert_that(spool.is_empty(), is_(True))
+    assert_that(queue.stats, has_properties(spilled=0, dropped=1))
+
+
+def test_spill_needs_spool():
+    with pytest.raises(ValueError, match="spool"):
+        AuditQueue(list.append, max_size=1, policy=OverflowPolicy.spill, batch_max_records=10, batch_max_age=60)
+
+
+def test_records_put_after_close_dropped():
+    # Given
+    batches: list[list[bytes]] = []
+    queue = AuditQueue(
+        batches.append, max_size=10, policy=OverflowPolicy.drop_oldest, batch_max_records=10, batch_max_age=60
+    )
+    queue.put(b"0\n")
+    queue.close(timeout=5)
+
+    # When
+    queue.put(b"1\n")
+
+    # Then
+    assert_that(batches, contains_exactly([b"0\n"]))
+    assert_that(queue.stats, has_properties(dropped=1))
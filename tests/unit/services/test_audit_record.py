@@ -0,0 +1,125 @@
+import json
+from datetime import UTC, datetime
+
+from hamcrest import assert_that, contains_exactly, ends_with, equal_to, has_entries, is_
+
+from eligibility_signposting_api.model.eligibility import (
+    CohortGroupResult,
+    Condition,
+    ConditionName,
+    EligibilityStatus,
+    NHSNumber,
+    Reason,
+    RuleName,
+    RuleType,
+    Status,
+)
+from eligibility_signposting_api.services.audit_record import EligibilityAuditRecord
+
+ELIGIBILITY_STATUS = EligibilityStatus(
+    conditions=[
+        Condition(
+            condition_name=ConditionName("RSV"),
+            status=Status.not_eligible,
+            cohort_results=[
+                CohortGroupResult(
+                    cohort_code="rsv_75_rolling",
+                    status=Status.not_eligible,
+                    reasons=[
+                        Reason(
+                            rule_type=RuleType.filter,
+                            rule_name=RuleName("Exclude too young"),
+                            rule_description=None,
+                            matcher_matched=True,
+                        )
+                    ],
+                    description=None,
+                )
+            ],
+        )
+    ]
+)
+
+
+def test_encoded_as_a_line_of_json():
+    # Given
+    audit_record = EligibilityAuditRecord(
+        NHSNumber("9434765919"),
+        ELIGIBILITY_STATUS,
+        b'{"processedSuggestions":[]}',
+        include_actions=True,
+        audited_at=datetime(2025, 4, 25, 12, tzinfo=UTC),
+    )
+
+    # When
+    actual = audit_record.encode()
+
+    # Then
+    assert_that(actual.decode(), ends_with("}\n"))
+    assert_that(actual.count(b"\n"), equal_to(1))
+    assert_that(
+        json.loads(actual),
+        has_entries(
+            nhsNumber="9434765919",
+            auditedAt="2025-04-25T12:00:00+00:00",
+            includeActions=True,
+            response={"processedSuggestions": []},
+        ),
+    )
+
+
+def test_response_included_as_sent():
+    # Given
+    response_body = b'{"responseId":"abc","processedSuggestions":[{"condition":"RSV"}]}\n'
+    audit_record = EligibilityAuditRecord(
+        NHSNumber("9434765919"), ELIGIBILITY_STATUS, response_body, include_actions=False
+    )
+
+    # When
+    actual = audit_record.encode()
+
+    # Then
+    assert_that(actual.decode(), ends_with(',"response":' + response_body.decode().strip() + "}\n"))
+
+
+def test_pretty_printed_response_kept_to_one_line():
+    # Given
+    response_body = json.dumps({"processedSuggestions": [{"condition": "RSV"}]}, indent=2).encode()
+    audit_record = EligibilityAuditRecord(
+        NHSNumber("9434765919"), ELIGIBILITY_STATUS, response_body, include_actions=False
+    )
+
+    # When
+    actual = audit_record.encode()
+
+    # Then
+    assert_that(actual.count(b"\n"), equal_to(1))
+    assert_that(json.loads(actual)["response"], is_(equal_to(json.loads(response_body))))
+
+
+def test_every_cohort_and_rule_outcome_audited():
+    # Given
+    audit_record = EligibilityAuditRecord(NHSNumber("9434765919"), ELIGIBILITY_STATUS, b"{}", include_actions=False)
+
+    # When
+    actual = json.loads(audit_record.encode())
+
+    # Then
+    assert_that(
+        actual["conditions"],
+        contains_exactly(
+            has_entries(
+                condition="RSV",
+                status="not_eligible",
+                cohorts=contains_exactly(
+                    has_entries(
+                        cohortCode="rsv_75_rolling",
+                        status="not_eligible",
+                        reasons=contains_exactly(
+                            {"ruleType": "F", "ruleName": "Exclude too young", "matcherMatched": True}
+                        ),
+                    )
+                ),
+            )
+        ),
+    )
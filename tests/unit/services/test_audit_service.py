@@ -0,0 +1,324 @@
+import json
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from freezegun import freeze_time
+from hamcrest import assert_that, contains_exactly, empty, equal_to, has_properties, is_, is_not
+
+from eligibility_signposting_api.circuit_breaker import CircuitBreaker, CircuitBreakerSettings
+from eligibility_signposting_api.config.config import AwsKinesisFirehoseStreamName
+from eligibility_signposting_api.services.audit_encoding import decode_audit_records
+from eligibility_signposting_api.services.audit_record import EligibilityAuditRecord
+from eligibility_signposting_api.services.audit_service import AuditService
+
+STREAM = AwsKinesisFirehoseStreamName("audit")
+
+
+@pytest.fixture(autouse=True)
+def no_backoff() -> Iterator[MagicMock]:
+    with patch("eligibility_signposting_api.services.audit_service.time.sleep") as sleep:
+        yield sleep
+
+
+@pytest.fixture
+def firehose() -> MagicMock:
+    firehose = MagicMock()
+    firehose.put_record_batch.side_effect = lambda **kwargs: {
+        "FailedPutCount": 0,
+        "RequestResponses": [{"RecordId": str(i)} for i, _ in enumerate(kwargs["Records"])],
+    }
+    return firehose
+
+
+def sent_records(firehose: MagicMock) -> list[list[dict]]:
+    return [
+        [json.loads(record["Data"]) for record in call.kwargs["Records"]]
+        for call in firehose.put_record_batch.call_args_list
+    ]
+
+
+def test_records_sent_in_batches_by_count(firehose: MagicMock):
+    # Given
+    audit_service = AuditService(firehose, STREAM, batch_max_records=3, batch_max_age=60)
+
+    # When
+    for i in range(4):
+        audit_service.audit({"n": i})
+
+    # Then
+    assert_that(sent_records(firehose), contains_exactly([{"n": 0}, {"n": 1}, {"n": 2}]))
+    assert_that(audit_service.stats, has_properties(records=4, batches=1))
+
+
+def test_flush_sends_buffered_records(firehose: MagicMock):
+    # Given
+    audit_service = AuditService(firehose, STREAM, batch_max_age=60)
+    audit_service.audit({"n": 0})
+    audit_service.audit({"n": 1})
+    firehose.put_record_batch.assert_not_called()
+
+    # When
+    audit_service.flush()
+    audit_service.flush()
+
+    # Then
+    assert_that(sent_records(firehose), contains_exactly([{"n": 0}, {"n": 1}]))
+
+
+def test_records_sent_once_oldest_old_enough(firehose: MagicMock):
+    # Given
+    audit_service = AuditService(firehose, STREAM, batch_max_age=1)
+
+    with freeze_time("2025-04-25 12:00:00") as frozen_time:
+        audit_service.audit({"n": 0})
+        firehose.put_record_batch.assert_not_called()
+
+        # When
+        frozen_time.tick(1)
+        audit_service.audit({"n": 1})
+
+    # Then
+    assert_that(sent_records(firehose), contains_exactly([{"n": 0}, {"n": 1}]))
+
+
+def test_buffered_records_sent_once_old_enough_without_more_records(firehose: MagicMock):
+    # Given
+    sent = threading.Event()
+    respond = firehose.put_record_batch.side_effect
+
+    def put_record_batch(**kwargs) -> dict:
+        response = respond(**kwargs)
+        sent.set()
+        return response
+
+    firehose.put_record_batch.side_effect = put_record_batch
+    audit_service = AuditService(firehose, STREAM, batch_max_age=0.05)
+
+    # When
+    audit_service.audit({"n": 0})
+
+    # Then
+    assert_that(sent.wait(timeout=5), is_(True))
+    assert_that(sent_records(firehose), contains_exactly([{"n": 0}]))
+
+
+def test_batches_split_by_size(firehose: MagicMock):
+    # Given
+    audit_service = AuditService(firehose, STREAM, batch_max_bytes=25, batch_max_age=60)
+    audit_service.audit({"n": "a" * 8})
+    audit_service.audit({"n": "b" * 8})
+
+    # When
+    audit_service.flush()
+
+    # Then
+    assert_that(sent_records(firehose), contains_exactly([{"n": "a" * 8}], [{"n": "b" * 8}]))
+
+
+def test_failed_records_retried(firehose: MagicMock, no_backoff: MagicMock):
+    # Given
+    firehose.put_record_batch.side_effect = [
+        {"FailedPutCount": 1, "RequestResponses": [{"RecordId": "0"}, {"ErrorCode": "ServiceUnavailableException"}]},
+        {"FailedPutCount": 0, "RequestResponses": [{"RecordId": "1"}]},
+    ]
+    audit_service = AuditService(firehose, STREAM, batch_max_age=60)
+    audit_service.audit({"n": 0})
+    audit_service.audit({"n": 1})
+
+    # When
+    audit_service.flush()
+
+    # Then
+    assert_that(sent_records(firehose), contains_exactly([{"n": 0}, {"n": 1}], [{"n": 1}]))
+    assert_that(audit_service.stats, has_properties(retries=1, dropped=0))
+    no_backoff.assert_called_once()
+
+
+def test_records_dropped_after_max_attempts(firehose: MagicMock):
+    # Given
+    firehose.put_record_batch.side_effect = ClientError(
+        {"Error": {"Code": "ServiceUnavailableException", "Message": "slow down"}}, "PutRecordBatch"
+    )
+    audit_service = AuditService(firehose, STREAM, batch_max_age=60, max_attempts=3)
+    audit_service.audit({"n": 0})
+
+    # When
+    audit_service.flush()
+
+    # Then
+    assert_that(firehose.put_record_batch.call_count, equal_to(3))
+    assert_that(audit_service.stats, has_properties(retries=2, dropped=1))
+
+
+def test_records_dropped_while_circuit_open(firehose: MagicMock):
+    # Given
+    firehose.put_record_batch.side_effect = ClientError(
+        {"Error": {"Code": "ServiceUnavailableException", "Message": "slow down"}}, "PutRecordBatch"
+    )
+    circuit_breaker = CircuitBreaker("firehose", CircuitBreakerSettings(window=1))
+    audit_service = AuditService(firehose, STREAM, batch_max_age=60, circuit_breaker=circuit_breaker)
+    audit_service.audit({"n": 0})
+
+    # When
+    audit_service.flush()
+
+    # Then
+    assert_that(firehose.put_record_batch.call_count, equal_to(1))
+    assert_that(audit_service.stats, has_properties(dropped=1))
+
+
+def test_records_sent_from_queue(firehose: MagicMock):
+    # Given
+    audit_service = AuditService(firehose, STREAM, batch_max_age=60, queue_size=10)
+
+    # When
+    audit_service.audit({"n": 0})
+    audit_service.audit({"n": 1})
+    audit_service.flush()
+
+    # Then
+    assert_that(sent_records(firehose), contains_exactly([{"n": 0}, {"n": 1}]))
+
+
+def test_records_encoded_by_queue_thread(firehose: MagicMock):
+    # Given
+    audit_service = AuditService(firehose, STREAM, batch_max_age=60, queue_size=10)
+    encoded_on: list[threading.Thread] = []
+
+    def encode() -> bytes:
+        encoded_on.append(threading.current_thread())
+        return b'{"n":0}\n'
+
+    audit_record = MagicMock(spec=EligibilityAuditRecord)
+    audit_record.encode.side_effect = encode
+
+    # When
+    audit_service.audit(audit_record)
+    audit_service.flush()
+
+    # Then
+    assert_that(encoded_on, contains_exactly(is_not(threading.current_thread())))
+    assert_that(sent_records(firehose), contains_exactly([{"n": 0}]))
+
+
+def test_record_which_cant_be_encoded_dropped_from_queued_batch(firehose: MagicMock):
+    # Given
+    audit_service = AuditService(firehose, STREAM, batch_max_age=60, queue_size=10)
+    audit_record = MagicMock(spec=EligibilityAuditRecord)
+    audit_record.encode.side_effect = ValueError("bad record")
+
+    # When
+    audit_service.audit(audit_record)
+    audit_service.audit({"n": 1})
+    audit_service.flush()
+
+    # Then
+    assert_that(sent_records(firehose), contains_exactly([{"n": 1}]))
+    assert_that(audit_service.stats, has_properties(dropped=1))
+
+
+def test_unsent_records_spooled_then_sent_once_firehose_recovers(firehose: MagicMock, tmp_path: Path):
+    # Given
+    put_record_batch = firehose.put_record_batch.side_effect
+    firehose.put_record_batch.side_effect = ClientError(
+        {"Error": {"Code": "ServiceUnavailableException", "Message": "slow down"}}, "PutRecordBatch"
+    )
+    audit_service = AuditService(
+        firehose, STREAM, batch_max_age=60, max_attempts=1, spool_dir=tmp_path, spool_max_bytes=1024
+    )
+    audit_service.audit({"n": 0})
+    audit_service.flush()
+    assert_that(audit_service.stats, has_properties(spooled=1, dropped=0))
+
+    # When
+    sent_on: list[threading.Thread] = []
+    resent = threading.Event()
+
+    def record_thread(**kwargs) -> dict:
+        sent_on.append(threading.current_thread())
+        response = put_record_batch(**kwargs)
+        if threading.current_thread() is not threading.main_thread():
+            resent.set()
+        return response
+
+    firehose.put_record_batch.side_effect = record_thread
+    audit_service.audit({"n": 1})
+    audit_service.flush()
+
+    # Then
+    assert_that(resent.wait(timeout=5), is_(True))
+    assert_that(sent_on, contains_exactly(threading.current_thread(), is_not(threading.current_thread())))
+    assert_that(sent_records(firehose)[1:], contains_exactly([{"n": 1}], [{"n": 0}]))
+    assert_that(audit_service.spool, has_properties(stats=has_properties(spooled=1, taken=1)))
+    assert_that(list(tmp_path.iterdir()), is_(empty()))
+
+
+def test_records_spooled_while_circuit_open(firehose: MagicMock, tmp_path: Path):
+    # Given
+    firehose.put_record_batch.side_effect = ClientError(
+        {"Error": {"Code": "ServiceUnavailableException", "Message": "slow down"}}, "PutRecordBatch"
+    )
+    circuit_breaker = CircuitBreaker("firehose", CircuitBreakerSettings(window=1))
+    audit_service = AuditService(
+        firehose,
+        STREAM,
+        batch_max_age=60,
+        max_attempts=1,
+        circuit_breaker=circuit_breaker,
+        spool_dir=tmp_path,
+        spool_max_bytes=1024,
+    )
+    audit_service.audit({"n": 0})
+    audit_service.flush()
+
+    # When
+    audit_service.audit({"n": 1})
+    audit_service.flush()
+
+    # Then
+    assert_that(firehose.put_record_batch.call_count, equal_to(1))
+    assert_that(audit_service.stats, has_properties(spooled=2, dropped=0))
+
+
+def test_aggregated_encoding_packs_records_into_one_firehose_record(firehose: MagicMock):
+    # Given
+    audit_service = AuditService(firehose, STREAM, batch_max_age=60, encoding="aggregated")
+    for i in range(3):
+        audit_service.audit({"n": i})
+
+    # When
+    audit_service.flush()
+
+    # Then
+    (call,) = firehose.put_record_batch.call_args_list
+    (record,) = call.kwargs["Records"]
+    assert_that(list(decode_audit_records(record["Data"])), contains_exactly({"n": 0}, {"n": 1}, {"n": 2}))
+
+
+def test_unsent_aggregated_records_spooled_individually(firehose: MagicMock, tmp_path: Path):
+    # Given
+    firehose.put_record_batch.side_effect = ClientError(
+        {"Error": {"Code": "ServiceUnavailableException", "Message": "slow down"}}, "PutRecordBatch"
+    )
+    audit_service = AuditService(
+        firehose,
+        STREAM,
+        batch_max_age=60,
+        max_attempts=1,
+        spool_dir=tmp_path,
+        spool_max_bytes=1024,
+        encoding="aggregated",
+    )
+    audit_service.audit({"n": 0})
+    audit_service.audit({"n": 1})
+
+    # When
+    audit_service.flush()
+
+    # Then
+    assert_that(audit_service.stats, has_properties(spooled=2))
+    assert_that(audit_service.spool, has_properties(stats=has_properties(spooled=2)))
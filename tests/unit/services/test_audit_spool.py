@@ -0,0 +1,65 @@
+import gzip
+from pathlib import Path
+
+from hamcrest import assert_that, contains_exactly, empty, has_length, has_properties, is_
+
+from eligibility_signposting_api.services.audit_spool import AuditSpool
+
+
+def test_records_taken_back_oldest_segment_first(tmp_path: Path):
+    # Given
+    spool = AuditSpool(tmp_path, max_bytes=1024 * 1024, segment_max_bytes=1)
+    spool.write([b"0\n", b"1\n"])
+    spool.write([b"2\n"])
+
+    # When
+    first, second, third = spool.take(), spool.take(), spool.take()
+
+    # Then
+    assert_that(first, contains_exactly(b"0\n", b"1\n"))
+    assert_that(second, contains_exactly(b"2\n"))
+    assert_that(third, is_(empty()))
+    assert_that(spool.is_empty(), is_(True))
+    assert_that(spool.stats, has_properties(spooled=3, taken=3, segments=2))
+
+
+def test_writes_appended_to_segment_until_rotated(tmp_path: Path):
+    # Given
+    spool = AuditSpool(tmp_path, max_bytes=1024 * 1024)
+
+    # When
+    spool.write([b"0\n"])
+    spool.write([b"1\n"])
+
+    # Then
+    segments = list(tmp_path.iterdir())
+    assert_that(segments, has_length(1))
+    assert_that(gzip.decompress(segments[0].read_bytes()), is_(b"0\n1\n"))
+    assert_that(spool.take(), contains_exactly(b"0\n", b"1\n"))
+
+
+def test_full_spool_refuses_records(tmp_path: Path):
+    # Given
+    spool = AuditSpool(tmp_path, max_bytes=30)
+    written = spool.write([b"0\n"])
+
+    # When
+    actual = spool.write([b"1\n"])
+
+    # Then
+    assert_that(written, is_(True))
+    assert_that(actual, is_(False))
+    assert_that(spool.take(), contains_exactly(b"0\n"))
+
+
+def test_unreadable_segment_discarded(tmp_path: Path):
+    # Given
+    spool = AuditSpool(tmp_path, max_bytes=1024)
+    (tmp_path / "00000000000000000001.ndjson.gz").write_bytes(b"not gzip")
+
+    # When
+    actual = spool.take()
+
+    # Then
+    assert_that(actual, is_(empty()))
+    assert_that(spool.is_empty(), is_(True))
@@ -1,13 +1,21 @@
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
 
 import pytest
-from hamcrest import assert_that, empty
+from hamcrest import assert_that, empty, has_length, instance_of, is_, none
 
+from eligibility_signposting_api.deadline import DeadlineExceededError, deadline
 from eligibility_signposting_api.model.eligibility import NHSNumber
-from eligibility_signposting_api.repos import CampaignRepo, NotFoundError, PersonRepo
+from eligibility_signposting_api.repos import CampaignRepo, FetchPlan, NotFoundError, PersonRepo
 from eligibility_signposting_api.services import EligibilityService, UnknownPersonError
+from eligibility_signposting_api.services.audit_record import EligibilityAuditRecord
 from eligibility_signposting_api.services.audit_service import AuditService
 from eligibility_signposting_api.services.calculators.eligibility_calculator import EligibilityCalculatorFactory
+from eligibility_signposting_api.services.rules.result_cache import OperatorResultCache
+from tests.fixtures.builders.model import rule as rule_builder
+from tests.fixtures.builders.model.eligibility import EligibilityStatusFactory
 from tests.fixtures.matchers.eligibility import is_eligibility_status
 
 
@@ -17,7 +25,9 @@ def test_eligibility_service_returns_from_repo():
     campaign_repo = MagicMock(spec=CampaignRepo)
     audit_service = MagicMock(spec=AuditService)
     person_repo.get_eligibility = MagicMock(return_value=[])
-    service = EligibilityService(person_repo, campaign_repo, audit_service, EligibilityCalculatorFactory())
+    service = EligibilityService(
+        person_repo, campaign_repo, audit_service, EligibilityCalculatorFactory(OperatorResultCache())
+    )
 
     # When
     actual = service.get_eligibility_status(NHSNumber("1234567890"))
@@ -32,8 +42,204 @@ def test_eligibility_service_for_nonexistent_nhs_number():
     campaign_repo = MagicMock(spec=CampaignRepo)
     audit_service = MagicMock(spec=AuditService)
     person_repo.get_eligibility_data = MagicMock(side_effect=NotFoundError)
-    service = EligibilityService(person_repo, campaign_repo, audit_service, EligibilityCalculatorFactory())
+    service = EligibilityService(
+        person_repo, campaign_repo, audit_service, EligibilityCalculatorFactory(OperatorResultCache())
+    )
 
     # When
     with pytest.raises(UnknownPersonError):
         service.get_eligibility_status(NHSNumber("1234567890"))
+
+
+def test_eligibility_service_reads_only_data_rules_need():
+    # Given
+    person_repo = MagicMock(spec=PersonRepo)
+    campaign_repo = MagicMock(spec=CampaignRepo)
+    audit_service = MagicMock(spec=AuditService)
+    person_repo.get_eligibility_data = MagicMock(return_value=[])
+    campaign_repo.get_campaign_configs = MagicMock(return_value=[rule_builder.CampaignConfigFactory.build()])
+    service = EligibilityService(
+        person_repo, campaign_repo, audit_service, EligibilityCalculatorFactory(OperatorResultCache())
+    )
+
+    # When
+    service.get_eligibility_status(NHSNumber("1234567890"))
+    service.get_eligibility_status(NHSNumber("1234567890"))
+
+    # Then
+    first_plan, second_plan = (c.args[1] for c in person_repo.get_eligibility_data.call_args_list)
+    assert_that(first_plan, is_(instance_of(FetchPlan)))
+    assert_that(second_plan, is_(first_plan))
+
+
+@pytest.fixture
+def executor() -> Iterator[ThreadPoolExecutor]:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def test_eligibility_service_reads_person_and_campaigns_concurrently(executor: ThreadPoolExecutor):
+    # Given
+    person_repo = MagicMock(spec=PersonRepo)
+    campaign_repo = MagicMock(spec=CampaignRepo)
+    campaigns_being_read = threading.Event()
+
+    def get_eligibility_data(*_):
+        # Only returns if the campaign configs are being read at the same time.
+        return [] if campaigns_being_read.wait(timeout=5) else None
+
+    def get_campaign_configs():
+        campaigns_being_read.set()
+        return [rule_builder.CampaignConfigFactory.build()]
+
+    person_repo.get_eligibility_data = MagicMock(side_effect=get_eligibility_data)
+    campaign_repo.get_campaign_configs = MagicMock(side_effect=get_campaign_configs)
+    service = EligibilityService(
+        person_repo,
+        campaign_repo,
+        MagicMock(spec=AuditService),
+        EligibilityCalculatorFactory(OperatorResultCache()),
+        executor,
+    )
+
+    # When
+    campaign_configs, person_data = service.fetch(NHSNumber("1234567890"))
+
+    # Then
+    assert_that(campaign_configs, has_length(1))
+    assert_that(person_data, is_(empty()))
+
+
+def test_eligibility_service_reading_concurrently_for_nonexistent_nhs_number(executor: ThreadPoolExecutor):
+    # Given
+    person_repo = MagicMock(spec=PersonRepo)
+    person_repo.get_eligibility_data = MagicMock(side_effect=NotFoundError)
+    service = EligibilityService(
+        person_repo,
+        MagicMock(spec=CampaignRepo),
+        MagicMock(spec=AuditService),
+        EligibilityCalculatorFactory(OperatorResultCache()),
+        executor,
+    )
+
+    # When
+    with pytest.raises(UnknownPersonError):
+        service.get_eligibility_status(NHSNumber("1234567890"))
+
+
+def test_eligibility_service_reading_concurrently_reports_campaign_errors_first(executor: ThreadPoolExecutor):
+    # Given
+    person_repo = MagicMock(spec=PersonRepo)
+    person_repo.get_eligibility_data = MagicMock(side_effect=NotFoundError)
+    campaign_repo = MagicMock(spec=CampaignRepo)
+    campaign_repo.get_campaign_configs = MagicMock(side_effect=ValueError)
+    service = EligibilityService(
+        person_repo,
+        campaign_repo,
+        MagicMock(spec=AuditService),
+        EligibilityCalculatorFactory(OperatorResultCache()),
+        executor,
+    )
+
+    # When
+    with pytest.raises(ValueError):  # noqa: PT011
+        service.get_eligibility_status(NHSNumber("1234567890"))
+
+
+def test_eligibility_service_reading_concurrently_rereads_person_when_rules_need_more(executor: ThreadPoolExecutor):
+    # Given
+    person_repo = MagicMock(spec=PersonRepo)
+    person_repo.get_eligibility_data = MagicMock(return_value=[])
+    campaign_repo = MagicMock(spec=CampaignRepo)
+    before = rule_builder.CampaignConfigFactory.build(
+        iterations=[rule_builder.IterationFactory.build(iteration_rules=[])]
+    )
+    after = rule_builder.CampaignConfigFactory.build(
+        iterations=[
+            rule_builder.IterationFactory.build(iteration_rules=[rule_builder.PersonAgeSuppressionRuleFactory.build()])
+        ]
+    )
+    campaign_repo.get_campaign_configs = MagicMock(side_effect=[[before], [before], [after]])
+    service = EligibilityService(
+        person_repo,
+        campaign_repo,
+        MagicMock(spec=AuditService),
+        EligibilityCalculatorFactory(OperatorResultCache()),
+        executor,
+    )
+
+    # When
+    for _ in range(3):
+        service.fetch(NHSNumber("1234567890"))
+
+    # Then
+    plans = [c.args[1] for c in person_repo.get_eligibility_data.call_args_list]
+    assert_that(plans, has_length(4))
+    first, second, third, reread = plans
+    assert_that(first, is_(none()))
+    assert_that(second, is_(FetchPlan.for_campaign_configs([before])))
+    assert_that(third, is_(second))
+    assert_that(reread, is_(FetchPlan.for_campaign_configs([after])))
+
+
+def test_eligibility_service_audits_decision():
+    # Given
+    audit_service = MagicMock(spec=AuditService)
+    service = EligibilityService(
+        MagicMock(spec=PersonRepo),
+        MagicMock(spec=CampaignRepo),
+        audit_service,
+        EligibilityCalculatorFactory(OperatorResultCache()),
+        optional_work_margin=1.0,
+    )
+    audit_record = EligibilityAuditRecord(
+        NHSNumber("1234567890"), EligibilityStatusFactory.build(), b"{}", include_actions=False
+    )
+
+    # When
+    with deadline(5):
+        service.audit(audit_record)
+
+    # Then
+    audit_service.audit.assert_called_once_with(audit_record)
+
+
+def test_eligibility_service_skips_audit_near_deadline():
+    # Given
+    audit_service = MagicMock(spec=AuditService)
+    service = EligibilityService(
+        MagicMock(spec=PersonRepo),
+        MagicMock(spec=CampaignRepo),
+        audit_service,
+        EligibilityCalculatorFactory(OperatorResultCache()),
+        optional_work_margin=1.0,
+    )
+    audit_record = EligibilityAuditRecord(
+        NHSNumber("1234567890"), EligibilityStatusFactory.build(), b"{}", include_actions=False
+    )
+
+    # When
+    with deadline(0.5):
+        service.audit(audit_record)
+
+    # Then
+    audit_service.audit.assert_not_called()
+
+
+def test_eligibility_service_waits_for_person_data_only_until_deadline(executor: ThreadPoolExecutor):
+    # Given
+    person_repo = MagicMock(spec=PersonRepo)
+    unblock = threading.Event()
+    person_repo.get_eligibility_data = MagicMock(side_effect=lambda *_: unblock.wait(timeout=5))
+    service = EligibilityService(
+        person_repo,
+        MagicMock(spec=CampaignRepo),
+        MagicMock(spec=AuditService),
+        EligibilityCalculatorFactory(OperatorResultCache()),
+        executor,
+    )
+
+    # When
+    with deadline(0.1), pytest.raises(DeadlineExceededError):
+        service.get_eligibility_status(NHSNumber("1234567890"))
+    unblock.set()
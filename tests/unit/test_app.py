@@ -0,0 +1,97 @@
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+from flask import Flask
+from hamcrest import assert_that, contains_string, is_, less_than
+from wireup.integration.flask import get_app_container
+
+from eligibility_signposting_api.app import end_invocation, warm_up_connections
+from eligibility_signposting_api.deadline import deadline
+from eligibility_signposting_api.repos import CampaignRepo, PersonRepo
+from eligibility_signposting_api.services.audit_service import AuditService
+
+
+@pytest.fixture
+def repos(app: Flask) -> Iterator[dict[type, MagicMock]]:
+    repos = {cls: MagicMock(spec=cls) for cls in (PersonRepo, CampaignRepo, AuditService)}
+    with ExitStack() as stack:
+        for cls, mock in repos.items():
+            stack.enter_context(get_app_container(app).override.service(cls, new=mock))
+        yield repos
+
+
+def test_warm_up_connections(app: Flask, repos: dict[type, MagicMock]):
+    # When
+    warm_up_connections(app, timeout=1)
+
+    # Then
+    for repo in repos.values():
+        repo.warm_up.assert_called_once_with()
+
+
+def test_warm_up_connections_disabled(app: Flask, repos: dict[type, MagicMock]):
+    # When
+    warm_up_connections(app, timeout=0)
+
+    # Then
+    for repo in repos.values():
+        repo.warm_up.assert_not_called()
+
+
+def test_warm_up_connections_gives_up_after_timeout(app: Flask, repos: dict[type, MagicMock]):
+    # Given
+    unblock = threading.Event()
+    repos[CampaignRepo].warm_up.side_effect = lambda: unblock.wait(timeout=5)
+
+    # When
+    start = time.monotonic()
+    warm_up_connections(app, timeout=0.1)
+    elapsed = time.monotonic() - start
+    unblock.set()
+
+    # Then
+    assert_that(elapsed, is_(less_than(1)))
+    repos[PersonRepo].warm_up.assert_called_once_with()
+
+
+def test_warm_up_connections_logs_failures(app: Flask, repos: dict[type, MagicMock], caplog: pytest.LogCaptureFixture):
+    # Given
+    repos[AuditService].warm_up.side_effect = ClientError({"Error": {"Code": "AccessDenied"}}, "DescribeDeliveryStream")
+
+    # When
+    with caplog.at_level(logging.INFO):
+        warm_up_connections(app, timeout=1)
+
+    # Then
+    assert_that(caplog.text, contains_string("warming up firehose connections failed"))
+
+
+def test_end_invocation_flushes_audit_records(app: Flask, repos: dict[type, MagicMock]):
+    # When
+    end_invocation(app)
+
+    # Then
+    repos[AuditService].flush.assert_called_once_with()
+
+
+def test_end_invocation_returns_by_deadline_while_flush_still_sending(app: Flask, repos: dict[type, MagicMock]):
+    # Given
+    release = threading.Event()
+    repos[AuditService].flush.side_effect = lambda: release.wait(timeout=5)
+
+    # When
+    start = time.monotonic()
+    with deadline(0.1):
+        end_invocation(app)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    # Then
+    assert_that(elapsed, is_(less_than(1)))
+    repos[AuditService].flush.assert_called_once_with()
@@ -0,0 +1,118 @@
+import sys
+from collections import OrderedDict
+
+from freezegun import freeze_time
+from hamcrest import assert_that, equal_to, greater_than, has_properties, is_, less_than, none
+
+from eligibility_signposting_api.caching import LruCache, deep_sizeof
+
+
+def test_lru_cache_evicts_least_recently_used():
+    # Given
+    cache: LruCache[str, int] = LruCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+
+    # When
+    cache.put("c", 3)
+
+    # Then
+    assert_that(cache.get("a"), is_(equal_to(1)))
+    assert_that(cache.get("b"), is_(none()))
+    assert_that(cache.get("c"), is_(equal_to(3)))
+    assert_that(cache.stats, has_properties(hits=3, misses=1, evictions=1))
+
+
+def test_lru_cache_with_no_entries_is_disabled():
+    # Given
+    cache: LruCache[str, int] = LruCache(max_entries=0)
+
+    # When
+    cache.put("a", 1)
+
+    # Then
+    assert_that(cache.get("a"), is_(none()))
+    assert_that(len(cache), is_(equal_to(0)))
+
+
+def test_lru_cache_discard_where():
+    # Given
+    cache: LruCache[str, int] = LruCache(max_entries=10)
+    for key, value in (("a", 1), ("bb", 2), ("cc", 3)):
+        cache.put(key, value)
+
+    # When
+    cache.discard_where(lambda key: len(key) > 1)
+
+    # Then
+    assert_that(len(cache), is_(equal_to(1)))
+    assert_that(cache.get("a"), is_(equal_to(1)))
+
+
+def test_lru_cache_reports_footprint():
+    # Given
+    cache: LruCache[str, str] = LruCache(max_entries=10)
+    empty_footprint = cache.footprint
+
+    # When
+    cache.put("key", "x" * 1000)
+
+    # Then
+    assert_that(cache.footprint, is_(greater_than(empty_footprint + 1000)))
+
+
+def test_lru_cache_entries_expire():
+    # Given
+    cache: LruCache[str, int] = LruCache(max_entries=10, ttl=5)
+
+    # When
+    with freeze_time("2025-04-25 12:00:00") as frozen_time:
+        cache.put("a", 1)
+        frozen_time.tick(4)
+        before = cache.get("a")
+        frozen_time.tick(2)
+        after = cache.get("a")
+
+    # Then
+    assert_that(before, is_(equal_to(1)))
+    assert_that(after, is_(none()))
+    assert_that(cache.stats, has_properties(hits=1, misses=1, expirations=1))
+    assert_that(len(cache), is_(equal_to(0)))
+
+
+def test_lru_cache_bounded_by_memory():
+    # Given
+    cache: LruCache[str, str] = LruCache(max_entries=10, max_bytes=3000)
+
+    # When
+    for key in ("a", "b", "c"):
+        cache.put(key, key * 1000)
+
+    # Then
+    assert_that(cache.get("a"), is_(none()))
+    assert_that(cache.get("c"), is_(equal_to("c" * 1000)))
+    assert_that(cache.stats, has_properties(evictions=greater_than(0)))
+    assert_that(cache.footprint, is_(less_than(3000 + sys.getsizeof(OrderedDict()) + 1000)))
+
+
+def test_lru_cache_ignores_values_bigger_than_memory_bound():
+    # Given
+    cache: LruCache[str, str] = LruCache(max_entries=10, max_bytes=100)
+
+    # When
+    cache.put("a", "a" * 1000)
+
+    # Then
+    assert_that(len(cache), is_(equal_to(0)))
+
+
+def test_deep_sizeof_includes_contents():
+    # Given
+    rows = [{"NHS_NUMBER": "1234567890", "POSTCODE": "x" * 1000}]
+
+    # When
+    actual = deep_sizeof(rows)
+
+    # Then
+    assert_that(actual, is_(greater_than(sys.getsizeof(rows) + 1000)))
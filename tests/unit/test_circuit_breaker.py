@@ -0,0 +1,228 @@
+from collections.abc import Callable
+from contextlib import suppress
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+from freezegun import freeze_time
+from hamcrest import assert_that, equal_to, has_properties, is_
+
+from eligibility_signposting_api.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerSettings,
+    CircuitOpenError,
+    CircuitState,
+)
+
+SETTINGS = CircuitBreakerSettings(
+    window=4, failure_rate=0.5, slow_call_seconds=1.0, slow_call_rate=0.75, open_seconds=30.0
+)
+
+
+def succeed() -> str:
+    return "ok"
+
+
+def fail() -> str:
+    raise ClientError({"Error": {"Code": "ServiceUnavailable", "Message": "unavailable"}}, "Query")
+
+
+def call_quietly(circuit_breaker: CircuitBreaker, dependency_call: Callable[[], str]) -> None:
+    with suppress(ClientError):
+        circuit_breaker.call(dependency_call)
+
+
+def test_disabled_circuit_breaker_never_opens():
+    # Given
+    circuit_breaker = CircuitBreaker("dynamodb", CircuitBreakerSettings())
+
+    # When
+    for _ in range(10):
+        call_quietly(circuit_breaker, fail)
+
+    # Then
+    assert_that(circuit_breaker.state, is_(CircuitState.closed))
+    assert_that(circuit_breaker.call(succeed), is_("ok"))
+
+
+def test_circuit_opens_when_failure_rate_reached():
+    # Given
+    circuit_breaker = CircuitBreaker("dynamodb", SETTINGS)
+    calls: list[str] = []
+
+    # When
+    call_quietly(circuit_breaker, succeed)
+    call_quietly(circuit_breaker, succeed)
+    call_quietly(circuit_breaker, fail)
+    assert_that(circuit_breaker.state, is_(CircuitState.closed))
+    call_quietly(circuit_breaker, fail)
+
+    # Then
+    assert_that(circuit_breaker.state, is_(CircuitState.open))
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.call(lambda: calls.append("called"))
+    assert_that(calls, equal_to([]))
+    assert_that(circuit_breaker.stats, has_properties(calls=4, failures=2, rejections=1, openings=1))
+
+
+def test_circuit_needs_enough_calls_before_opening():
+    # Given
+    circuit_breaker = CircuitBreaker("dynamodb", SETTINGS)
+
+    # When
+    call_quietly(circuit_breaker, fail)
+
+    # Then
+    assert_that(circuit_breaker.state, is_(CircuitState.closed))
+
+
+def test_circuit_opens_when_slow_call_rate_reached():
+    # Given
+    circuit_breaker = CircuitBreaker("s3", SETTINGS)
+
+    with freeze_time("2025-04-25 12:00:00") as frozen_time:
+
+        def slow() -> str:
+            frozen_time.tick(2)
+            return "ok"
+
+        # When
+        circuit_breaker.call(succeed)
+        for _ in range(3):
+            circuit_breaker.call(slow)
+
+    # Then
+    assert_that(circuit_breaker.state, is_(CircuitState.open))
+    assert_that(circuit_breaker.stats, has_properties(calls=4, failures=0, slow_calls=3))
+
+
+def test_other_errors_are_not_counted_as_failures():
+    # Given
+    circuit_breaker = CircuitBreaker("dynamodb", SETTINGS)
+
+    def broken() -> str:
+        raise ValueError
+
+    # When
+    for _ in range(4):
+        with pytest.raises(ValueError):  # noqa: PT011
+            circuit_breaker.call(broken)
+
+    # Then
+    assert_that(circuit_breaker.state, is_(CircuitState.closed))
+    assert_that(circuit_breaker.stats, has_properties(calls=0, failures=0))
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ClientError({"Error": {"Code": "NoSuchKey"}, "ResponseMetadata": {"HTTPStatusCode": 404}}, "GetObject"),
+        ClientError({"Error": {"Code": "ValidationException"}, "ResponseMetadata": {"HTTPStatusCode": 400}}, "Query"),
+        ClientError(
+            {"Error": {"Code": "ResourceNotFoundException"}, "ResponseMetadata": {"HTTPStatusCode": 400}}, "Query"
+        ),
+    ],
+)
+def test_caller_errors_are_not_counted_as_failures(error: ClientError):
+    # Given
+    circuit_breaker = CircuitBreaker("dynamodb", SETTINGS)
+
+    def rejected() -> str:
+        raise error
+
+    # When
+    for _ in range(4):
+        call_quietly(circuit_breaker, rejected)
+
+    # Then
+    assert_that(circuit_breaker.state, is_(CircuitState.closed))
+    assert_that(circuit_breaker.stats, has_properties(calls=0, failures=0))
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException"}, "ResponseMetadata": {"HTTPStatusCode": 400}},
+            "Query",
+        ),
+        ClientError({"Error": {"Code": "SlowDown"}, "ResponseMetadata": {"HTTPStatusCode": 503}}, "GetObject"),
+        ClientError({"Error": {"Code": "Unknown"}, "ResponseMetadata": {"HTTPStatusCode": 502}}, "PutRecordBatch"),
+        EndpointConnectionError(endpoint_url="https://dynamodb.eu-west-2.amazonaws.com"),
+    ],
+)
+def test_dependency_errors_are_counted_as_failures(error: Exception):
+    # Given
+    circuit_breaker = CircuitBreaker("dynamodb", SETTINGS)
+
+    def failing() -> str:
+        raise error
+
+    # When
+    for _ in range(2):
+        with suppress(type(error)):
+            circuit_breaker.call(failing)
+
+    # Then
+    assert_that(circuit_breaker.state, is_(CircuitState.open))
+    assert_that(circuit_breaker.stats, has_properties(calls=2, failures=2))
+
+
+def test_successful_probe_closes_circuit():
+    # Given
+    circuit_breaker = CircuitBreaker("dynamodb", SETTINGS)
+    with freeze_time("2025-04-25 12:00:00") as frozen_time:
+        for _ in range(2):
+            call_quietly(circuit_breaker, fail)
+        frozen_time.tick(29)
+        with pytest.raises(CircuitOpenError):
+            circuit_breaker.call(succeed)
+
+        # When
+        frozen_time.tick(1)
+        actual = circuit_breaker.call(succeed)
+
+    # Then
+    assert_that(actual, is_("ok"))
+    assert_that(circuit_breaker.state, is_(CircuitState.closed))
+    call_quietly(circuit_breaker, fail)
+    assert_that(circuit_breaker.state, is_(CircuitState.closed))
+
+
+def test_failed_probe_reopens_circuit():
+    # Given
+    circuit_breaker = CircuitBreaker("dynamodb", SETTINGS)
+    with freeze_time("2025-04-25 12:00:00") as frozen_time:
+        for _ in range(2):
+            call_quietly(circuit_breaker, fail)
+        frozen_time.tick(30)
+
+        # When
+        call_quietly(circuit_breaker, fail)
+
+        # Then
+        assert_that(circuit_breaker.state, is_(CircuitState.open))
+        assert_that(circuit_breaker.stats, has_properties(openings=2))
+        frozen_time.tick(29)
+        with pytest.raises(CircuitOpenError):
+            circuit_breaker.call(succeed)
+
+
+def test_only_one_probe_at_a_time():
+    # Given
+    circuit_breaker = CircuitBreaker("firehose", SETTINGS)
+    with freeze_time("2025-04-25 12:00:00") as frozen_time:
+        for _ in range(2):
+            call_quietly(circuit_breaker, fail)
+        frozen_time.tick(30)
+
+        def probe() -> str:
+            with pytest.raises(CircuitOpenError):
+                circuit_breaker.call(succeed)
+            return "probed"
+
+        # When
+        actual = circuit_breaker.call(probe)
+
+    # Then
+    assert_that(actual, is_("probed"))
+    assert_that(circuit_breaker.state, is_(CircuitState.closed))
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 
 import pytest
 from yarl import URL
@@ -14,7 +15,7 @@ def clear_config_cache(monkeypatch):
     monkeypatch.delenv("ENV", raising=False)
 
 
-def test_config_with_env_variable(monkeypatch):
+def test_config_with_env_variable(monkeypatch):  # noqa: PLR0915 - an assertion for each setting
     # Given:
     monkeypatch.setenv("ENV", "PROD")
 
@@ -31,9 +32,51 @@ def test_config_with_env_variable(monkeypatch):
     assert config_data_with_env["s3_endpoint"] is None
     assert config_data_with_env["rules_bucket_name"] == BucketName("test-rules-bucket")
     assert config_data_with_env["log_level"] == LOG_LEVEL
+    assert config_data_with_env["operator_result_cache_size"] == 0
+    assert config_data_with_env["person_table_low_level_client"] is False
+    assert config_data_with_env["person_table_compact_layout"] is False
+    assert config_data_with_env["person_cache_size"] == 0
+    assert config_data_with_env["person_cache_ttl_seconds"] == pytest.approx(5)
+    assert config_data_with_env["person_cache_max_bytes"] == 16 * 1024 * 1024
+    assert config_data_with_env["person_not_found_cache_size"] == 0
+    assert config_data_with_env["person_not_found_cache_ttl_seconds"] == pytest.approx(10)
+    assert config_data_with_env["person_filter_bucket_name"] is None
+    assert config_data_with_env["person_filter_key"] == "person_filter/known_people.bloom"
+    assert config_data_with_env["person_filter_refresh_seconds"] == pytest.approx(300)
+    assert config_data_with_env["fetch_pool_size"] == 4  # noqa: PLR2004
+    assert config_data_with_env["aws_max_pool_connections"] == 10  # noqa: PLR2004
+    assert config_data_with_env["aws_tcp_keepalive"] is True
+    assert config_data_with_env["aws_retry_mode"] == "adaptive"
+    assert config_data_with_env["aws_max_attempts"] == 3  # noqa: PLR2004
+    assert config_data_with_env["dynamodb_connect_timeout"] == pytest.approx(1)
+    assert config_data_with_env["dynamodb_read_timeout"] == pytest.approx(2)
+    assert config_data_with_env["s3_connect_timeout"] == pytest.approx(1)
+    assert config_data_with_env["s3_read_timeout"] == pytest.approx(3)
+    assert config_data_with_env["firehose_connect_timeout"] == pytest.approx(1)
+    assert config_data_with_env["firehose_read_timeout"] == pytest.approx(3)
+    assert config_data_with_env["connection_warm_up_timeout"] == pytest.approx(2)
+    assert config_data_with_env["request_budget_seconds"] == pytest.approx(25)
+    assert config_data_with_env["optional_work_margin_seconds"] == pytest.approx(1)
+    assert config_data_with_env["person_read_hedge_percentile"] == pytest.approx(0)
+    assert config_data_with_env["person_read_hedge_max_rate"] == pytest.approx(0.05)
+    assert config_data_with_env["person_read_hedge_min_delay_seconds"] == pytest.approx(0.005)
+    assert config_data_with_env["circuit_breaker_window"] == 0
+    assert config_data_with_env["circuit_breaker_failure_rate"] == pytest.approx(0.5)
+    assert config_data_with_env["circuit_breaker_slow_call_seconds"] == pytest.approx(1)
+    assert config_data_with_env["circuit_breaker_slow_call_rate"] == pytest.approx(0.8)
+    assert config_data_with_env["circuit_breaker_open_seconds"] == pytest.approx(30)
+    assert config_data_with_env["audit_batch_max_records"] == 500  # noqa: PLR2004
+    assert config_data_with_env["audit_batch_max_bytes"] == 4 * 1024 * 1024
+    assert config_data_with_env["audit_batch_max_age_seconds"] == pytest.approx(1)
+    assert config_data_with_env["audit_max_attempts"] == 3  # noqa: PLR2004
+    assert config_data_with_env["audit_queue_size"] == 0
+    assert config_data_with_env["audit_queue_overflow_policy"] == "drop_oldest"
+    assert config_data_with_env["audit_spool_dir"] == Path("/tmp/audit-spool")  # noqa: S108
+    assert config_data_with_env["audit_spool_max_bytes"] == 64 * 1024 * 1024
+    assert config_data_with_env["audit_encoding"] == "json"
 
 
-def test_config_without_env_variable():
+def test_config_without_env_variable():  # noqa: PLR0915 - an assertion for each setting
     # Given: The environment variable "ENV" isn't set
     # When:
     config_data_without_env = config()
@@ -48,3 +91,45 @@ def test_config_without_env_variable():
     assert config_data_without_env["s3_endpoint"] == URL("http://localhost:4566")
     assert config_data_without_env["rules_bucket_name"] == BucketName("test-rules-bucket")
     assert config_data_without_env["log_level"] == LOG_LEVEL
+    assert config_data_without_env["operator_result_cache_size"] == 0
+    assert config_data_without_env["person_table_low_level_client"] is False
+    assert config_data_without_env["person_table_compact_layout"] is False
+    assert config_data_without_env["person_cache_size"] == 0
+    assert config_data_without_env["person_cache_ttl_seconds"] == pytest.approx(5)
+    assert config_data_without_env["person_cache_max_bytes"] == 16 * 1024 * 1024
+    assert config_data_without_env["person_not_found_cache_size"] == 0
+    assert config_data_without_env["person_not_found_cache_ttl_seconds"] == pytest.approx(10)
+    assert config_data_without_env["person_filter_bucket_name"] is None
+    assert config_data_without_env["person_filter_key"] == "person_filter/known_people.bloom"
+    assert config_data_without_env["person_filter_refresh_seconds"] == pytest.approx(300)
+    assert config_data_without_env["fetch_pool_size"] == 4  # noqa: PLR2004
+    assert config_data_without_env["aws_max_pool_connections"] == 10  # noqa: PLR2004
+    assert config_data_without_env["aws_tcp_keepalive"] is True
+    assert config_data_without_env["aws_retry_mode"] == "adaptive"
+    assert config_data_without_env["aws_max_attempts"] == 3  # noqa: PLR2004
+    assert config_data_without_env["dynamodb_connect_timeout"] == pytest.approx(1)
+    assert config_data_without_env["dynamodb_read_timeout"] == pytest.approx(2)
+    assert config_data_without_env["s3_connect_timeout"] == pytest.approx(1)
+    assert config_data_without_env["s3_read_timeout"] == pytest.approx(3)
+    assert config_data_without_env["firehose_connect_timeout"] == pytest.approx(1)
+    assert config_data_without_env["firehose_read_timeout"] == pytest.approx(3)
+    assert config_data_without_env["connection_warm_up_timeout"] == pytest.approx(2)
+    assert config_data_without_env["request_budget_seconds"] == pytest.approx(25)
+    assert config_data_without_env["optional_work_margin_seconds"] == pytest.approx(1)
+    assert config_data_without_env["person_read_hedge_percentile"] == pytest.approx(0)
+    assert config_data_without_env["person_read_hedge_max_rate"] == pytest.approx(0.05)
+    assert config_data_without_env["person_read_hedge_min_delay_seconds"] == pytest.approx(0.005)
+    assert config_data_without_env["circuit_breaker_window"] == 0
+    assert config_data_without_env["circuit_breaker_failure_rate"] == pytest.approx(0.5)
+    assert config_data_without_env["circuit_breaker_slow_call_seconds"] == pytest.approx(1)
+    assert config_data_without_env["circuit_breaker_slow_call_rate"] == pytest.approx(0.8)
+    assert config_data_without_env["circuit_breaker_open_seconds"] == pytest.approx(30)
+    assert config_data_without_env["audit_batch_max_records"] == 500  # noqa: PLR2004
+    assert config_data_without_env["audit_batch_max_bytes"] == 4 * 1024 * 1024
+    assert config_data_without_env["audit_batch_max_age_seconds"] == pytest.approx(1)
+    assert config_data_without_env["audit_max_attempts"] == 3  # noqa: PLR2004
+    assert config_data_without_env["audit_queue_size"] == 0
+    assert config_data_without_env["audit_queue_overflow_policy"] == "drop_oldest"
+    assert config_data_without_env["audit_spool_dir"] == Path("/tmp/audit-spool")  # noqa: S108
+    assert config_data_without_env["audit_spool_max_bytes"] == 64 * 1024 * 1024
+    assert config_data_without_env["audit_encoding"] == "json"
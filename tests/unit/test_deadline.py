@@ -0,0 +1,52 @@
+import pytest
+from freezegun import freeze_time
+from hamcrest import assert_that, close_to, is_, none
+
+from eligibility_signposting_api.config.config import AwsAccessKey, AwsRegion, AwsSecretAccessKey
+from eligibility_signposting_api.deadline import (
+    DeadlineExceededError,
+    check_deadline,
+    deadline,
+    has_time_for,
+    remaining,
+)
+from eligibility_signposting_api.repos.factory import boto3_session_factory
+
+
+def test_no_deadline_by_default():
+    assert_that(remaining(), is_(none()))
+    assert_that(has_time_for(1000), is_(True))
+
+
+def test_deadline_counts_down():
+    with freeze_time("2025-04-25 12:00:00") as frozen_time, deadline(10):
+        frozen_time.tick(3)
+
+        assert_that(remaining(), is_(close_to(7, 0.01)))
+        assert_that(has_time_for(5), is_(True))
+        assert_that(has_time_for(8), is_(False))
+
+
+def test_nested_deadline_cannot_extend_outer_one():
+    with freeze_time("2025-04-25 12:00:00"), deadline(5):
+        with deadline(10):
+            assert_that(remaining(), is_(close_to(5, 0.01)))
+        with deadline(2):
+            assert_that(remaining(), is_(close_to(2, 0.01)))
+        assert_that(remaining(), is_(close_to(5, 0.01)))
+    assert_that(remaining(), is_(none()))
+
+
+def test_check_deadline():
+    with deadline(-1), pytest.raises(DeadlineExceededError, match="deadline passed before reading"):
+        check_deadline("reading")
+
+
+def test_aws_calls_refused_after_deadline():
+    # Given
+    session = boto3_session_factory(AwsRegion("eu-west-1"), AwsAccessKey("dummy"), AwsSecretAccessKey("dummy"))
+    client = session.client("dynamodb", endpoint_url="http://127.0.0.1:9")
+
+    # When, Then
+    with deadline(-1), pytest.raises(DeadlineExceededError, match="dynamodb.ListTables"):
+        client.list_tables()
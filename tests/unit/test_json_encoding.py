@@ -0,0 +1,115 @@
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from enum import Enum, StrEnum
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from hamcrest import assert_that, equal_to
+
+from eligibility_signposting_api.json_encoding import (
+    FastJSONProvider,
+    JsonBackend,
+    dumps,
+)
+
+
+class Colour(StrEnum):
+    red = "R"
+
+
+class Size(Enum):
+    large = 3
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+VALUES = [
+    None,
+    True,
+    0,
+    -12,
+    2**64,
+    0.1,
+    1e15,
+    1e16,
+    -2.5e22,
+    1.7976931348623157e308,
+    1e-05,
+    -3.5e-7,
+    5e-324,
+    1.5e300,
+    "",
+    "plain",
+    'quotes " and \\ and \n control \x01',
+    "non-ASCII: café ✓ 😀",
+    "looks like a small float: 0.00001 1e-5",
+    "looks like a big float: 1e16 1e+16",
+    float("nan"),
+    float("inf"),
+    {"a": [1.5, None, float("-inf")]},
+    Point(1, float("nan")),
+    [],
+    {},
+    [1, "two", [3.0], {"four": None}],
+    {"b": 1, "a": {"d": [], "c": "x"}},
+    {1: "int key"},
+    (1, 2),
+    Colour.red,
+    uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    datetime(2025, 4, 25, 12, 30, tzinfo=UTC),
+    date(2025, 4, 25),
+    Point(1, 2),
+    Decimal("1.10"),
+    Size.large,
+]
+
+
+def default(o: object) -> object:
+    return DefaultJSONProvider.default(o) if not isinstance(o, Enum) else o.value
+
+
+@pytest.mark.parametrize("value", VALUES, ids=repr)
+@pytest.mark.parametrize("sort_keys", [False, True])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("backend", list(JsonBackend))
+def test_dumps_writes_what_json_writes(value: object, backend: JsonBackend, *, sort_keys: bool, ensure_ascii: bool):
+    # Given
+    if sort_keys and value == {1: "int key"}:
+        pytest.skip("json can't sort keys which aren't all strings")
+
+    # When
+    actual = dumps(value, default=default, sort_keys=sort_keys, ensure_ascii=ensure_ascii, backend=backend)
+
+    # Then
+    expected = json.dumps(value, default=default, sort_keys=sort_keys, ensure_ascii=ensure_ascii, separators=(",", ":"))
+    assert_that(actual, equal_to(expected.encode("utf-8")))
+
+
+@pytest.mark.parametrize("backend", list(JsonBackend))
+def test_unserialisable_value_raises(backend: JsonBackend):
+    with pytest.raises(TypeError):
+        dumps(object(), backend=backend)
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_flask_responses_written_as_default_provider_would(*, debug: bool):
+    # Given
+    app = Flask(__name__)
+    app.debug = debug
+    body = {"b": [1, 2.5, None], "a": {"when": datetime(2025, 4, 25, tzinfo=UTC), "name": "café"}}
+
+    # When
+    with app.app_context():
+        expected = DefaultJSONProvider(app).response(body).get_data()
+        actual = FastJSONProvider(app).response(body).get_data()
+
+    # Then
+    assert_that(actual, equal_to(expected))
@@ -1,16 +1,37 @@
+import json
 import logging
+import uuid
 from http import HTTPStatus
 from unittest.mock import Mock, patch
 
+import jsonschema
 import pytest
 from brunns.matchers.data import json_matching as is_json_that
 from brunns.matchers.werkzeug import is_werkzeug_response as is_response
-from flask import Flask, Request
+from fhir.resources.R4B.operationoutcome import OperationOutcome, OperationOutcomeIssue
+from flask import Flask, Request, make_response
 from flask.testing import FlaskClient
-from hamcrest import assert_that, contains_exactly, has_entries, has_length
+from freezegun import freeze_time
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    has_entries,
+    has_length,
+    has_properties,
+    is_,
+    none,
+    only_contains,
+)
 from wireup.integration.flask import get_app_container
 
+from eligibility_signposting_api.circuit_breaker import CircuitOpenError
+from eligibility_signposting_api.deadline import DeadlineExceededError
+from eligibility_signposting_api.json_encoding import FastJSONProvider
 from eligibility_signposting_api.model.eligibility import (
+    ActionCode,
+    ActionDescription,
+    ActionType,
     CohortGroupResult,
     Condition,
     EligibilityStatus,
@@ -20,13 +41,20 @@ from eligibility_signposting_api.model.eligibility import (
     RuleName,
     RuleType,
     Status,
+    SuggestedAction,
+    SuggestedActions,
+    UrlLink,
 )
 from eligibility_signposting_api.services import EligibilityService, UnknownPersonError
+from eligibility_signposting_api.services.audit_record import EligibilityAuditRecord
 from eligibility_signposting_api.services.eligibility_services import InvalidQueryParamError
 from eligibility_signposting_api.views.eligibility import (
     build_eligibility_cohorts,
+    build_eligibility_response,
     build_suitability_results,
     get_include_actions_flag,
+    handle_unknown_person_error,
+    render_eligibility_response,
 )
 from tests.fixtures.builders.model.eligibility import (
     CohortResultFactory,
@@ -34,13 +62,14 @@ from tests.fixtures.builders.model.eligibility import (
     EligibilityStatusFactory,
 )
 from tests.fixtures.matchers.eligibility import is_eligibility_cohort, is_suitability_rule
+from tests.fixtures.specification import ELIGIBILITY_RESPONSE_SCHEMA
 
 logger = logging.getLogger(__name__)
 
 
 class FakeEligibilityService(EligibilityService):
     def __init__(self):
-        pass
+        self.audit_records: list[EligibilityAuditRecord] = []
 
     def get_eligibility_status(
         self,
@@ -50,6 +79,9 @@ class FakeEligibilityService(EligibilityService):
     ) -> EligibilityStatus:
         return EligibilityStatusFactory.build()
 
+    def audit(self, audit_record: EligibilityAuditRecord) -> None:
+        self.audit_records.append(audit_record)
+
 
 class FakeUnknownPersonEligibilityService(EligibilityService):
     def __init__(self):
@@ -64,6 +96,32 @@ class FakeUnknownPersonEligibilityService(EligibilityService):
         raise UnknownPersonError
 
 
+class FakeTimingOutEligibilityService(EligibilityService):
+    def __init__(self):
+        pass
+
+    def get_eligibility_status(
+        self,
+        _: NHSNumber | None = None,
+        *,
+        include_actions_flag: bool = False,  # noqa: ARG002
+    ) -> EligibilityStatus:
+        raise DeadlineExceededError
+
+
+class FakeUnavailableEligibilityService(EligibilityService):
+    def __init__(self):
+        pass
+
+    def get_eligibility_status(
+        self,
+        _: NHSNumber | None = None,
+        *,
+        include_actions_flag: bool = False,  # noqa: ARG002
+    ) -> EligibilityStatus:
+        raise CircuitOpenError
+
+
 class FakeUnexpectedErrorEligibilityService(EligibilityService):
     def __init__(self):
         pass
@@ -81,12 +139,115 @@ def test_nhs_number_given(app: Flask, client: FlaskClient):
     # Given
     with get_app_container(app).override.service(EligibilityService, new=FakeEligibilityService()):
         # When
-        response = client.get("/patient-check/12345")
+        response = client.get("/patient-check/9434765919")
 
         # Then
         assert_that(response, is_response().with_status_code(HTTPStatus.OK))
 
 
+def test_suitability_rules_left_out_near_deadline_marked_by_header(app: Flask, client: FlaskClient):
+    # Given
+    eligibility_service = FakeEligibilityService()
+    eligibility_service.get_eligibility_status = lambda *_, **__: EligibilityStatusFactory.build(
+        conditions=ConditionFactory.batch(2)
+    )
+    with (
+        get_app_container(app).override.service(EligibilityService, new=eligibility_service),
+        patch("eligibility_signposting_api.views.eligibility.has_time_for", return_value=False),
+    ):
+        # When
+        response = client.get("/patient-check/9434765919")
+
+    # Then
+    assert_that(
+        response,
+        is_response()
+        .with_status_code(HTTPStatus.OK)
+        .with_headers(has_entries({"X-Suitability-Rules-Omitted": "true"}))
+        .and_text(is_json_that(has_entries(processedSuggestions=only_contains(has_entries(suitabilityRules=[]))))),
+    )
+
+
+def test_no_suitability_rules_omitted_header_with_time_to_spare(app: Flask, client: FlaskClient):
+    # Given
+    with get_app_container(app).override.service(EligibilityService, new=FakeEligibilityService()):
+        # When
+        response = client.get("/patient-check/9434765919")
+
+    # Then
+    assert_that(response.headers.get("X-Suitability-Rules-Omitted"), is_(none()))
+
+
+def test_decision_audited_with_response_sent(app: Flask, client: FlaskClient):
+    # Given
+    eligibility_service = FakeEligibilityService()
+    with get_app_container(app).override.service(EligibilityService, new=eligibility_service):
+        # When
+        response = client.get("/patient-check/9434765919?includeActions=N")
+
+    # Then
+    assert_that(
+        eligibility_service.audit_records,
+        contains_exactly(
+            has_properties(nhs_number="9434765919", response_body=response.get_data(), include_actions=False)
+        ),
+    )
+
+
+def test_unknown_nhs_number_given(app: Flask, client: FlaskClient):
+    # Given
+    with get_app_container(app).override.service(EligibilityService, new=FakeUnknownPersonEligibilityService()):
+        # When
+        first = client.get("/patient-check/9434765919")
+        second = client.get("/patient-check/9876543210")
+
+    # Then
+    for response, nhs_number in ((first, "9434765919"), (second, "9876543210")):
+        assert_that(
+            response,
+            is_response()
+            .with_status_code(HTTPStatus.NOT_FOUND)
+            .with_headers(has_entries({"Content-Type": "application/json"}))
+            .and_text(
+                is_json_that(
+                    has_entries(
+                        resourceType="OperationOutcome",
+                        issue=contains_exactly(
+                            has_entries(
+                                severity="information",
+                                code="nhs-number-not-found",
+                                diagnostics=f'NHS Number "{nhs_number}" not found.',
+                            )
+                        ),
+                    )
+                )
+            ),
+        )
+
+
+@pytest.mark.parametrize("compact", [True, False])
+def test_unknown_nhs_number_body_written_as_each_app_would(*, compact: bool):
+    # Given
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.json.compact = compact
+    problem = OperationOutcome(
+        issue=[
+            OperationOutcomeIssue(
+                severity="information", code="nhs-number-not-found", diagnostics='NHS Number "9434765919" not found.'
+            )  # pyright: ignore[reportCallIssue]
+        ]
+    )
+
+    # When
+    with app.app_context():
+        actual = make_response(handle_unknown_person_error(NHSNumber("9434765919"))).get_data()
+        expected = app.json.response(problem.model_dump(by_alias=True, mode="json")).get_data()
+
+    # Then
+    assert_that(actual, equal_to(expected))
+
+
 def test_no_nhs_number_given(app: Flask, client: FlaskClient):
     # Given
     with get_app_container(app).override.service(EligibilityService, new=FakeUnknownPersonEligibilityService()):
@@ -113,10 +274,85 @@ def test_no_nhs_number_given(app: Flask, client: FlaskClient):
     )
 
 
+@pytest.mark.parametrize("nhs_number", ["12345", "9434765918", "94347659190", "943476591X", "943 476 5919"])
+def test_invalid_nhs_number_given(app: Flask, client: FlaskClient, nhs_number: str):
+    # Given
+    eligibility_service = Mock(spec=EligibilityService)
+    with get_app_container(app).override.service(EligibilityService, new=eligibility_service):
+        # When
+        response = client.get(f"/patient-check/{nhs_number}")
+
+    # Then
+    assert_that(
+        response,
+        is_response()
+        .with_status_code(HTTPStatus.BAD_REQUEST)
+        .and_text(
+            is_json_that(
+                has_entries(
+                    resourceType="OperationOutcome",
+                    issue=contains_exactly(
+                        has_entries(
+                            severity="error",
+                            code="value",
+                            diagnostics=f'NHS Number "{nhs_number}" is not a valid NHS number.',
+                        )
+                    ),
+                )
+            )
+        ),
+    )
+    eligibility_service.get_eligibility_status.assert_not_called()
+
+
+def test_deadline_exceeded(app: Flask, client: FlaskClient):
+    # Given
+    with get_app_container(app).override.service(EligibilityService, new=FakeTimingOutEligibilityService()):
+        # When
+        response = client.get("/patient-check/9434765919")
+
+    # Then
+    assert_that(
+        response,
+        is_response()
+        .with_status_code(HTTPStatus.GATEWAY_TIMEOUT)
+        .and_text(
+            is_json_that(
+                has_entries(
+                    resourceType="OperationOutcome",
+                    issue=contains_exactly(has_entries(severity="error", code="timeout")),
+                )
+            )
+        ),
+    )
+
+
+def test_dependency_unavailable(app: Flask, client: FlaskClient):
+    # Given
+    with get_app_container(app).override.service(EligibilityService, new=FakeUnavailableEligibilityService()):
+        # When
+        response = client.get("/patient-check/9434765919")
+
+    # Then
+    assert_that(
+        response,
+        is_response()
+        .with_status_code(HTTPStatus.SERVICE_UNAVAILABLE)
+        .and_text(
+            is_json_that(
+                has_entries(
+                    resourceType="OperationOutcome",
+                    issue=contains_exactly(has_entries(severity="error", code="transient")),
+                )
+            )
+        ),
+    )
+
+
 def test_unexpected_error(app: Flask, client: FlaskClient):
     # Given
     with get_app_container(app).override.service(EligibilityService, new=FakeUnexpectedErrorEligibilityService()):
-        response = client.get("/patient-check/12345")
+        response = client.get("/patient-check/9434765919")
         assert_that(
             response,
             is_response()
@@ -360,7 +596,7 @@ def test_nhs_number_and_include_actions_param_given_and_is_yes(app: Flask, clien
     # Given
     with get_app_container(app).override.service(EligibilityService, new=FakeEligibilityService()):
         # When
-        response = client.get("/patient-check/12345?includeActions=Y")
+        response = client.get("/patient-check/9434765919?includeActions=Y")
 
         # Then
         assert_that(response, is_response().with_status_code(HTTPStatus.OK))
@@ -370,7 +606,7 @@ def test_nhs_number_and_include_actions_param_no_given(app: Flask, client: Flask
     # Given
     with get_app_container(app).override.service(EligibilityService, new=FakeEligibilityService()):
         # When
-        response = client.get("/patient-check/12345?includeActions=N")
+        response = client.get("/patient-check/9434765919?includeActions=N")
 
         # Then
         assert_that(response, is_response().with_status_code(HTTPStatus.OK))
@@ -380,7 +616,7 @@ def test_nhs_number_and_include_actions_param_value_is_incorrect(app: Flask, cli
     # Given
     with get_app_container(app).override.service(EligibilityService, new=FakeEligibilityService()):
         # When
-        response = client.get("/patient-check/12345?includeActions=abc")
+        response = client.get("/patient-check/9434765919?includeActions=abc")
 
         # Then
         assert_that(
@@ -406,7 +642,7 @@ def test_nhs_number_and_unrecognised_query_param_provided(app: Flask, client: Fl
     # Given
     with get_app_container(app).override.service(EligibilityService, new=FakeEligibilityService()):
         # When
-        response = client.get("/patient-check/12345?example-key=example-value")
+        response = client.get("/patient-check/9434765919?example-key=example-value")
 
         # Then
         assert_that(
@@ -484,3 +720,93 @@ def test_query_param_include_actions_flag_with_other_params():
         pytest.raises(InvalidQueryParamError),
     ):
         get_include_actions_flag()
+
+
+def test_build_eligibility_response_without_suitability_rules():
+    # Given
+    condition: Condition = ConditionFactory.build(
+        status=Status.not_actionable,
+        cohort_results=[
+            CohortResultFactory.build(
+                status=Status.not_actionable,
+                reasons=[
+                    Reason(
+                        rule_type=RuleType.suppression,
+                        rule_name=RuleName("Exclude too young less than 75"),
+                        rule_description=RuleDescription("your age is greater than 75"),
+                        matcher_matched=False,
+                    )
+                ],
+            )
+        ],
+    )
+    eligibility_status = EligibilityStatusFactory.build(conditions=[condition])
+
+    # When
+    with_rules = build_eligibility_response(eligibility_status)
+    without_rules = build_eligibility_response(eligibility_status, include_suitability_rules=False)
+
+    # Then
+    assert_that(with_rules.processed_suggestions[0].suitability_rules, has_length(1))
+    assert_that(without_rules.processed_suggestions[0].suitability_rules, has_length(0))
+
+
+def rendering_cases() -> list[EligibilityStatus]:
+    reasons = [
+        Reason(RuleType.suppression, RuleName("Too young"), RuleDescription("you are under 75"), matcher_matched=True),
+        Reason(RuleType.suppression, RuleName("Too young"), RuleDescription("you are under 75"), matcher_matched=True),
+        Reason(RuleType.filter, RuleName("No description"), None, matcher_matched=True),
+    ]
+    actions = SuggestedActions(
+        [
+            SuggestedAction(
+                ActionType("ButtonWithAuthLink"), ActionCode("BookNBS"), None, UrlLink("https://nbs"), None
+            ),
+            SuggestedAction(ActionType("InfoText"), ActionCode("Info"), ActionDescription("Call us"), None, None),
+        ]
+    )
+    cohort_results = [
+        CohortResultFactory.build(status=Status.not_actionable, reasons=reasons, description="Over 75"),
+        CohortResultFactory.build(status=Status.not_actionable, reasons=reasons, description=None),
+        CohortResultFactory.build(status=Status.actionable, reasons=[], description="Care home"),
+    ]
+    return [
+        EligibilityStatusFactory.build(
+            conditions=[
+                ConditionFactory.build(status=status, cohort_results=cohort_results, actions=condition_actions)
+                for status in Status
+                for condition_actions in (actions, SuggestedActions([]), None)
+            ]
+        ),
+        EligibilityStatusFactory.build(conditions=[]),
+        *EligibilityStatusFactory.batch(20),
+    ]
+
+
+@pytest.mark.parametrize("eligibility_status", rendering_cases())
+@pytest.mark.parametrize("include_suitability_rules", [True, False])
+def test_rendered_response_as_pydantic_response_model_written(
+    app: Flask, eligibility_status: EligibilityStatus, *, include_suitability_rules: bool
+):
+    # Given
+    response_id = uuid.UUID("5ba6f4a1-0c58-4b1e-9c8e-2d3f6a7b8c9d")
+
+    with app.app_context(), freeze_time("2025-04-25 12:00:00"), patch("uuid.uuid4", return_value=response_id):
+        # When
+        actual = render_eligibility_response(eligibility_status, include_suitability_rules=include_suitability_rules)
+
+        # Then
+        eligibility_response = build_eligibility_response(
+            eligibility_status, include_suitability_rules=include_suitability_rules
+        )
+        expected = app.json.response(eligibility_response.model_dump(by_alias=True, mode="json", exclude_none=True))
+        assert_that(actual, equal_to(expected.get_data()))
+
+
+@pytest.mark.parametrize("eligibility_status", rendering_cases())
+def test_rendered_response_conforms_to_specification(eligibility_status: EligibilityStatus):
+    # When
+    actual = json.loads(render_eligibility_response(eligibility_status))
+
+    # Then
+    jsonschema.validate(instance=actual, schema=ELIGIBILITY_RESPONSE_SCHEMA, format_checker=jsonschema.FormatChecker())
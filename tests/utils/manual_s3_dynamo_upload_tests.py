@@ -5,7 +5,14 @@ import boto3
 import pytest
 from moto import mock_aws
 
-from scripts.manual_uploads.manual_s3_dynamo_upload import map_dynamo_type, run_upload
+from eligibility_signposting_api.repos.bloom_filter import BloomFilter
+from eligibility_signposting_api.repos.compact import decode_rows
+from scripts.manual_uploads.manual_s3_dynamo_upload import (
+    build_person_filter,
+    convert_to_compact,
+    map_dynamo_type,
+    run_upload,
+)
 
 
 @pytest.fixture
@@ -98,3 +105,176 @@ def test_script_cli_end_to_end(test_data_dir):
     # Assert
     assert uploaded_s3_data == expected_data
     assert dynamo_items == expected_dynamo_items
+
+
+@mock_aws
+def test_script_uploads_compact_items(test_data_dir):
+    # Arrange
+    data_dir, expected_data = test_data_dir
+    region = "eu-west-2"
+    dynamo_table = "api-test-datastore"
+
+    dynamodb = boto3.client("dynamodb", region_name=region)
+    dynamodb.create_table(
+        TableName=dynamo_table,
+        KeySchema=[
+            {"AttributeName": "NHS_NUMBER", "KeyType": "HASH"},
+            {"AttributeName": "ATTRIBUTE_TYPE", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "NHS_NUMBER", "AttributeType": "S"},
+            {"AttributeName": "ATTRIBUTE_TYPE", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+    # Act
+    run_upload(
+        [
+            "--env",
+            "test",
+            "--upload-dynamo",
+            str(data_dir),
+            "--region",
+            region,
+            "--dynamo-table",
+            dynamo_table,
+            "--compact",
+        ]
+    )
+
+    # Assert
+    for expected_item in expected_data:
+        key = {"NHS_NUMBER": {"S": expected_item["NHS_NUMBER"]}, "ATTRIBUTE_TYPE": {"S": "COMPACT"}}
+        item = dynamodb.get_item(TableName=dynamo_table, Key=key)["Item"]
+        assert decode_rows(item["ROWS"]["B"]) == [expected_item]
+
+
+def test_convert_to_compact_groups_rows_by_person():
+    # Arrange
+    rows = [
+        {"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "PERSON", "POSTCODE": "LS1 1AB"},
+        {"NHS_NUMBER": "2345678901", "ATTRIBUTE_TYPE": "PERSON", "POSTCODE": "HP1 1AB"},
+        {"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "RSV", "LAST_SUCCESSFUL_DATE": "20240101"},
+    ]
+
+    # Act
+    compact_items = list(convert_to_compact(rows))
+
+    # Assert
+    assert [item["NHS_NUMBER"]["S"] for item in compact_items] == ["1234567890", "2345678901"]
+    assert decode_rows(compact_items[0]["ROWS"]["B"]) == [rows[0], rows[2]]
+
+
+@mock_aws
+def test_script_gathers_each_persons_rows_from_every_file_into_one_compact_item(tmp_path):
+    # Arrange
+    region = "eu-west-2"
+    dynamo_table = "api-test-datastore"
+    dynamodb = boto3.client("dynamodb", region_name=region)
+    dynamodb.create_table(
+        TableName=dynamo_table,
+        KeySchema=[
+            {"AttributeName": "NHS_NUMBER", "KeyType": "HASH"},
+            {"AttributeName": "ATTRIBUTE_TYPE", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "NHS_NUMBER", "AttributeType": "S"},
+            {"AttributeName": "ATTRIBUTE_TYPE", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    person = {"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "PERSON", "POSTCODE": "LS1 1AB"}
+    rsv = {"NHS_NUMBER": "1234567890", "ATTRIBUTE_TYPE": "RSV", "LAST_SUCCESSFUL_DATE": "20240101"}
+    (tmp_path / "person.json").write_text(json.dumps(person) + "\n")
+    (tmp_path / "rsv.json").write_text(json.dumps(rsv) + "\n")
+
+    # Act
+    run_upload(["--upload-dynamo", str(tmp_path), "--region", region, "--dynamo-table", dynamo_table, "--compact"])
+
+    # Assert
+    key = {"NHS_NUMBER": {"S": "1234567890"}, "ATTRIBUTE_TYPE": {"S": "COMPACT"}}
+    item = dynamodb.get_item(TableName=dynamo_table, Key=key)["Item"]
+    rows = decode_rows(item["ROWS"]["B"])
+    assert sorted(row["ATTRIBUTE_TYPE"] for row in rows) == ["PERSON", "RSV"]
+
+
+@mock_aws
+def test_script_publishes_person_filter(test_data_dir):
+    # Arrange
+    data_dir, expected_data = test_data_dir
+    region = "eu-west-2"
+    dynamo_table = "api-test-datastore"
+    filter_bucket = "api-test-person-filter"
+
+    s3 = boto3.client("s3", region_name=region)
+    s3.create_bucket(Bucket=filter_bucket, CreateBucketConfiguration={"LocationConstraint": region})
+    dynamodb = boto3.client("dynamodb", region_name=region)
+    dynamodb.create_table(
+        TableName=dynamo_table,
+        KeySchema=[
+            {"AttributeName": "NHS_NUMBER", "KeyType": "HASH"},
+            {"AttributeName": "ATTRIBUTE_TYPE", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "NHS_NUMBER", "AttributeType": "S"},
+            {"AttributeName": "ATTRIBUTE_TYPE", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    already_loaded = {"NHS_NUMBER": {"S": "4567890123"}, "ATTRIBUTE_TYPE": {"S": "PERSON"}}
+    dynamodb.put_item(TableName=dynamo_table, Item=already_loaded)
+
+    # Act
+    run_upload(
+        [
+            "--upload-dynamo",
+            str(data_dir / "test.json"),
+            "--region",
+            region,
+            "--dynamo-table",
+            dynamo_table,
+            "--person-filter-bucket",
+            filter_bucket,
+            "--person-filter-false-positive-rate",
+            "0.001",
+        ]
+    )
+
+    # Assert
+    body = s3.get_object(Bucket=filter_bucket, Key="person_filter/known_people.bloom")["Body"].read()
+    person_filter = BloomFilter.from_bytes(body)
+    assert all(item["NHS_NUMBER"] in person_filter for item in expected_data)
+    assert "4567890123" in person_filter
+    assert "9434765919" not in person_filter
+
+
+@mock_aws
+def test_build_person_filter_from_whole_table():
+    # Arrange
+    region = "eu-west-2"
+    dynamo_table = "api-test-datastore"
+    dynamodb = boto3.client("dynamodb", region_name=region)
+    dynamodb.create_table(
+        TableName=dynamo_table,
+        KeySchema=[
+            {"AttributeName": "NHS_NUMBER", "KeyType": "HASH"},
+            {"AttributeName": "ATTRIBUTE_TYPE", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "NHS_NUMBER", "AttributeType": "S"},
+            {"AttributeName": "ATTRIBUTE_TYPE", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    nhs_numbers = [f"{n:010d}" for n in range(1, 201)]
+    for nhs_number in nhs_numbers:
+        for attribute_type in ("PERSON", "COHORTS"):
+            item = {"NHS_NUMBER": {"S": nhs_number}, "ATTRIBUTE_TYPE": {"S": attribute_type}}
+            dynamodb.put_item(TableName=dynamo_table, Item=item)
+
+    # Act
+    person_filter = build_person_filter(dynamodb, dynamo_table, 0.01)
+
+    # Assert
+    assert all(nhs_number in person_filter for nhs_number in nhs_numbers)